@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Commande unifiée du branding - EB-Vision 2.0
+============================================
+
+Regroupe configure_branding.py et verify_branding.py sous une seule commande.
+
+Usage:
+    python branding.py <commande> [options]
+
+Commandes:
+    configure              Mode interactif de configuration
+    set <id>               Activer (ou créer) une configuration
+    list [filtre]          Lister les configurations (--sort id|name|mtime|size)
+    new                    Créer une configuration (mode guidé)
+    batch <fichier>        Création en masse depuis un CSV/JSONL
+    build-assets [ids]     Assets hachés + .gz/.br
+    build-logos [ids]      Favicon et logos PNG/WebP depuis le logo source
+    images [ids]           Dimensions et budgets des logos (en-têtes seulement)
+    build-theme [ids]      Thèmes CSS précompilés
+    palette [ids]          Variantes, textes lisibles et contrastes WCAG
+    compile [ids]          Héritage (extends) résolu en configurations compilées
+    build-inline [id]      Pages servies avec le branding inliné
+    pages [pages]          Poids des pages, ressources bloquantes et doublons
+    template-plan          Placeholders du template
+    verify                 Vérification complète (--all, --json, --fix...)
+    validate [...]         Validation des configurations contre le schéma
+    watch                  Surveillance continue des fichiers de branding
+    bench                  Test de charge de l'API
+    http                   Cache HTTP (304, ETag, Cache-Control) et compression
+    memory                 Mémoire du serveur au fil des changements de branding
+    preview                Aperçu de n'importe quel branding sans le serveur Node
+    diff                   Écarts entre configurations, template et API
+    startup                Temps de démarrage des commandes (budget)
+
+Chaque commande n'importe que le module qui l'implémente, au moment où elle
+est lancée : `list` ou `--help` ne chargent ni requests, ni le vérificateur,
+ni le serveur de test de charge.
+"""
+
+import sys
+from typing import List
+
+from branding_common import Colors, print_error
+
+# Commande -> (module, arguments placés avant ceux de l'utilisateur, description)
+COMMANDS = {
+    'configure': ('configure_branding', [], "Mode interactif de configuration"),
+    'set': ('configure_branding', [], "Activer (ou créer) une configuration : set <id>"),
+    'list': ('configure_branding', ['--list'], "Lister les configurations : list [filtre] [--sort clé]"),
+    'new': ('configure_branding', ['--new'], "Créer une configuration (mode guidé)"),
+    'batch': ('configure_branding', ['--batch'], "Création en masse : batch <fichier> [--dry-run] [--workers N]"),
+    'build-assets': ('configure_branding', ['--build-assets'], "Assets hachés + .gz/.br : [ids|--all] [--update-config]"),
+    'build-logos': ('configure_branding', ['--build-logos'], "Favicon et logos dimensionnés : [ids|--all] [--source F] [--update-config]"),
+    'images': ('branding_images', [], "Dimensions et budgets des logos : [ids] [-j] [--workers N]"),
+    'build-theme': ('configure_branding', ['--build-theme'], "Thèmes CSS précompilés : [ids|--all]"),
+    'palette': ('branding_palette', [], "Contrastes WCAG de tous les tenants : [ids] [-j]"),
+    'compile': ('branding_compile', [], "Configurations compilées (extends résolu) : [ids] [--check] [--extends P]"),
+    'build-inline': ('configure_branding', ['--build-inline'], "Pages servies avec le branding inliné : [id] [--clear]"),
+    'pages': ('branding_pages', [], "Poids des pages et doublons : [pages] [--brand id] [--top N] [-j]"),
+    'template-plan': ('configure_branding', ['--template-plan'], "Placeholders du template"),
+    'verify': ('verify_branding', [], "Vérification complète (--all, --json, --fix, --no-cache...)"),
+    'validate': ('verify_branding', ['--validate'], "Validation contre le schéma : [ids|fichiers|dossiers]"),
+    'watch': ('verify_branding', ['--watch'], "Surveillance continue : [--poll S] [--json]"),
+    'bench': ('verify_branding', ['--bench'], "Test de charge de l'API (bench --help)"),
+    'http': ('branding_http', [], "Cache HTTP et compression de la config et des logos : [--url U] [-j]"),
+    'memory': ('branding_memory', [], "Mémoire du serveur par branding : [--cycles N] [--dwell S]"),
+    'preview': ('branding_preview', [], "Aperçu des tenants sans serveur Node : [--port P] [--page F]"),
+    'diff': ('branding_diff', [], "Écarts entre configs : <a> <b> | <id> --api | --template [ids] [-j]"),
+    'startup': ('branding_startup', [], "Temps de démarrage des commandes : [--budget MS] [--runs N]"),
+}
+
+
+def print_usage():
+    """Affiche l'aide de la commande."""
+    print("Usage: python branding.py <commande> [options]")
+    print()
+    print("Commandes:")
+    for name, (_, _, description) in COMMANDS.items():
+        print(f"  {name:<15} {description}")
+    print()
+    print("Aide d'une commande : python branding.py <commande> --help")
+
+
+def run_command(name: str, args: List[str]) -> int:
+    """Importe le module de la commande et exécute son point d'entrée."""
+    import importlib
+
+    module_name, prefix, _ = COMMANDS[name]
+    module = importlib.import_module(module_name)
+
+    # Les scripts lisent sys.argv : la ligne de commande leur est transmise
+    # comme s'ils avaient été lancés directement
+    sys.argv = [module.__file__, *prefix, *args]
+    try:
+        result = module.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+def main() -> int:
+    """Fonction principale."""
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help', 'help'):
+        print_usage()
+        return 0
+
+    name, args = sys.argv[1], sys.argv[2:]
+    if name not in COMMANDS:
+        print_error(f"Commande inconnue: {name}")
+        print()
+        print_usage()
+        return 2
+    if name == 'set' and not args:
+        print_error("Identifiant requis: python branding.py set <id>")
+        return 2
+    return run_command(name, args)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nOpération interrompue par l'utilisateur")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n{Colors.RED}Erreur inattendue: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
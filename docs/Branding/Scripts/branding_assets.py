@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline des assets de branding - EB-Vision 2.0
+===============================================
+
+Construit, pour chaque dossier public/assets/brands/<id>/ :
+
+- une copie minifiée des SVG (commentaires, métadonnées et espaces superflus
+  supprimés) ;
+- un nom de fichier contenant l'empreinte du contenu (logo.<hash>.svg),
+  servi avec un cache « immutable » d'un an par src/middleware/brandAssets.js ;
+- des variantes précompressées .gz (toujours) et .br (si le module Python
+  « brotli » est installé), uniquement lorsqu'elles sont plus petites ;
+- un manifeste dist/manifest.json reliant chaque fichier source à son URL.
+
+update_config_paths() réécrit ensuite les chemins branding.logo.main/icon/
+favicon de la configuration du tenant vers ces URL immuables.
+"""
+
+import re
+import gzip
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import brotli  # Optionnel : pip install brotli
+except ImportError:
+    brotli = None
+
+ASSET_EXTENSIONS = {'.svg', '.png', '.jpg', '.jpeg', '.ico', '.webp'}
+# Formats déjà compressés : une couche gzip/brotli n'apporte rien
+COMPRESSED_FORMATS = {'.png', '.jpg', '.jpeg', '.webp'}
+DIST_DIRNAME = "dist"
+MANIFEST_FILENAME = "manifest.json"
+HASH_LENGTH = 10
+
+_SVG_COMMENT = re.compile(rb'<!--.*?-->', re.S)
+_SVG_PROLOG = re.compile(rb'<\?xml.*?\?>|<!DOCTYPE[^>]*>', re.S)
+_SVG_METADATA = re.compile(rb'<metadata\b.*?</metadata>|<sodipodi:namedview\b.*?(?:/>|</sodipodi:namedview>)', re.S)
+_SVG_BETWEEN_TAGS = re.compile(rb'>\s+<')
+_SVG_WHITESPACE = re.compile(rb'\s{2,}')
+
+
+def minify_svg(data: bytes) -> bytes:
+    """Minification prudente d'un SVG (aucune réécriture des chemins)."""
+    data = _SVG_COMMENT.sub(b'', data)
+    data = _SVG_PROLOG.sub(b'', data)
+    data = _SVG_METADATA.sub(b'', data)
+    data = _SVG_BETWEEN_TAGS.sub(b'><', data)
+    data = _SVG_WHITESPACE.sub(b' ', data)
+    return data.strip()
+
+
+def content_hash(data: bytes) -> str:
+    """Empreinte courte du contenu (SHA-256 tronqué)."""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def brand_assets_dir(root: Path, brand_id: str) -> Path:
+    """Dossier des assets d'un tenant."""
+    return root / "public" / "assets" / "brands" / brand_id
+
+
+def build_brand_assets(root: Path, brand_id: str) -> Dict:
+    """
+    Construit les assets d'un tenant et écrit le manifeste.
+    Retourne le manifeste (dict vide si le dossier n'existe pas).
+    """
+    assets_dir = brand_assets_dir(root, brand_id)
+    if not assets_dir.is_dir():
+        return {}
+
+    dist_dir = assets_dir / DIST_DIRNAME
+    dist_dir.mkdir(exist_ok=True)
+    url_prefix = f"/assets/brands/{brand_id}/{DIST_DIRNAME}"
+
+    manifest: Dict[str, Dict] = {}
+    produced = {MANIFEST_FILENAME}
+
+    for source in sorted(assets_dir.iterdir()):
+        suffix = source.suffix.lower()
+        if not source.is_file() or suffix not in ASSET_EXTENSIONS:
+            continue
+
+        original = source.read_bytes()
+        data = minify_svg(original) if suffix == '.svg' else original
+        digest = content_hash(data)
+        hashed_name = f"{source.stem}.{digest}{suffix}"
+        target = dist_dir / hashed_name
+        if not target.exists():
+            target.write_bytes(data)
+        produced.add(hashed_name)
+
+        entry = {
+            'file': f"{DIST_DIRNAME}/{hashed_name}",
+            'url': f"{url_prefix}/{hashed_name}",
+            'hash': digest,
+            'size': len(original),
+            'minifiedSize': len(data),
+        }
+
+        if suffix not in COMPRESSED_FORMATS:
+            # mtime=0 : sortie déterministe, même empreinte à chaque build
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                (dist_dir / f"{hashed_name}.gz").write_bytes(gz)
+                produced.add(f"{hashed_name}.gz")
+                entry['gzipSize'] = len(gz)
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(data):
+                    (dist_dir / f"{hashed_name}.br").write_bytes(br)
+                    produced.add(f"{hashed_name}.br")
+                    entry['brotliSize'] = len(br)
+
+        manifest[source.name] = entry
+
+    # Supprimer les versions précédentes devenues obsolètes
+    for stale in dist_dir.iterdir():
+        if stale.is_file() and stale.name not in produced:
+            stale.unlink()
+
+    with open(dist_dir / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+    return manifest
+
+
+def load_manifest(root: Path, brand_id: str) -> Dict:
+    """Lit le manifeste d'un tenant (dict vide s'il n'existe pas)."""
+    manifest_file = brand_assets_dir(root, brand_id) / DIST_DIRNAME / MANIFEST_FILENAME
+    if not manifest_file.exists():
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _source_for_hashed(hashed_name: str, manifest: Dict) -> Optional[str]:
+    """Retrouve le fichier source d'un nom haché (<stem>.<hash><ext>)."""
+    for source in manifest:
+        path = Path(source)
+        pattern = re.escape(path.stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(path.suffix.lower())
+        if re.fullmatch(pattern, hashed_name):
+            return source
+    return None
+
+
+def _hashed_url(path: str, brand_id: str, manifest: Dict) -> str:
+    """URL immuable d'un chemin du tenant (inchangé s'il n'est pas dans le manifeste)."""
+    source_prefix = f"/assets/brands/{brand_id}/"
+    if not path.startswith(source_prefix):
+        return path
+    name = path[len(source_prefix):]
+    if name.startswith(f"{DIST_DIRNAME}/"):
+        # Déjà réécrit lors d'un build précédent : retrouver la source
+        name = _source_for_hashed(name[len(DIST_DIRNAME) + 1:], manifest)
+    entry = manifest.get(name) if name else None
+    return entry['url'] if entry else path
+
+
+def rewrite_logo_paths(config: Dict, brand_id: str, manifest: Dict) -> List[str]:
+    """
+    Remplace dans branding.logo les chemins vers des fichiers du manifeste
+    par leur URL immuable, y compris chaque candidat des srcset produits par
+    build-logos (mainSrcset, iconSrcset). Retourne la liste des clés modifiées.
+    """
+    logo = config.get('branding', {}).get('logo')
+    if not isinstance(logo, dict):
+        return []
+
+    changed = []
+    for key, value in logo.items():
+        if not isinstance(value, str):
+            continue
+        if key.endswith('Srcset'):
+            candidates = []
+            for candidate in value.split(','):
+                url, _, descriptor = candidate.strip().partition(' ')
+                url = _hashed_url(url, brand_id, manifest)
+                candidates.append(f"{url} {descriptor}" if descriptor else url)
+            rewritten = ", ".join(candidates)
+        else:
+            rewritten = _hashed_url(value, brand_id, manifest)
+        if rewritten != value:
+            logo[key] = rewritten
+            changed.append(key)
+    return changed
+
+
+def update_config_paths(root: Path, brand_id: str, manifest: Optional[Dict] = None) -> List[str]:
+    """Réécrit les chemins de logos dans config/branding/<id>.json."""
+    config_file = root / "config" / "branding" / f"{brand_id}.json"
+    if not config_file.exists():
+        return []
+    if manifest is None:
+        manifest = load_manifest(root, brand_id)
+
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    changed = rewrite_logo_paths(config, brand_id, manifest)
+    if changed:
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+    return changed
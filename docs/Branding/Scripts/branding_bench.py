@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge de l'API de branding - EB-Vision 2.0
+===================================================
+
+Envoie des requêtes concurrentes sur /api/branding/config et
+/api/branding/config/:brandId et mesure le débit, les latences
+(p50/p95/p99, histogramme) et les erreurs, en séparant les requêtes
+à froid (cache BrandingService vide) des requêtes à chaud.
+
+Le client HTTP est asynchrone (asyncio) et réutilise un pool de connexions
+keep-alive : aucune dépendance en plus de la bibliothèque standard.
+
+Usage:
+    python branding_bench.py [options]
+    python verify_branding.py --bench [options]
+
+Options:
+    --url URL            Serveur cible http:// ou https://, préfixe de chemin
+                         compris (défaut: http://localhost:3000)
+    -c, --concurrency N  Connexions simultanées (défaut: 10)
+    -n, --requests N     Requêtes à chaud par cible (défaut: 200)
+    --brands a,b         Brandings pour /config/:brandId (défaut: tous)
+    --token JWT          Jeton Bearer (requis pour /config/:brandId et
+                         pour vider le cache avant la phase à froid)
+    --stub               Démarre un serveur local simulant l'API
+    -j, --json           Résultat au format JSON
+
+Note: /api/branding/config/:brandId exige une authentification ; sans
+--token seul /api/branding/config est mesuré. Sans --token, le cache ne
+peut pas être vidé et la phase « à froid » mesure le premier appel.
+"""
+
+import ssl
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+from branding_common import Colors, get_project_root
+from branding_compile import load_config
+
+# Bornes (ms) de l'histogramme de latence
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+@dataclass
+class Sample:
+    """Mesure d'une requête."""
+    target: str
+    phase: str  # cold | warm
+    latency_ms: float
+    status: int
+    error: Optional[str] = None
+
+@dataclass
+class TargetStats:
+    """Statistiques agrégées pour une cible et une phase."""
+    target: str
+    phase: str
+    latencies: List[float] = field(default_factory=list)
+    count: int = 0
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, sample: Sample):
+        self.count += 1
+        if sample.error or sample.status >= 400:
+            self.errors += 1
+        if sample.status:
+            self.statuses[sample.status] = self.statuses.get(sample.status, 0) + 1
+        if not sample.error:
+            self.latencies.append(sample.latency_ms)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile par rang le plus proche."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered) + 0.5)) - 1))
+        return ordered[rank]
+
+    def to_dict(self) -> Dict:
+        return {
+            'target': self.target,
+            'phase': self.phase,
+            'count': self.count,
+            'errors': self.errors,
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items())},
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': max(self.latencies) if self.latencies else None,
+        }
+
+class HTTPError(Exception):
+    """Réponse HTTP illisible ou connexion interrompue."""
+
+class AsyncConnection:
+    """Connexion HTTP/1.1 keep-alive réutilisable (TLS si ssl_context est fourni)."""
+
+    def __init__(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext] = None,
+                 prefix: str = ""):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        # Préfixe de l'URL de base (application servie sous un sous-chemin)
+        self.prefix = prefix
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _ensure_open(self):
+        if self.writer is None or self.writer.is_closing():
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl_context)
+
+    async def request(self, method: str, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Envoie une requête et lit la réponse complète."""
+        await self._ensure_open()
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HTTPError("connexion fermée par le serveur")
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f"ligne de statut invalide: {status_line!r}")
+
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304):
+            body = b""
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b"".join(chunks)
+        elif 'content-length' in response_headers:
+            body = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await self.reader.read()
+            await self.close()
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, body
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+
+class BrandingBenchmark:
+    """Pilote le test de charge."""
+
+    def __init__(self, base_url: str, concurrency: int = 10, requests_per_target: int = 200,
+                 brands: Optional[List[str]] = None, token: Optional[str] = None):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"URL non prise en charge (http:// ou https:// attendu): {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl_context = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.prefix = parts.path.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.requests_per_target = max(1, requests_per_target)
+        self.brands = brands or []
+        self.token = token
+        self.samples: List[Sample] = []
+        self.notes: List[str] = []
+        self.wall_time = 0.0
+
+    def _connection(self) -> AsyncConnection:
+        return AsyncConnection(self.host, self.port, self.ssl_context, self.prefix)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        return headers
+
+    def targets(self) -> List[str]:
+        """Chemins mesurés."""
+        paths = ["/api/branding/config"]
+        if self.token:
+            paths += [f"/api/branding/config/{quote(brand)}" for brand in self.brands]
+        elif self.brands:
+            self.notes.append("/api/branding/config/:brandId ignoré (authentification requise, utilisez --token)")
+        return paths
+
+    async def _timed(self, conn: AsyncConnection, target: str, phase: str,
+                     method: str = 'GET') -> Sample:
+        start = time.perf_counter()
+        try:
+            status, _, _ = await conn.request(method, target, self._headers())
+            return Sample(target, phase, (time.perf_counter() - start) * 1000, status)
+        except Exception as e:
+            await conn.close()
+            return Sample(target, phase, (time.perf_counter() - start) * 1000, 0, str(e) or type(e).__name__)
+
+    async def _invalidate_cache(self, conn: AsyncConnection) -> bool:
+        """Vide le cache BrandingService (nécessite un jeton admin)."""
+        if not self.token:
+            self.notes.append("Cache serveur non vidé (pas de --token) : la phase à froid mesure le premier appel")
+            return False
+        try:
+            status, _, _ = await conn.request('DELETE', "/api/branding/cache", self._headers())
+        except Exception as e:
+            self.notes.append(f"Invalidation du cache impossible: {e}")
+            return False
+        if status != 200:
+            self.notes.append(f"Invalidation du cache refusée (HTTP {status})")
+            return False
+        return True
+
+    async def _run(self):
+        targets = self.targets()
+        control = self._connection()
+
+        # Phase à froid : une requête par cible juste après l'invalidation
+        await self._invalidate_cache(control)
+        for target in targets:
+            self.samples.append(await self._timed(control, target, 'cold'))
+        await control.close()
+
+        # Phase à chaud : file de travail partagée par un pool de connexions
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(self.requests_per_target):
+            for target in targets:
+                queue.put_nowait(target)
+
+        async def worker():
+            conn = self._connection()
+            try:
+                while True:
+                    try:
+                        target = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    self.samples.append(await self._timed(conn, target, 'warm'))
+            finally:
+                await conn.close()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self.wall_time = time.perf_counter() - start
+
+    def run(self) -> Dict:
+        """Exécute le test et retourne le rapport."""
+        asyncio.run(self._run())
+        return self.report()
+
+    def report(self) -> Dict:
+        """Agrège les mesures."""
+        stats: Dict[Tuple[str, str], TargetStats] = {}
+        for sample in self.samples:
+            key = (sample.target, sample.phase)
+            stats.setdefault(key, TargetStats(sample.target, sample.phase)).add(sample)
+
+        warm = [s for s in self.samples if s.phase == 'warm']
+        warm_all = TargetStats('*', 'warm')
+        for sample in warm:
+            warm_all.add(sample)
+
+        histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        for latency in warm_all.latencies:
+            index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if latency <= bound),
+                         len(HISTOGRAM_BUCKETS))
+            histogram[index] += 1
+
+        return {
+            'server': f"{self.scheme}://{self.host}:{self.port}{self.prefix}",
+            'concurrency': self.concurrency,
+            'requests': len(warm),
+            'duration_s': round(self.wall_time, 4),
+            'throughput_rps': round(len(warm) / self.wall_time, 1) if self.wall_time else None,
+            'errors': warm_all.errors + sum(1 for s in self.samples if s.phase == 'cold' and (s.error or s.status >= 400)),
+            'warm': warm_all.to_dict(),
+            'targets': [st.to_dict() for st in sorted(stats.values(), key=lambda x: (x.phase, x.target))],
+            'histogram_ms': [{'le': bound, 'count': histogram[i]} for i, bound in enumerate(HISTOGRAM_BUCKETS)]
+                            + [{'le': None, 'count': histogram[-1]}],
+            'sample_errors': sorted({s.error for s in self.samples if s.error})[:5],
+            'notes': self.notes,
+        }
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:8.2f}" if value is not None else "     N/A"
+
+def print_report(report: Dict):
+    """Affiche le rapport en couleurs."""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'TEST DE CHARGE - API DE BRANDING'.center(70)}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+
+    print(f"{Colors.BOLD}Serveur:{Colors.ENDC} {report['server']}")
+    print(f"{Colors.BOLD}Concurrence:{Colors.ENDC} {report['concurrency']}")
+    print(f"{Colors.BOLD}Requêtes à chaud:{Colors.ENDC} {report['requests']} en {report['duration_s']:.2f}s")
+    if report['throughput_rps'] is not None:
+        print(f"{Colors.BOLD}Débit:{Colors.ENDC} {report['throughput_rps']} req/s")
+    color = Colors.RED if report['errors'] else Colors.GREEN
+    print(f"{Colors.BOLD}Erreurs:{Colors.ENDC} {color}{report['errors']}{Colors.ENDC}")
+
+    print(f"\n{'Phase':<6} {'Cible':<40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Err.':>5}")
+    print(f"{'-'*6} {'-'*40} {'-'*8} {'-'*8} {'-'*8} {'-'*5}")
+    for target in report['targets']:
+        print(f"{target['phase']:<6} {target['target'][:40]:<40} {_fmt(target['p50_ms'])} "
+              f"{_fmt(target['p95_ms'])} {_fmt(target['p99_ms'])} {target['errors']:>5}")
+
+    print(f"\n{Colors.BOLD}Histogramme des latences (à chaud):{Colors.ENDC}")
+    total = max(1, sum(b['count'] for b in report['histogram_ms']))
+    for bucket in report['histogram_ms']:
+        label = f"≤ {bucket['le']} ms" if bucket['le'] is not None else "> 5000 ms"
+        bar = '█' * int(round(40 * bucket['count'] / total))
+        print(f"  {label:>10} {bucket['count']:>7} {Colors.CYAN}{bar}{Colors.ENDC}")
+
+    for error in report['sample_errors']:
+        print(f"{Colors.RED}✗ {error}{Colors.ENDC}")
+    for note in report['notes']:
+        print(f"{Colors.YELLOW}⚠ {note}{Colors.ENDC}")
+    print()
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Simule les routes de branding (lecture + cache comme BrandingService)."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    branding_dir: Path = Path(".")
+    current_brand = "default"
+    cache: Dict[str, bytes] = {}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _load(self, brand: str) -> Optional[bytes]:
+        with self.lock:
+            cached = self.cache.get(brand)
+        if cached is not None:
+            return cached
+        path = self.branding_dir / f"{brand}.json"
+        if not path.exists():
+            return None
+        # Comme l'artefact compilé chargé par BrandingService : héritage résolu
+        config = load_config(self.branding_dir, brand)
+        body = json.dumps({'success': True, 'data': config}).encode('utf-8')
+        with self.lock:
+            self.cache[brand] = body
+        return body
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == "/api/branding/config":
+            brand = self.current_brand
+        elif path.startswith("/api/branding/config/"):
+            brand = unquote(path.rsplit('/', 1)[1])
+        else:
+            return self._send(404, {'success': False, 'error': 'Not found'})
+        body = self._load(brand) or self._load('default')
+        if body is None:
+            return self._send(404, {'success': False, 'error': 'Configuration introuvable'})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_DELETE(self):
+        if self.path.startswith("/api/branding/cache"):
+            with self.lock:
+                self.cache.clear()
+            return self._send(200, {'success': True})
+        self._send(404, {'success': False, 'error': 'Not found'})
+
+def start_stub_server(branding_dir: Path, brand: str = "default") -> ThreadingHTTPServer:
+    """Démarre le serveur simulé sur un port libre (thread en arrière-plan)."""
+    handler = type('StubHandler', (_StubHandler,), {
+        'branding_dir': branding_dir, 'current_brand': brand, 'cache': {}, 'lock': threading.Lock(),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Test de charge de l'API de branding")
+    parser.add_argument('--url', default="http://localhost:3000")
+    parser.add_argument('-c', '--concurrency', type=int, default=10)
+    parser.add_argument('-n', '--requests', type=int, default=200)
+    parser.add_argument('--brands', default=None, help="Liste séparée par des virgules")
+    parser.add_argument('--token', default=None)
+    parser.add_argument('--stub', action='store_true')
+    parser.add_argument('-j', '--json', action='store_true')
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du test de charge."""
+    args = build_parser().parse_args(argv)
+    branding_dir = get_project_root() / "config" / "branding"
+
+    if args.brands:
+        brands = [b.strip() for b in args.brands.split(',') if b.strip()]
+    else:
+        brands = sorted(f.stem for f in branding_dir.glob("*.json") if f.stem != 'client-template')
+
+    url = args.url
+    token = args.token
+    stub = None
+    if args.stub:
+        stub = start_stub_server(branding_dir)
+        url = f"http://127.0.0.1:{stub.server_address[1]}"
+        token = token or "stub"
+
+    try:
+        report = BrandingBenchmark(url, args.concurrency, args.requests, brands, token).run()
+    except ValueError as e:
+        print(f"{Colors.RED}✗ {e}{Colors.ENDC}")
+        return 2
+    finally:
+        if stub is not None:
+            stub.shutdown()
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 1 if report['errors'] else 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nTest interrompu par l'utilisateur")
+        sys.exit(130)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache des résultats de vérification - EB-Vision 2.0
+===================================================
+
+Base SQLite stockée à côté des configurations
+(config/branding/.verify-cache.sqlite) et utilisée par verify_branding.py.
+
+Chaque vérification déclare les fichiers qu'elle lit (configuration JSON,
+fichiers d'assets, fichiers source...). Leur empreinte SHA-256 est combinée
+en une empreinte d'entrée ; tant qu'elle ne change pas, les enregistrements
+et la valeur de retour de la vérification sont rejoués sans la réexécuter.
+
+Le condensat de chaque fichier est lui-même mémorisé par (mtime, taille) :
+un fichier inchangé n'est jamais relu, un fichier modifié est relu par blocs
+(les gros assets ne sont pas chargés en mémoire).
+"""
+
+import json
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CACHE_FILENAME = ".verify-cache.sqlite"
+SCHEMA_VERSION = 1
+CHUNK_SIZE = 1 << 20
+
+# Condensats particuliers (chemin absent ou dossier)
+ABSENT = "absent"
+DIRECTORY = "dir"
+
+
+def stream_digest(path: Path) -> str:
+    """SHA-256 d'un fichier, lu par blocs de CHUNK_SIZE."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Résultats de vérification indexés par l'empreinte de leurs entrées."""
+
+    def __init__(self, branding_dir: Path):
+        self.db_path = Path(branding_dir) / CACHE_FILENAME
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = self._connect()
+        self._files: Dict[str, Tuple[int, int, str]] = {
+            row[0]: (row[1], row[2], row[3])
+            for row in self.conn.execute("SELECT path, mtime_ns, size, digest FROM files")
+        }
+        self._dirty: Dict[str, Tuple[int, int, str]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base (en mémoire si le dossier n'est pas inscriptible)."""
+        try:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS files")
+            conn.execute("DROP TABLE IF EXISTS results")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                value TEXT,
+                records TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        return conn
+
+    def file_digest(self, path: Path) -> str:
+        """Condensat d'un fichier, recalculé seulement si mtime ou taille ont changé."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return ABSENT
+        if path.is_dir():
+            return DIRECTORY
+
+        key = str(path)
+        with self.lock:
+            known = self._files.get(key)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+
+        try:
+            digest = stream_digest(path)
+        except OSError:
+            return ABSENT
+        entry = (stat.st_mtime_ns, stat.st_size, digest)
+        with self.lock:
+            self._files[key] = entry
+            self._dirty[key] = entry
+        return digest
+
+    def fingerprint(self, inputs: Iterable[Path], *parts: str) -> str:
+        """Empreinte d'un ensemble de fichiers d'entrée et de paramètres."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8') + b'\0')
+        for path in inputs:
+            digest.update(str(path).encode('utf-8') + b'\0')
+            digest.update(self.file_digest(path).encode('ascii') + b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str, fingerprint: str) -> Optional[Tuple[Any, List[Dict]]]:
+        """Retourne (valeur, enregistrements) si l'empreinte correspond, sinon None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, records FROM results WHERE key = ? AND fingerprint = ?",
+                (key, fingerprint)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        value = json.loads(row[0])
+        # JSON ne connaît que les listes : les tuples retournés par les
+        # vérifications ((ok, données), ...) sont restitués comme tels
+        if isinstance(value, list):
+            value = tuple(value)
+        return value, json.loads(row[1])
+
+    def put(self, key: str, fingerprint: str, value: Any, records: List[Dict]):
+        """Mémorise le résultat d'une vérification."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, fingerprint, value, records) VALUES (?, ?, ?, ?)",
+                (key, fingerprint, json.dumps(value, ensure_ascii=False),
+                 json.dumps(records, ensure_ascii=False)))
+
+    def flush(self):
+        """Enregistre les résultats et les condensats recalculés."""
+        with self.lock:
+            if self._dirty:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                    [(path, *entry) for path, entry in self._dirty.items()])
+                self._dirty.clear()
+            self.conn.commit()
+
+    def close(self):
+        """Enregistre puis ferme la base."""
+        self.flush()
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catalogue persistant des configurations de branding - EB-Vision 2.0
+===================================================================
+
+Index SQLite des métadonnées de chaque fichier config/branding/*.json,
+stocké à côté des configurations (config/branding/.catalog.sqlite).
+
+Chaque entrée est indexée par la date de modification (mtime) et la taille
+du fichier, ainsi que celles des parents de sa chaîne "extends" : seuls les
+fichiers nouveaux ou modifiés, et les tenants dont un parent a changé, sont
+relus et parsés.
+Le filtrage et le tri se font en SQL, sans charger aucun JSON.
+
+Le nom commence par un point : express.static ignore les fichiers cachés,
+le catalogue n'est donc pas exposé par la route /config du serveur.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from branding_compile import chain_files, load_config
+
+CATALOG_FILENAME = ".catalog.sqlite"
+SCHEMA_VERSION = 2
+
+# Colonnes autorisées pour le tri (protège la requête SQL)
+SORT_KEYS = {
+    'id': 'id',
+    'name': 'name COLLATE NOCASE',
+    'mtime': 'mtime_ns DESC',
+    'size': 'size DESC',
+}
+
+EXCLUDED_IDS = {'client-template'}
+
+
+def extract_metadata(data: Dict) -> Dict:
+    """Extrait les métadonnées affichables d'une configuration."""
+    app = data.get('app') if isinstance(data.get('app'), dict) else {}
+    branding = data.get('branding') if isinstance(data.get('branding'), dict) else {}
+    colors = branding.get('colors') if isinstance(branding.get('colors'), dict) else {}
+    return {
+        'name': app.get('name') or data.get('name') or 'N/A',
+        'short_name': app.get('shortName', ''),
+        'tagline': app.get('tagline') or data.get('tagline') or '',
+        'primary_color': colors.get('primary', ''),
+        'theme': branding.get('theme', ''),
+    }
+
+
+class BrandingCatalog:
+    """Catalogue incrémental des configurations de branding."""
+
+    def __init__(self, branding_dir: Path):
+        self.branding_dir = Path(branding_dir)
+        self.db_path = self.branding_dir / CATALOG_FILENAME
+        self.conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la base (en mémoire si le dossier n'est pas inscriptible)."""
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.execute("DROP TABLE IF EXISTS configs")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS configs (
+                file TEXT PRIMARY KEY,
+                id TEXT NOT NULL,
+                name TEXT,
+                short_name TEXT,
+                tagline TEXT,
+                primary_color TEXT,
+                theme TEXT,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                parents TEXT NOT NULL DEFAULT '[]',
+                error TEXT
+            )
+        """)
+        conn.commit()
+        return conn
+
+    def refresh(self) -> int:
+        """
+        Synchronise le catalogue avec le dossier. Retourne le nombre de
+        fichiers relus (nouveaux, modifiés ou dont un parent a changé).
+        """
+        # Les entrées en erreur sont relues : la chaîne peut dépendre d'un parent à venir
+        known = {row['file']: ((row['mtime_ns'], row['size']), json.loads(row['parents']))
+                 for row in self.conn.execute(
+                     "SELECT file, mtime_ns, size, parents FROM configs WHERE error IS NULL")}
+
+        # Signature de tous les fichiers : un parent peut être exclu de la liste
+        signatures = {}
+        with os.scandir(self.branding_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        seen = set()
+        reparsed = 0
+        for name, signature in signatures.items():
+            config_id = name[:-len('.json')]
+            if config_id in EXCLUDED_IDS:
+                continue
+            seen.add(name)
+            cached = known.get(name)
+            if cached and cached[0] == signature and all(
+                    tuple(parent[1:]) == signatures.get(parent[0]) for parent in cached[1]):
+                continue
+
+            metadata = {'name': 'N/A', 'short_name': '', 'tagline': '',
+                        'primary_color': '', 'theme': ''}
+            error = None
+            try:
+                # Héritage résolu : nom et couleurs peuvent venir du parent
+                metadata = extract_metadata(load_config(self.branding_dir, config_id))
+            except Exception as e:
+                error = str(e)
+            # Parents lus pour cette entrée : [fichier, mtime_ns, taille]
+            parents = [[path.name, *signatures.get(path.name, (0, 0))]
+                       for path in chain_files(self.branding_dir, config_id)[1:]]
+
+            self.conn.execute("""
+                INSERT OR REPLACE INTO configs
+                    (file, id, name, short_name, tagline, primary_color, theme, mtime_ns, size, parents, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, config_id, metadata['name'], metadata['short_name'],
+                  metadata['tagline'], metadata['primary_color'], metadata['theme'],
+                  signature[0], signature[1], json.dumps(parents), error))
+            reparsed += 1
+
+        removed = {row['file'] for row in self.conn.execute("SELECT file FROM configs")} - seen
+        if removed:
+            self.conn.executemany("DELETE FROM configs WHERE file = ?", [(f,) for f in removed])
+        self.conn.commit()
+        return reparsed
+
+    def query(self, filter_text: Optional[str] = None, sort_by: str = 'id',
+              include_errors: bool = False) -> List[Dict]:
+        """Liste les configurations, filtrées (id, nom, slogan) et triées."""
+        order = SORT_KEYS.get(sort_by, SORT_KEYS['id'])
+        sql = "SELECT * FROM configs"
+        clauses = []
+        params: List[str] = []
+        if not include_errors:
+            clauses.append("error IS NULL")
+        if filter_text:
+            # Texte littéral : % et _ ne sont pas des jokers
+            clauses.append("(id LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\' OR tagline LIKE ? ESCAPE '\\')")
+            escaped = filter_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            pattern = f"%{escaped}%"
+            params.extend([pattern, pattern, pattern])
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order}, id"
+
+        return [{
+            'id': row['id'],
+            'name': row['name'],
+            'short_name': row['short_name'],
+            'tagline': row['tagline'],
+            'primary_color': row['primary_color'],
+            'theme': row['theme'],
+            'file': row['file'],
+            'path': str(self.branding_dir / row['file']),
+            'size': row['size'],
+            'error': row['error'],
+        } for row in self.conn.execute(sql, params)]
+
+    def errors(self) -> List[Dict]:
+        """Retourne les fichiers qui n'ont pas pu être parsés."""
+        return [{'file': row['file'], 'error': row['error']}
+                for row in self.conn.execute(
+                    "SELECT file, error FROM configs WHERE error IS NOT NULL ORDER BY file")]
+
+    def close(self):
+        """Ferme la connexion."""
+        self.conn.close()
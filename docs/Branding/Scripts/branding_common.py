@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilitaires communs des scripts de branding - EB-Vision 2.0
+===========================================================
+
+Couleurs ANSI, affichage des messages et racine du projet, partagés par
+branding.py, configure_branding.py, verify_branding.py et branding_bench.py.
+
+Ce module n'importe que pathlib : il est chargé par toutes les commandes,
+y compris les plus courtes (--help, list).
+"""
+
+from pathlib import Path
+
+
+# Codes couleur ANSI
+class Colors:
+    HEADER = '\033[95m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+    UNDERLINE = '\033[4m'
+
+
+def print_header(text: str):
+    """Affiche un en-tête formaté."""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{text.center(70)}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+
+
+def print_success(text: str):
+    """Affiche un message de succès."""
+    print(f"{Colors.GREEN}✓ {text}{Colors.ENDC}")
+
+
+def print_error(text: str):
+    """Affiche un message d'erreur."""
+    print(f"{Colors.RED}✗ {text}{Colors.ENDC}")
+
+
+def print_warning(text: str):
+    """Affiche un avertissement."""
+    print(f"{Colors.YELLOW}⚠ {text}{Colors.ENDC}")
+
+
+def print_info(text: str):
+    """Affiche une information."""
+    print(f"{Colors.BLUE}ℹ {text}{Colors.ENDC}")
+
+
+def get_project_root() -> Path:
+    """Retourne la racine du projet."""
+    script_dir = Path(__file__).resolve().parent
+    # Remonter de Scripts/ -> Branding/ -> docs/ -> racine
+    return script_dir.parent.parent.parent
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Héritage des configurations et artefacts compilés - EB-Vision 2.0
+=================================================================
+
+Une configuration config/branding/<id>.json peut déclarer un parent avec
+la clé "extends" et ne contenir que les valeurs qui en diffèrent :
+
+    {"extends": "default", "app": {"name": "CLIENT A"},
+     "branding": {"colors": {"primary": "#123456"}}}
+
+La compilation résout la chaîne d'héritage (parent du parent...) avec la
+même fusion que deepMerge dans BrandingService : les objets sont fusionnés
+clé par clé, les tableaux et les valeurs simples du tenant remplacent ceux
+du parent. Le résultat est écrit, minifié, dans
+config/branding/compiled/<id>.json : BrandingService charge cet artefact
+tel quel, sans fusion au runtime.
+
+Les outils Python lisent les configurations via load_config(), qui résout
+l'héritage : thèmes, palette, inlining, aperçu, vérification et diff voient
+la configuration complète.
+
+Usage:
+    python branding.py compile [ids] [--check]
+    python branding.py compile <id> --extends <parent>   # réduit <id> aux écarts
+"""
+
+import sys
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+EXTENDS_KEY = "extends"
+COMPILED_DIRNAME = "compiled"
+
+
+class InheritanceError(ValueError):
+    """Chaîne d'héritage invalide (parent introuvable, cycle)."""
+
+
+@dataclass
+class CompileResult:
+    """Compilation d'un tenant."""
+    brand_id: str
+    chain: List[str]
+    changed: bool = False
+    size: int = 0
+    source_size: int = 0
+    error: Optional[str] = None
+
+
+def deep_merge(base: Dict, override: Dict) -> Dict:
+    """Fusion profonde, identique à BrandingService.deepMerge."""
+    output = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            output[key] = deep_merge(base[key], value)
+        else:
+            output[key] = value
+    return output
+
+
+def tenant_ids(branding_dir: Path) -> List[str]:
+    """Tenants compilables (les modèles ne sont jamais servis)."""
+    return sorted(f.stem for f in branding_dir.glob("*.json") if 'template' not in f.stem)
+
+
+def read_layer(branding_dir: Path, brand_id: str) -> Dict:
+    """Fichier source d'un tenant, sans résolution de l'héritage."""
+    with open(branding_dir / f"{brand_id}.json", 'r', encoding='utf-8') as f:
+        layer = json.load(f)
+    if not isinstance(layer, dict):
+        raise InheritanceError(f"{brand_id}.json: un objet JSON est attendu")
+    return layer
+
+
+def resolve_chain(branding_dir: Path, brand_id: str) -> List[Tuple[str, Dict]]:
+    """
+    Couches de la chaîne d'héritage, du tenant vers la racine.
+    Lève OSError / json.JSONDecodeError à la lecture du tenant,
+    InheritanceError pour un parent introuvable ou un cycle.
+    """
+    chain: List[Tuple[str, Dict]] = []
+    seen: List[str] = []
+    current: Optional[str] = brand_id
+    while current is not None:
+        if current in seen:
+            raise InheritanceError(f"héritage circulaire: {' → '.join(seen + [current])}")
+        seen.append(current)
+        if chain and not (branding_dir / f"{current}.json").exists():
+            raise InheritanceError(f"{seen[-2]}: parent '{current}' introuvable")
+        layer = read_layer(branding_dir, current)
+        chain.append((current, layer))
+        parent = layer.get(EXTENDS_KEY)
+        if parent is not None and (not isinstance(parent, str) or not parent):
+            raise InheritanceError(f"{current}: '{EXTENDS_KEY}' doit être un identifiant de tenant")
+        current = parent
+    return chain
+
+
+def resolve(chain: List[Tuple[str, Dict]]) -> Dict:
+    """Configuration complète d'une chaîne (la clé extends disparaît)."""
+    config: Dict = {}
+    for _, layer in reversed(chain):
+        config = deep_merge(config, layer)
+    config.pop(EXTENDS_KEY, None)
+    return config
+
+
+# Configurations résolues : (fichiers de la chaîne et leurs (mtime, taille), configuration)
+_RESOLVED: Dict[Tuple[Path, str], Tuple[List[Tuple[Path, Tuple[int, int]]], Dict]] = {}
+
+
+def _signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_config(branding_dir: Path, brand_id: str) -> Dict:
+    """
+    Configuration résolue d'un tenant. Seuls les fichiers de la chaîne sont
+    consultés (stat) tant qu'aucun n'a changé. Mêmes exceptions que
+    resolve_chain() ; le résultat ne doit pas être modifié.
+    """
+    key = (branding_dir, brand_id)
+    cached = _RESOLVED.get(key)
+    if cached:
+        try:
+            if all(_signature(path) == signature for path, signature in cached[0]):
+                return cached[1]
+        except OSError:
+            pass
+    chain = resolve_chain(branding_dir, brand_id)
+    files = [(branding_dir / f"{layer_id}.json", _signature(branding_dir / f"{layer_id}.json"))
+             for layer_id, _ in chain]
+    config = resolve(chain)
+    _RESOLVED[key] = (files, config)
+    return config
+
+
+def load_config_file(config_file: Path) -> Dict:
+    """load_config() à partir d'un chemin (fichier hors config/branding compris)."""
+    return load_config(config_file.parent, config_file.stem)
+
+
+def chain_files(branding_dir: Path, brand_id: str) -> List[Path]:
+    """Fichiers dont dépend un tenant (lui-même d'abord) ; partiel si la chaîne est invalide."""
+    files = [branding_dir / f"{brand_id}.json"]
+    try:
+        files += [branding_dir / f"{layer_id}.json" for layer_id, _ in resolve_chain(branding_dir, brand_id)[1:]]
+    except (OSError, ValueError):
+        pass
+    return files
+
+
+def descendants(branding_dir: Path, brand_id: str) -> Set[str]:
+    """Tenants qui héritent (directement ou non) de brand_id."""
+    found: Set[str] = set()
+    for tenant in tenant_ids(branding_dir):
+        if tenant == brand_id:
+            continue
+        if branding_dir / f"{brand_id}.json" in chain_files(branding_dir, tenant)[1:]:
+            found.add(tenant)
+    return found
+
+
+def compiled_dir(branding_dir: Path) -> Path:
+    """Dossier des artefacts (config/branding/compiled)."""
+    return branding_dir / COMPILED_DIRNAME
+
+
+def render_artifact(config: Dict) -> str:
+    """JSON minifié servi par l'API."""
+    return json.dumps(config, ensure_ascii=False, separators=(',', ':'))
+
+
+def compile_brand(branding_dir: Path, brand_id: str) -> CompileResult:
+    """Écrit l'artefact d'un tenant (seulement si son contenu change)."""
+    try:
+        chain = resolve_chain(branding_dir, brand_id)
+    except (OSError, ValueError) as e:
+        return CompileResult(brand_id, [brand_id], error=str(e))
+    content = render_artifact(resolve(chain))
+    output = compiled_dir(branding_dir) / f"{brand_id}.json"
+    result = CompileResult(brand_id, [layer_id for layer_id, _ in chain],
+                           size=len(content.encode('utf-8')),
+                           source_size=(branding_dir / f"{brand_id}.json").stat().st_size)
+    if output.exists() and output.read_text(encoding='utf-8') == content:
+        # Source réenregistrée sans changement : le serveur préfère l'artefact plus récent
+        newest = max((branding_dir / f"{layer_id}.json").stat().st_mtime for layer_id in result.chain)
+        if output.stat().st_mtime < newest:
+            output.touch()
+        return result
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temporary = output.with_suffix('.json.tmp')
+    temporary.write_text(content, encoding='utf-8')
+    temporary.replace(output)
+    result.changed = True
+    return result
+
+
+def compile_brands(branding_dir: Path, brand_ids: Optional[List[str]] = None) -> List[CompileResult]:
+    """Compile les tenants demandés (tous par défaut)."""
+    return [compile_brand(branding_dir, brand_id) for brand_id in (brand_ids or tenant_ids(branding_dir))]
+
+
+def prune_artifacts(branding_dir: Path, brand_ids: Optional[List[str]] = None) -> List[str]:
+    """
+    Supprime les artefacts dont la source n'existe plus (le serveur les
+    servirait encore). Retourne les tenants concernés.
+    """
+    output_dir = compiled_dir(branding_dir)
+    if brand_ids is None:
+        brand_ids = [f.stem for f in output_dir.glob("*.json")] if output_dir.is_dir() else []
+    removed = []
+    for brand_id in brand_ids:
+        artifact = output_dir / f"{brand_id}.json"
+        if artifact.exists() and not (branding_dir / f"{brand_id}.json").exists():
+            artifact.unlink()
+            removed.append(brand_id)
+    return sorted(removed)
+
+
+def artifact_status(branding_dir: Path, brand_id: str) -> Optional[str]:
+    """Écart entre l'artefact et la source (None s'il est à jour)."""
+    output = compiled_dir(branding_dir) / f"{brand_id}.json"
+    try:
+        expected = render_artifact(load_config(branding_dir, brand_id))
+    except (OSError, ValueError) as e:
+        return str(e)
+    if not output.exists():
+        if EXTENDS_KEY in read_layer(branding_dir, brand_id):
+            return "artefact compilé absent : le serveur ne peut pas charger ce tenant"
+        return None  # Le serveur lit directement la source d'un tenant sans parent
+    if output.read_text(encoding='utf-8') != expected:
+        return "artefact compilé obsolète"
+    return None
+
+
+def extract_overrides(base: Any, config: Any) -> Tuple[Dict, List[str]]:
+    """
+    Couche minimale qui, fusionnée sur `base`, redonne `config`.
+    Retourne (couche, chemins présents dans base mais absents de config :
+    l'héritage ne sait pas les supprimer).
+    """
+    overrides: Dict = {}
+    missing: List[str] = []
+
+    def walk(base_node: Dict, node: Dict, target: Dict, prefix: str):
+        for key, value in node.items():
+            if key not in base_node:
+                target[key] = value
+            elif isinstance(value, dict) and isinstance(base_node[key], dict):
+                child: Dict = {}
+                walk(base_node[key], value, child, f"{prefix}{key}.")
+                if child:
+                    target[key] = child
+            elif value != base_node[key]:
+                target[key] = value
+        missing.extend(f"{prefix}{key}" for key in base_node if key not in node)
+
+    walk(base, config, overrides, '')
+    return overrides, missing
+
+
+def rebase(branding_dir: Path, brand_id: str, parent: str) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Réduit <id>.json aux valeurs qui diffèrent de <parent> (résolu).
+    Retourne (nouvelle couche ou None si impossible, chemins bloquants).
+    """
+    config = load_config(branding_dir, brand_id)
+    if brand_id in [layer_id for layer_id, _ in resolve_chain(branding_dir, parent)]:
+        raise InheritanceError(f"'{parent}' hérite déjà de '{brand_id}'")
+    overrides, missing = extract_overrides(load_config(branding_dir, parent), config)
+    if missing:
+        return None, missing
+    layer = {EXTENDS_KEY: parent, **overrides}
+    with open(branding_dir / f"{brand_id}.json", 'w', encoding='utf-8') as f:
+        json.dump(layer, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    return layer, []
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la compilation."""
+    import argparse
+    from branding_common import Colors, get_project_root
+
+    parser = argparse.ArgumentParser(prog="branding.py compile",
+                                     description="Résout l'héritage (extends) en artefacts compilés")
+    parser.add_argument('brands', nargs='*', help="Tenants à compiler (défaut: tous)")
+    parser.add_argument('--check', action='store_true',
+                        help="Vérifier que les artefacts sont à jour sans les écrire")
+    parser.add_argument('--extends', metavar='PARENT', default=None,
+                        help="Réduire le tenant aux valeurs qui diffèrent de PARENT")
+    args = parser.parse_args(argv)
+    branding_dir = get_project_root() / "config" / "branding"
+
+    if args.extends:
+        if len(args.brands) != 1:
+            parser.error("--extends s'applique à un seul tenant")
+        brand_id = args.brands[0]
+        before = (branding_dir / f"{brand_id}.json").stat().st_size
+        try:
+            layer, missing = rebase(branding_dir, brand_id, args.extends)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}✗ {e}{Colors.ENDC}")
+            return 1
+        if layer is None:
+            print(f"{Colors.RED}✗ {brand_id}: clés de '{args.extends}' absentes du tenant "
+                  f"(impossibles à retirer par héritage):{Colors.ENDC}")
+            for path in missing:
+                print(f"    {path}")
+            return 1
+        after = (branding_dir / f"{brand_id}.json").stat().st_size
+        print(f"{Colors.GREEN}✓{Colors.ENDC} {brand_id}.json hérite de '{args.extends}' "
+              f"({before} → {after} octets, {len(layer) - 1} section(s) redéfinie(s))")
+        args.brands = [brand_id] + sorted(descendants(branding_dir, brand_id))
+
+    if args.check:
+        stale = {brand_id: artifact_status(branding_dir, brand_id)
+                 for brand_id in (args.brands or tenant_ids(branding_dir))}
+        for brand_id, status in stale.items():
+            if status:
+                print(f"{Colors.YELLOW}⚠{Colors.ENDC} {brand_id}: {status}")
+        if not any(stale.values()):
+            print(f"{Colors.GREEN}✓ Artefacts compilés à jour ({len(stale)} tenant(s)){Colors.ENDC}")
+        return 1 if any(stale.values()) else 0
+
+    results = compile_brands(branding_dir, args.brands)
+    removed = [] if args.brands else prune_artifacts(branding_dir)
+    for brand_id in removed:
+        print(f"{Colors.YELLOW}-{Colors.ENDC} {brand_id:<24} source supprimée, artefact retiré")
+    for result in results:
+        if result.error:
+            print(f"{Colors.RED}✗ {result.brand_id}: {result.error}{Colors.ENDC}")
+            continue
+        mark = f"{Colors.GREEN}✓{Colors.ENDC}" if result.changed else f"{Colors.CYAN}={Colors.ENDC}"
+        chain = ' → '.join(result.chain)
+        print(f"{mark} {result.brand_id:<24} {chain:<32} source {result.source_size} o, "
+              f"compilé {result.size} o")
+    written = sum(1 for r in results if r.changed)
+    print(f"\n{Colors.BOLD}{written} artefact(s) écrit(s){Colors.ENDC} dans "
+          f"config/branding/{COMPILED_DIRNAME}/ ({len(results) - written} inchangé(s))")
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Déclinaisons d'un logo source - EB-Vision 2.0
+=============================================
+
+À partir d'un seul logo source (public/assets/brands/<id>/source/logo.png,
+.jpg, .webp ou .svg), produit dans public/assets/brands/<id>/ :
+
+- favicon.ico multi-résolution (16, 32 et 48 px) ;
+- pour chaque rôle de branding.logo (icon, main), une version PNG et une
+  version WebP à la hauteur affichée (1x) et au double (2x, écrans haute
+  densité), jamais agrandies au-delà de la source ;
+- un manifeste logos.json (empreinte de la source, fichiers, dimensions).
+
+Le manifeste mémorise l'empreinte SHA-256 de la source et les paramètres du
+pipeline : tant qu'ils ne changent pas et que les fichiers sont présents, le
+logo n'est pas retraité.
+
+Pillow est requis (« pip install Pillow ») ; un source SVG demande en plus
+CairoSVG (« pip install cairosvg ») pour être rastérisé.
+"""
+
+import io
+import json
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from PIL import Image  # Optionnel : pip install Pillow
+except ImportError:
+    Image = None
+
+try:
+    import cairosvg  # Optionnel : pip install cairosvg (sources SVG)
+except ImportError:
+    cairosvg = None
+
+from branding_cache import stream_digest
+from branding_images import ROLE_BUDGETS
+
+SOURCE_DIRNAME = "source"
+SOURCE_EXTENSIONS = ('.svg', '.png', '.webp', '.jpg', '.jpeg')
+MANIFEST_FILENAME = "logos.json"
+# À incrémenter quand les sorties changent pour une même source
+PIPELINE_VERSION = 1
+
+FAVICON_FILENAME = "favicon.ico"
+FAVICON_SIZES = [16, 32, 48]
+
+# Contexte -> (hauteur affichée en px CSS, clé de branding.logo) : mêmes
+# hauteurs que les budgets de `branding.py images`
+CONTEXTS = {
+    'icon': (ROLE_BUDGETS['icon'][0], 'icon'),
+    'main': (ROLE_BUDGETS['main'][0], 'main'),
+}
+DENSITIES = [1, 2]
+WEBP_QUALITY = 90
+# Hauteur de rastérisation d'un SVG : la plus grande sortie, avec une marge
+SVG_RENDER_HEIGHT = 512
+
+
+@dataclass
+class DerivativeResult:
+    """Résultat du traitement d'un tenant."""
+    brand_id: str
+    status: str  # built | unchanged | skipped | error
+    message: str = ''
+    manifest: Dict = field(default_factory=dict)
+    written: List[str] = field(default_factory=list)
+
+
+def missing_dependency(source: Optional[Path] = None) -> Optional[str]:
+    """Module manquant pour traiter la source (None si tout est disponible)."""
+    if Image is None:
+        return "Pillow"
+    if source is not None and source.suffix.lower() == '.svg' and cairosvg is None:
+        return "cairosvg"
+    return None
+
+
+def find_source(assets_dir: Path) -> Optional[Path]:
+    """Logo source d'un tenant : premier fichier image de source/ (ordre de SOURCE_EXTENSIONS)."""
+    source_dir = assets_dir / SOURCE_DIRNAME
+    if not source_dir.is_dir():
+        return None
+    candidates = [f for f in source_dir.iterdir()
+                  if f.is_file() and f.suffix.lower() in SOURCE_EXTENSIONS]
+    candidates.sort(key=lambda f: (SOURCE_EXTENSIONS.index(f.suffix.lower()), f.name))
+    return candidates[0] if candidates else None
+
+
+def settings_key() -> str:
+    """Empreinte des paramètres du pipeline (tailles, contextes, qualité)."""
+    settings = json.dumps([PIPELINE_VERSION, FAVICON_SIZES, CONTEXTS, DENSITIES,
+                           WEBP_QUALITY, SVG_RENDER_HEIGHT], sort_keys=True)
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]
+
+
+def load_manifest(assets_dir: Path) -> Dict:
+    """Lit logos.json (dict vide s'il n'existe pas ou est illisible)."""
+    try:
+        with open(assets_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def manifest_files(manifest: Dict) -> List[str]:
+    """Fichiers produits d'après un manifeste."""
+    files = [manifest['favicon']] if manifest.get('favicon') else []
+    for context in manifest.get('contexts', {}).values():
+        for image in context.get('images', []):
+            files += [image['png'], image['webp']]
+    return files
+
+
+def open_source(source: Path):
+    """Ouvre la source en RGBA (SVG rastérisé par CairoSVG)."""
+    if source.suffix.lower() == '.svg':
+        png = cairosvg.svg2png(url=str(source), output_height=SVG_RENDER_HEIGHT)
+        image = Image.open(io.BytesIO(png))
+    else:
+        image = Image.open(source)
+    return image.convert('RGBA')
+
+
+def resize_to_height(image, height: int):
+    """Redimensionne à la hauteur donnée (proportions conservées, jamais agrandi)."""
+    height = min(height, image.height)
+    width = max(1, round(image.width * height / image.height))
+    if (width, height) == image.size:
+        return image
+    # reducing_gap : réduction entière rapide avant le filtre Lanczos
+    return image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+
+def square_canvas(image):
+    """Centre l'image sur un carré transparent (favicon)."""
+    side = max(image.size)
+    canvas = Image.new('RGBA', (side, side), (0, 0, 0, 0))
+    canvas.paste(image, ((side - image.width) // 2, (side - image.height) // 2))
+    return canvas
+
+
+def build_derivatives(assets_dir: Path, brand_id: str, source: Optional[Path] = None,
+                      force: bool = False) -> DerivativeResult:
+    """Produit favicon, PNG/WebP par contexte et manifeste pour un tenant."""
+    source = source or find_source(assets_dir)
+    if source is None:
+        return DerivativeResult(brand_id, 'skipped',
+                                f"aucun logo source dans {SOURCE_DIRNAME}/ ({', '.join(SOURCE_EXTENSIONS)})")
+    missing = missing_dependency(source)
+    if missing:
+        return DerivativeResult(brand_id, 'error', f"module '{missing}' requis (pip install {missing})")
+
+    try:
+        source_hash = stream_digest(source)
+    except OSError as e:
+        return DerivativeResult(brand_id, 'error', f"lecture impossible de {source.name}: {e}")
+
+    previous = load_manifest(assets_dir)
+    if (not force and previous.get('sourceHash') == source_hash
+            and previous.get('settings') == settings_key()
+            and all((assets_dir / name).exists() for name in manifest_files(previous))):
+        return DerivativeResult(brand_id, 'unchanged', manifest=previous)
+
+    try:
+        original = open_source(source)
+    except Exception as e:
+        return DerivativeResult(brand_id, 'error', f"image illisible {source.name}: {e}")
+
+    written: List[str] = []
+    favicon = resize_to_height(square_canvas(original), max(FAVICON_SIZES))
+    favicon.save(assets_dir / FAVICON_FILENAME, format='ICO',
+                 sizes=[(size, size) for size in FAVICON_SIZES])
+    written.append(FAVICON_FILENAME)
+
+    contexts: Dict[str, Dict] = {}
+    for context, (display_height, logo_key) in CONTEXTS.items():
+        images = []
+        for density in DENSITIES:
+            resized = resize_to_height(original, display_height * density)
+            suffix = "" if density == 1 else f"@{density}x"
+            png_name = f"logo-{context}{suffix}.png"
+            webp_name = f"logo-{context}{suffix}.webp"
+            resized.save(assets_dir / png_name, format='PNG', optimize=True)
+            resized.save(assets_dir / webp_name, format='WEBP', quality=WEBP_QUALITY, method=6)
+            written += [png_name, webp_name]
+            images.append({
+                'density': density,
+                'width': resized.width,
+                'height': resized.height,
+                'png': png_name,
+                'webp': webp_name,
+                'pngSize': (assets_dir / png_name).stat().st_size,
+                'webpSize': (assets_dir / webp_name).stat().st_size,
+            })
+        contexts[context] = {'displayHeight': display_height, 'logoKey': logo_key, 'images': images}
+
+    manifest = {
+        'source': f"{SOURCE_DIRNAME}/{source.name}" if source.parent == assets_dir / SOURCE_DIRNAME else str(source),
+        'sourceHash': source_hash,
+        'sourceSize': [original.width, original.height],
+        'settings': settings_key(),
+        'favicon': FAVICON_FILENAME,
+        'faviconSizes': FAVICON_SIZES,
+        'contexts': contexts,
+    }
+    # Fichiers d'une version précédente qui ne sont plus produits
+    for stale in set(manifest_files(previous)) - set(written):
+        (assets_dir / stale).unlink(missing_ok=True)
+    with open(assets_dir / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return DerivativeResult(brand_id, 'built', manifest=manifest, written=written)
+
+
+def logo_paths(brand_id: str, manifest: Dict) -> Dict[str, str]:
+    """
+    Valeurs de branding.logo d'après le manifeste : PNG 1x en src (icon,
+    main), WebP 1x/2x en srcset (iconSrcset, mainSrcset), favicon.
+    """
+    prefix = f"/assets/brands/{brand_id}/"
+    paths = {'favicon': prefix + manifest['favicon']}
+    for context in manifest['contexts'].values():
+        key = context['logoKey']
+        images = context['images']
+        paths[key] = prefix + images[0]['png']
+        paths[f"{key}Srcset"] = ", ".join(f"{prefix}{image['webp']} {image['density']}x" for image in images)
+    return paths
+
+
+def update_config_logos(root: Path, brand_id: str, manifest: Dict) -> List[str]:
+    """
+    Réécrit branding.logo dans config/branding/<id>.json. Si le tenant est déjà
+    servi depuis dist/ (build-assets), ses assets sont reconstruits et les
+    valeurs, srcset compris, pointent vers les URL hachées. Retourne les clés
+    modifiées.
+    """
+    import branding_assets
+
+    config_file = root / "config" / "branding" / f"{brand_id}.json"
+    if not config_file.exists():
+        return []
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    paths = logo_paths(brand_id, manifest)
+    if branding_assets.load_manifest(root, brand_id):
+        assets_manifest = branding_assets.build_brand_assets(root, brand_id)
+        branding_assets.rewrite_logo_paths({'branding': {'logo': paths}}, brand_id, assets_manifest)
+
+    logo = config.setdefault('branding', {}).setdefault('logo', {})
+    changed = []
+    for key, value in paths.items():
+        if logo.get(key) != value:
+            logo[key] = value
+            changed.append(key)
+    if changed:
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    return changed
+
+
+def build_all(root: Path, brand_ids: List[str], source: Optional[Path] = None,
+              force: bool = False, workers: Optional[int] = None) -> List[DerivativeResult]:
+    """Traite plusieurs tenants en parallèle (Pillow libère le GIL pendant les redimensionnements)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(brand_id: str) -> DerivativeResult:
+        assets_dir = root / "public" / "assets" / "brands" / brand_id
+        if not assets_dir.is_dir():
+            return DerivativeResult(brand_id, 'skipped', f"dossier public/assets/brands/{brand_id}/ absent")
+        try:
+            return build_derivatives(assets_dir, brand_id, source, force)
+        except OSError as e:
+            return DerivativeResult(brand_id, 'error', str(e))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, brand_ids))
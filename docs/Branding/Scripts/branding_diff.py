@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Différences structurelles entre configurations - EB-Vision 2.0
+==============================================================
+
+Chaque document JSON est transformé en arbre de Merkle : l'empreinte d'un
+objet ou d'un tableau est calculée à partir de celles de ses enfants. Deux
+sous-arbres de même empreinte sont identiques et ne sont jamais parcourus ;
+seules les branches qui diffèrent sont descendues jusqu'aux valeurs.
+
+Chaque nœud porte deux empreintes :
+
+- `digest` : contenu complet (clés, types et valeurs) ;
+- `shape` : structure seule (clés et types), qui sert à comparer un tenant
+  à client-template.json, dont les valeurs sont par nature remplacées.
+
+Modes :
+
+- deux configurations (identifiants ou fichiers) ;
+- un fichier et la réponse de /api/branding/config (--api) ;
+- tous les tenants et client-template.json (--template) : clés absentes ou
+  ajoutées, types changés et placeholders jamais remplacés.
+
+Usage:
+    python branding.py diff <a> <b> [-j]
+    python branding.py diff <id> --api [--url URL] [-j]
+    python branding.py diff --template [ids] [-j]
+"""
+
+import sys
+import json
+import hashlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from branding_common import Colors
+
+PathKey = Union[str, int]
+TEMPLATE_FILENAME = "client-template.json"
+# Clés de documentation (_comment...) ignorées dans la comparaison au template
+IGNORED_PREFIX = "_"
+# Valeur affichée tronquée au-delà
+PREVIEW_LENGTH = 60
+
+
+class MerkleNode:
+    """Nœud d'un document JSON et empreintes de son sous-arbre."""
+    __slots__ = ('kind', 'digest', 'shape', 'children', 'value', 'size')
+
+    def __init__(self, value: Any):
+        if isinstance(value, dict):
+            self.kind = 'object'
+            self.children: Optional[Dict[PathKey, 'MerkleNode']] = {
+                key: MerkleNode(child) for key, child in value.items()}
+            keys = sorted(self.children)
+            content = b''.join(key.encode('utf-8') + b'\0' + self.children[key].digest.encode('ascii')
+                               for key in keys)
+            shape = b''.join(key.encode('utf-8') + b'\0' + self.children[key].shape.encode('ascii')
+                             for key in keys if not key.startswith(IGNORED_PREFIX))
+        elif isinstance(value, list):
+            self.kind = 'array'
+            self.children = {index: MerkleNode(child) for index, child in enumerate(value)}
+            content = b''.join(child.digest.encode('ascii') for child in self.children.values())
+            # Structure d'un tableau : types distincts de ses éléments
+            shape = b''.join(sorted({child.shape.encode('ascii') for child in self.children.values()}))
+        else:
+            self.kind = 'null' if value is None else type(value).__name__
+            self.children = None
+            content = json.dumps(value, ensure_ascii=False).encode('utf-8')
+            shape = b''
+        self.value = value if self.children is None else None
+        self.size = 1 + sum(child.size for child in (self.children or {}).values())
+        self.digest = hashlib.sha1(self.kind.encode('ascii') + b':' + content).hexdigest()
+        self.shape = hashlib.sha1(self.kind.encode('ascii') + b':' + shape).hexdigest()
+
+
+@dataclass
+class Difference:
+    """Écart en un chemin JSON."""
+    path: str
+    change: str  # modifié | absent | ajouté | type | placeholder
+    left: Any = None
+    right: Any = None
+
+
+@dataclass
+class DiffReport:
+    """Résultat d'une comparaison."""
+    left: str
+    right: str
+    identical: bool
+    differences: List[Difference] = field(default_factory=list)
+    nodes: int = 0
+    visited: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def dotted(path: Tuple[PathKey, ...]) -> str:
+    """Chemin lisible (branding.colors.primary, localization.availableLanguages[0])."""
+    text = ''
+    for key in path:
+        text += f'[{key}]' if isinstance(key, int) else (f'.{key}' if text else key)
+    return text or '(racine)'
+
+
+def preview(node: Optional[MerkleNode]) -> Any:
+    """Valeur d'un nœud pour l'affichage (résumé pour objets et tableaux)."""
+    if node is None:
+        return None
+    if node.children is not None:
+        return f"<{node.kind} de {len(node.children)} élément(s)>"
+    if isinstance(node.value, str) and len(node.value) > PREVIEW_LENGTH:
+        return node.value[:PREVIEW_LENGTH] + '…'
+    return node.value
+
+
+def diff_nodes(left: MerkleNode, right: MerkleNode, path: Tuple[PathKey, ...] = (),
+               structural: bool = False, report: Optional[DiffReport] = None) -> List[Difference]:
+    """
+    Descend uniquement dans les sous-arbres d'empreintes différentes.
+    `structural` compare les structures (clés, types) au lieu des valeurs.
+    """
+    differences = report.differences if report else []
+    if report:
+        report.visited += 1
+    if (left.shape if structural else left.digest) == (right.shape if structural else right.digest):
+        return differences
+    if left.kind != right.kind:
+        differences.append(Difference(dotted(path), 'type', left.kind, right.kind))
+        return differences
+    if left.children is None:
+        if not structural:
+            differences.append(Difference(dotted(path), 'modifié', preview(left), preview(right)))
+        return differences
+
+    if left.kind == 'array' and structural:
+        # Structure d'un tableau : un élément de référence suffit
+        if left.children and right.children:
+            diff_nodes(left.children[0], right.children[0], path + (0,), structural, report)
+        return differences
+    for key, child in left.children.items():
+        if structural and isinstance(key, str) and key.startswith(IGNORED_PREFIX):
+            continue
+        other = right.children.get(key)
+        if other is None:
+            differences.append(Difference(dotted(path + (key,)), 'absent', preview(child), None))
+        else:
+            diff_nodes(child, other, path + (key,), structural, report)
+    for key, child in right.children.items():
+        if structural and isinstance(key, str) and key.startswith(IGNORED_PREFIX):
+            continue
+        if key not in left.children:
+            differences.append(Difference(dotted(path + (key,)), 'ajouté', None, preview(child)))
+    return differences
+
+
+def compare(left: MerkleNode, right: MerkleNode, left_name: str, right_name: str,
+            structural: bool = False) -> DiffReport:
+    """Compare deux arbres et compte les nœuds effectivement visités."""
+    report = DiffReport(left=left_name, right=right_name,
+                        identical=(left.shape if structural else left.digest)
+                        == (right.shape if structural else right.digest),
+                        nodes=left.size + right.size)
+    diff_nodes(left, right, structural=structural, report=report)
+    return report
+
+
+def find_unreplaced(node: MerkleNode, path: Tuple[PathKey, ...] = ()) -> List[Difference]:
+    """Placeholders du template restés dans les chaînes d'une configuration."""
+    from branding_template import find_placeholders
+
+    if node.children is None:
+        if isinstance(node.value, str):
+            tokens = find_placeholders(node.value)
+            if tokens:
+                return [Difference(dotted(path), 'placeholder', ', '.join(tokens), preview(node))]
+        return []
+    found: List[Difference] = []
+    for key, child in node.children.items():
+        if isinstance(key, str) and key.startswith(IGNORED_PREFIX):
+            continue
+        found += find_unreplaced(child, path + (key,))
+    return found
+
+
+_TREES: Dict[Path, Tuple[Dict, MerkleNode]] = {}
+
+
+def load_tree(config_file: Path) -> MerkleNode:
+    """
+    Arbre d'une configuration, héritage (extends) résolu : recalculé
+    seulement si un fichier de sa chaîne a changé.
+    """
+    from branding_compile import load_config_file
+
+    config = load_config_file(config_file)
+    cached = _TREES.get(config_file)
+    if cached and cached[0] is config:
+        return cached[1]
+    tree = MerkleNode(config)
+    _TREES[config_file] = (config, tree)
+    return tree
+
+
+def template_drift(root: Path, brand_ids: Optional[List[str]] = None) -> List[DiffReport]:
+    """
+    Compare chaque tenant à client-template.json : structure (clés absentes
+    ou ajoutées, types) et placeholders non remplacés. Les tenants dont la
+    structure a la même empreinte que le template ne sont pas parcourus.
+    """
+    branding_dir = root / "config" / "branding"
+    template = load_tree(branding_dir / TEMPLATE_FILENAME)
+    if not brand_ids:
+        brand_ids = sorted(f.stem for f in branding_dir.glob("*.json") if 'template' not in f.stem)
+
+    reports = []
+    for brand_id in brand_ids:
+        try:
+            tree = load_tree(branding_dir / f"{brand_id}.json")
+        except (OSError, ValueError) as e:
+            reports.append(DiffReport(left=TEMPLATE_FILENAME, right=brand_id, identical=False,
+                                      differences=[Difference('(racine)', 'illisible', None, str(e))]))
+            continue
+        report = compare(template, tree, TEMPLATE_FILENAME, brand_id, structural=True)
+        report.differences += find_unreplaced(tree)
+        report.identical = not report.differences
+        reports.append(report)
+    return reports
+
+
+def fetch_api_config(base_url: str, timeout: float = 5.0) -> Dict:
+    """Configuration servie par /api/branding/config (lève OSError/ValueError)."""
+    import urllib.request
+
+    with urllib.request.urlopen(f"{base_url}/api/branding/config", timeout=timeout) as response:
+        payload = json.loads(response.read().decode('utf-8'))
+    if not isinstance(payload, dict) or not payload.get('success') or 'data' not in payload:
+        raise ValueError("réponse sans configuration (success/data)")
+    return payload['data']
+
+
+def resolve_config(root: Path, name: str) -> Path:
+    """Identifiant de tenant ou chemin de fichier -> fichier JSON."""
+    path = Path(name)
+    if path.suffix == '.json' and path.exists():
+        return path
+    return root / "config" / "branding" / f"{name}.json"
+
+
+def print_report(report: DiffReport, limit: int = 0):
+    """Affichage lisible d'une comparaison."""
+    labels = {
+        'modifié': Colors.YELLOW, 'type': Colors.RED, 'placeholder': Colors.RED,
+        'absent': Colors.YELLOW, 'ajouté': Colors.CYAN, 'illisible': Colors.RED,
+    }
+    mark = f"{Colors.GREEN}✓" if report.identical else f"{Colors.YELLOW}≠"
+    print(f"{mark}{Colors.ENDC} {Colors.BOLD}{report.left}{Colors.ENDC} ↔ {Colors.BOLD}{report.right}"
+          f"{Colors.ENDC} ({len(report.differences)} écart(s), {report.visited}/{report.nodes} nœud(s) visités)")
+    shown = report.differences[:limit] if limit else report.differences
+    for difference in shown:
+        color = labels.get(difference.change, '')
+        if difference.change == 'placeholder':
+            detail = f"{difference.left} dans {json.dumps(difference.right, ensure_ascii=False)}"
+        elif difference.change == 'absent':
+            detail = f"présent seulement à gauche: {json.dumps(difference.left, ensure_ascii=False)}"
+        elif difference.change == 'ajouté':
+            detail = f"présent seulement à droite: {json.dumps(difference.right, ensure_ascii=False)}"
+        else:
+            detail = (f"{json.dumps(difference.left, ensure_ascii=False)} → "
+                      f"{json.dumps(difference.right, ensure_ascii=False)}")
+        print(f"    {color}{difference.change:<11}{Colors.ENDC} {difference.path}: {detail}")
+    if limit and len(report.differences) > limit:
+        print(f"    ... et {len(report.differences) - limit} autre(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée des comparaisons."""
+    import argparse
+    from branding_common import get_project_root
+
+    parser = argparse.ArgumentParser(prog="branding.py diff",
+                                     description="Différences structurelles entre configurations")
+    parser.add_argument('configs', nargs='*', help="Identifiants ou fichiers JSON")
+    parser.add_argument('--api', action='store_true', help="Comparer au /api/branding/config du serveur")
+    parser.add_argument('--url', default=None, help="URL du serveur (PORT du .env par défaut)")
+    parser.add_argument('--template', action='store_true', help=f"Comparer les tenants à {TEMPLATE_FILENAME}")
+    parser.add_argument('-j', '--json', action='store_true')
+    args = parser.parse_args(argv)
+    root = get_project_root()
+
+    try:
+        if args.template:
+            reports = template_drift(root, args.configs)
+        elif args.api:
+            from configure_branding import get_current_config, get_server_url
+            if len(args.configs) > 1:
+                parser.error("--api compare un seul tenant (BRAND_CONFIG par défaut)")
+            name = args.configs[0] if args.configs else (get_current_config() or 'default')
+            base_url = (args.url or get_server_url()).rstrip('/')
+            try:
+                served = MerkleNode(fetch_api_config(base_url))
+            except (OSError, ValueError) as e:
+                print(f"{Colors.RED}✗ {base_url}/api/branding/config injoignable: {e}{Colors.ENDC}")
+                return 2
+            reports = [compare(load_tree(resolve_config(root, name)), served, name, f"{base_url}/api/branding/config")]
+        else:
+            if len(args.configs) != 2:
+                parser.error("deux configurations attendues (ou --api, --template)")
+            left, right = (resolve_config(root, name) for name in args.configs)
+            reports = [compare(load_tree(left), load_tree(right), args.configs[0], args.configs[1])]
+    except (OSError, ValueError) as e:
+        print(f"{Colors.RED}✗ Lecture impossible: {e}{Colors.ENDC}")
+        return 2
+
+    different = [r for r in reports if not r.identical]
+    if args.json:
+        print(json.dumps({'reports': [r.to_dict() for r in reports], 'ok': not different},
+                         ensure_ascii=False, indent=2))
+    else:
+        for report in reports:
+            print_report(report)
+        if len(reports) > 1:
+            print(f"\n{Colors.BOLD}Total:{Colors.ENDC} {len(reports)} tenant(s), "
+                  f"{len(different)} avec écarts, "
+                  f"{sum(r.visited for r in reports)}/{sum(r.nodes for r in reports)} nœud(s) visités")
+    return 1 if different else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
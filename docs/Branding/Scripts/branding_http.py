@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP et compression des ressources de branding - EB-Vision 2.0
+====================================================================
+
+/api/branding/config est appelé par chaque page de chaque tenant, et les
+logos de la configuration active suivent. Pour chacune de ces URL :
+
+1. une requête complète (Accept-Encoding: gzip, deflate, br) relève ETag,
+   Last-Modified, Cache-Control, Content-Encoding et Vary ;
+2. une requête conditionnelle If-None-Match doit obtenir 304 sans corps,
+   avec le même ETag ;
+3. une requête conditionnelle If-Modified-Since doit obtenir 304 quand la
+   réponse porte un Last-Modified.
+
+Les octets (en-têtes compris) de la réponse 304 sont comparés à ceux de la
+requête complète : c'est ce que chaque navigateur économise à chaque page.
+
+Usage:
+    python branding.py http [--url URL] [--timeout S] [-j]
+"""
+
+import re
+import sys
+import json
+import argparse
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from branding_common import Colors
+
+CONFIG_PATH = "/api/branding/config"
+ACCEPT_ENCODING = "gzip, deflate, br"
+DEFAULT_TIMEOUT = 5.0
+
+# compression() ne compresse pas en dessous de ce seuil
+COMPRESSION_THRESHOLD = 1024
+COMPRESSIBLE_TYPES = ('application/json', 'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon',
+                      'text/', 'application/javascript')
+# Cache-Control attendu pour les assets à nom haché (--build-assets)
+IMMUTABLE_MIN_AGE = 31536000
+# Au-delà, un changement de branding n'est pas vu avant expiration
+CONFIG_MAX_AGE = 300
+
+_ETAG = re.compile(r'^(W/)?"[^"]*"$')
+_HASHED_ASSET = re.compile(r'/dist/[^/]+\.[0-9a-f]{8,}\.[^./]+$')
+
+
+@dataclass
+class CacheCheck:
+    """Conformance cache/compression d'une URL."""
+    url: str
+    kind: str  # config | main | icon | favicon
+    status: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cache_control: Optional[str] = None
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    vary: Optional[str] = None
+    full_bytes: int = 0
+    etag_status: Optional[int] = None
+    etag_bytes: Optional[int] = None
+    since_status: Optional[int] = None
+    since_bytes: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def conditional_bytes(self) -> Optional[int]:
+        """Octets de la meilleure revalidation réussie (304)."""
+        sizes = [size for status, size in ((self.etag_status, self.etag_bytes),
+                                           (self.since_status, self.since_bytes))
+                 if status == 304 and size is not None]
+        return min(sizes) if sizes else None
+
+    @property
+    def saved_bytes(self) -> int:
+        conditional = self.conditional_bytes
+        return self.full_bytes - conditional if conditional is not None else 0
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.update(conditional_bytes=self.conditional_bytes, saved_bytes=self.saved_bytes)
+        return data
+
+
+def fetch(url: str, headers: Dict[str, str], timeout: float) -> Tuple[int, Dict[str, str], int, int]:
+    """
+    GET sans décompression : (statut, en-têtes en minuscules, octets
+    d'en-têtes, octets de corps reçus). Les réponses 3xx/4xx/5xx sont
+    retournées, pas levées.
+    """
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, headers={'Accept-Encoding': ACCEPT_ENCODING, **headers})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, raw_headers, body = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        status, raw_headers, body = e.code, e.headers, e.read()
+    header_bytes = sum(len(name) + len(value) + 4 for name, value in raw_headers.items())
+    return status, {name.lower(): value for name, value in raw_headers.items()}, header_bytes, len(body)
+
+
+def cache_directives(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Directives de Cache-Control : {'max-age': '0', 'public': None, ...}."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Type de contenu que compression() sait compresser."""
+    content_type = (content_type or '').lower()
+    return any(content_type.startswith(prefix) for prefix in COMPRESSIBLE_TYPES)
+
+
+def check_cache_control(check: CacheCheck):
+    """Cache-Control au regard du type de ressource."""
+    directives = cache_directives(check.cache_control)
+    if not check.cache_control:
+        check.warnings.append("pas de Cache-Control : durée de cache laissée à l'heuristique du navigateur")
+        return
+    if 'no-store' in directives:
+        check.warnings.append("Cache-Control: no-store empêche toute revalidation (304)")
+        return
+    try:
+        max_age = int(directives.get('max-age') or 0)
+    except ValueError:
+        check.errors.append(f"max-age invalide : {check.cache_control}")
+        return
+
+    if check.kind == 'config':
+        if 'no-cache' not in directives and max_age > CONFIG_MAX_AGE:
+            check.warnings.append(f"max-age={max_age} : un changement de branding reste invisible "
+                                  f"jusqu'à {max_age} s (no-cache + ETag recommandé)")
+    elif _HASHED_ASSET.search(check.url):
+        if 'immutable' not in directives or max_age < IMMUTABLE_MIN_AGE:
+            check.warnings.append(f"asset haché sans cache immutable d'un an ({check.cache_control})")
+    elif max_age == 0 or 'no-cache' in directives:
+        check.notes.append("revalidé à chaque page (--build-assets --update-config pour un cache immutable)")
+
+
+def check_encoding(check: CacheCheck, body_bytes: int):
+    """Content-Encoding et Vary de la réponse complète."""
+    encoding = (check.content_encoding or '').lower()
+    if encoding and encoding not in ('gzip', 'br', 'deflate'):
+        check.errors.append(f"Content-Encoding '{encoding}' non demandé par le client")
+    if encoding and 'accept-encoding' not in (check.vary or '').lower():
+        check.warnings.append("réponse compressée sans Vary: Accept-Encoding (caches partagés)")
+    if not encoding and is_compressible(check.content_type) and body_bytes >= COMPRESSION_THRESHOLD:
+        check.warnings.append(f"{check.content_type} de {body_bytes} octets envoyé sans compression")
+
+
+def check_url(url: str, kind: str, timeout: float = DEFAULT_TIMEOUT) -> CacheCheck:
+    """Requête complète puis revalidations conditionnelles d'une URL."""
+    check = CacheCheck(url=url, kind=kind)
+    try:
+        status, headers, header_bytes, body_bytes = fetch(url, {}, timeout)
+    except OSError as e:
+        check.errors.append(f"injoignable : {e}")
+        return check
+    check.status = status
+    check.full_bytes = header_bytes + body_bytes
+    if status != 200:
+        check.errors.append(f"HTTP {status}")
+        return check
+    check.etag = headers.get('etag')
+    check.last_modified = headers.get('last-modified')
+    check.cache_control = headers.get('cache-control')
+    check.content_type = headers.get('content-type')
+    check.content_encoding = headers.get('content-encoding')
+    check.vary = headers.get('vary')
+
+    check_cache_control(check)
+    check_encoding(check, body_bytes)
+
+    if not check.etag:
+        check.errors.append("pas d'ETag : aucune revalidation If-None-Match possible")
+    elif not _ETAG.match(check.etag):
+        check.errors.append(f"ETag mal formé : {check.etag}")
+    else:
+        try:
+            status, headers, header_bytes, body_bytes = fetch(url, {'If-None-Match': check.etag}, timeout)
+        except OSError as e:
+            check.errors.append(f"If-None-Match : {e}")
+        else:
+            check.etag_status, check.etag_bytes = status, header_bytes + body_bytes
+            if status != 304:
+                check.errors.append(f"If-None-Match : HTTP {status} au lieu de 304")
+            elif body_bytes:
+                check.errors.append("If-None-Match : réponse 304 avec un corps")
+            if status == 304 and headers.get('etag') not in (None, check.etag):
+                check.errors.append(f"ETag différent sur la 304 ({headers.get('etag')})")
+
+    if check.last_modified:
+        try:
+            status, _, header_bytes, body_bytes = fetch(url, {'If-Modified-Since': check.last_modified}, timeout)
+        except OSError as e:
+            check.warnings.append(f"If-Modified-Since : {e}")
+        else:
+            check.since_status, check.since_bytes = status, header_bytes + body_bytes
+            if status != 304:
+                check.warnings.append(f"If-Modified-Since : HTTP {status} au lieu de 304")
+    return check
+
+
+def logo_urls(base_url: str, config: Optional[Dict]) -> List[Tuple[str, str]]:
+    """(URL absolue, rôle) des logos et favicon de la configuration, srcset compris."""
+    logo = ((config or {}).get('branding') or {}).get('logo') or {}
+    urls: List[Tuple[str, str]] = []
+    for role in ('main', 'icon', 'favicon'):
+        candidates = [logo.get(role)]
+        srcset = logo.get(f"{role}Srcset")
+        if isinstance(srcset, str):
+            candidates += [item.split()[0] for item in srcset.split(',') if item.strip()]
+        for path in candidates:
+            if isinstance(path, str) and path:
+                url = urljoin(base_url + '/', path)
+                if url not in [u for u, _ in urls]:
+                    urls.append((url, role))
+    return urls
+
+
+def served_config(base_url: str, timeout: float) -> Optional[Dict]:
+    """Configuration active servie par l'API (None si illisible)."""
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(base_url + CONFIG_PATH, timeout=timeout) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    return payload.get('data') if isinstance(payload, dict) else None
+
+
+def run_checks(base_url: str, config: Optional[Dict] = None,
+               timeout: float = DEFAULT_TIMEOUT) -> List[CacheCheck]:
+    """Vérifie la configuration puis chaque logo de la configuration active."""
+    base_url = base_url.rstrip('/')
+    if config is None:
+        config = served_config(base_url, timeout)
+    targets = [(base_url + CONFIG_PATH, 'config')] + logo_urls(base_url, config)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(8, len(targets))) as pool:
+        return list(pool.map(lambda target: check_url(target[0], target[1], timeout), targets))
+
+
+def format_size(size: int) -> str:
+    """Taille lisible en octets ou Ko."""
+    return f"{size / 1024:.1f} Ko" if size >= 1024 else f"{size} o"
+
+
+def describe(check: CacheCheck) -> str:
+    """Résumé d'une URL : revalidation, encodage et octets économisés."""
+    parts = []
+    if check.etag_status is not None:
+        parts.append(f"If-None-Match → {check.etag_status}")
+    if check.since_status is not None:
+        parts.append(f"If-Modified-Since → {check.since_status}")
+    parts.append(f"encodage {check.content_encoding or 'aucun'}")
+    if check.conditional_bytes is not None:
+        parts.append(f"{format_size(check.full_bytes)} → {format_size(check.conditional_bytes)}")
+    return ", ".join(parts)
+
+
+def summary(checks: List[CacheCheck]) -> Dict:
+    """Totaux : octets d'un chargement complet et d'une revalidation."""
+    full = sum(c.full_bytes for c in checks)
+    saved = sum(c.saved_bytes for c in checks)
+    return {
+        'urls': len(checks),
+        'full_bytes': full,
+        'saved_bytes': saved,
+        'errors': sum(len(c.errors) for c in checks),
+        'warnings': sum(len(c.warnings) for c in checks),
+    }
+
+
+def print_report(checks: List[CacheCheck]):
+    """Affichage lisible des vérifications."""
+    from branding_common import print_header
+
+    print_header("CACHE HTTP ET COMPRESSION")
+    for check in checks:
+        mark = (f"{Colors.RED}✗" if check.errors else f"{Colors.YELLOW}⚠" if check.warnings
+                else f"{Colors.GREEN}✓") + Colors.ENDC
+        print(f"{mark} {Colors.BOLD}{check.kind}{Colors.ENDC} {check.url}")
+        if check.status == 200:
+            print(f"    ETag {check.etag or '-'} | Cache-Control {check.cache_control or '-'}")
+            print(f"    {describe(check)}")
+        for message in check.errors:
+            print(f"    {Colors.RED}{message}{Colors.ENDC}")
+        for message in check.warnings:
+            print(f"    {Colors.YELLOW}{message}{Colors.ENDC}")
+        for message in check.notes:
+            print(f"    {Colors.CYAN}{message}{Colors.ENDC}")
+    totals = summary(checks)
+    ratio = totals['saved_bytes'] / totals['full_bytes'] * 100 if totals['full_bytes'] else 0
+    print(f"\n{Colors.BOLD}Total:{Colors.ENDC} {totals['urls']} URL, "
+          f"{format_size(totals['full_bytes'])} par chargement complet, "
+          f"{format_size(totals['saved_bytes'])} économisés par revalidation ({ratio:.0f} %), "
+          f"{totals['errors']} erreur(s), {totals['warnings']} avertissement(s)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="branding.py http",
+                                     description="Cache HTTP et compression de la configuration et des logos")
+    parser.add_argument('--url', default=None, help="URL du serveur (PORT du .env par défaut)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument('-j', '--json', action='store_true')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée des vérifications de cache HTTP."""
+    # Import à la demande : lecture du .env
+    from configure_branding import get_server_url
+
+    args = build_parser().parse_args(argv)
+    base_url = (args.url or get_server_url()).rstrip('/')
+    checks = run_checks(base_url, timeout=args.timeout)
+    totals = summary(checks)
+    if args.json:
+        print(json.dumps({'url': base_url, 'checks': [c.to_dict() for c in checks],
+                          'summary': totals, 'ok': totals['errors'] == 0}, ensure_ascii=False, indent=2))
+    else:
+        print_report(checks)
+    return 0 if totals['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse des logos par leurs en-têtes - EB-Vision 2.0
+====================================================
+
+Lit les dimensions et la profondeur de couleur des images de
+public/assets/brands/<id>/ sans les décoder : seuls les premiers octets
+(ou les en-têtes de segments) de chaque fichier sont lus.
+
+- PNG : bloc IHDR (largeur, hauteur, profondeur, type de couleur) ;
+- ICO : répertoire des icônes (plus grande entrée retenue) ;
+- JPEG : segment SOFn, atteint en sautant les segments précédents ;
+- WebP : en-tête VP8 / VP8L / VP8X ;
+- SVG : attributs width/height/viewBox de la balise <svg>.
+
+Chaque logo est comparé au budget de son rôle (branding.logo.main, icon,
+favicon) : taille du fichier et hauteur en pixels au regard de la taille
+d'affichage (sidebar-branding.js affiche l'icône à 30 px de haut). Un PNG de
+plusieurs Mo affiché à 30 px est signalé.
+
+Usage:
+    python branding.py images [ids] [-j] [--workers N]
+"""
+
+import re
+import sys
+import json
+import struct
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from branding_assets import ASSET_EXTENSIONS, DIST_DIRNAME, HASH_LENGTH
+
+# En-tête lu pour les formats dont les informations sont au début du fichier
+HEADER_BYTES = 64
+# Début de fichier lu pour trouver la balise <svg>
+SVG_HEAD_BYTES = 4096
+
+# Rôle -> (hauteur d'affichage en px CSS, hauteur maximale utile en px, taille maximale)
+# La hauteur utile couvre les écrans haute densité (x3) ; un favicon .ico
+# peut contenir jusqu'à 256 px pour les raccourcis Windows
+ROLE_BUDGETS = {
+    'icon': (30, 90, 100 * 1024),
+    'main': (60, 180, 250 * 1024),
+    'favicon': (32, 256, 100 * 1024),
+}
+LOGO_ROLES = ('main', 'icon', 'favicon')
+
+# PNG : type de couleur IHDR -> nombre de canaux
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# JPEG : marqueurs SOFn (hors DHT C4, JPG C8, DAC CC)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_SVG_TAG = re.compile(rb'<svg\b([^>]*)>', re.S | re.I)
+_SVG_ATTR = re.compile(rb'\b(width|height|viewBox)\s*=\s*["\']([^"\']*)["\']', re.I)
+_SVG_LENGTH = re.compile(r'^\s*([0-9.]+)\s*(px)?\s*$')
+_HASHED_NAME = re.compile(r'^(.*)\.[0-9a-f]{%d}(\.[^.]+)$' % HASH_LENGTH)
+
+
+@dataclass
+class ImageInfo:
+    """Informations d'en-tête d'une image."""
+    path: str
+    format: str
+    bytes: int
+    width: Optional[float] = None
+    height: Optional[float] = None
+    bit_depth: Optional[int] = None
+    channels: Optional[int] = None
+    frames: int = 1
+    view_box: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def decoded_bytes(self) -> Optional[int]:
+        """Mémoire d'une image décodée (RGBA 8 bits), None pour un SVG."""
+        if self.format == 'svg' or not self.width or not self.height:
+            return None
+        return int(self.width * self.height * 4)
+
+
+@dataclass
+class ImageIssue:
+    """Dépassement de budget d'un logo."""
+    path: str
+    role: str
+    message: str
+
+
+@dataclass
+class TenantImages:
+    """Images d'un dossier d'assets et dépassements de budget."""
+    brand_id: str
+    images: List[ImageInfo] = field(default_factory=list)
+    roles: Dict[str, str] = field(default_factory=dict)
+    issues: List[ImageIssue] = field(default_factory=list)
+
+
+def _png(head: bytes, info: ImageInfo):
+    if head[12:16] != b'IHDR':
+        raise ValueError("bloc IHDR manquant")
+    info.width, info.height, info.bit_depth, color_type = struct.unpack('>IIBB', head[16:26])
+    info.channels = PNG_CHANNELS.get(color_type)
+
+
+def _ico(f, head: bytes, info: ImageInfo):
+    count = struct.unpack('<H', head[4:6])[0]
+    if not count:
+        raise ValueError("répertoire d'icônes vide")
+    directory = head[6:6 + 16 * count]
+    if len(directory) < 16 * count:
+        directory += f.read(16 * count - len(directory))
+    info.frames = count
+    for index in range(count):
+        w, h, _, _, _, bits = struct.unpack('<BBBBHH', directory[16 * index:16 * index + 8])
+        w, h = w or 256, h or 256  # 0 signifie 256
+        if info.width is None or w * h > info.width * info.height:
+            info.width, info.height, info.bit_depth = w, h, bits or None
+
+
+def _jpeg(f, info: ImageInfo):
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError("segment SOF introuvable")
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker[1] in JPEG_SOF:
+            precision, height, width, components = struct.unpack('>BHHB', f.read(6))
+            info.width, info.height = width, height
+            info.bit_depth, info.channels = precision, components
+            return
+        f.seek(length - 2, 1)
+
+
+def _webp(head: bytes, info: ImageInfo):
+    chunk = head[12:16]
+    if chunk == b'VP8X':
+        info.width = 1 + int.from_bytes(head[24:27], 'little')
+        info.height = 1 + int.from_bytes(head[27:30], 'little')
+    elif chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        info.width = 1 + (bits & 0x3FFF)
+        info.height = 1 + ((bits >> 14) & 0x3FFF)
+    elif chunk == b'VP8 ':
+        info.width = struct.unpack('<H', head[26:28])[0] & 0x3FFF
+        info.height = struct.unpack('<H', head[28:30])[0] & 0x3FFF
+    else:
+        raise ValueError("en-tête WebP inconnu")
+
+
+def _svg_length(value: Optional[bytes]) -> Optional[float]:
+    if value is None:
+        return None
+    match = _SVG_LENGTH.match(value.decode('ascii', 'replace'))
+    return float(match.group(1)) if match else None
+
+
+def _svg(head: bytes, info: ImageInfo):
+    tag = _SVG_TAG.search(head)
+    if tag is None:
+        raise ValueError(f"balise <svg> absente des {SVG_HEAD_BYTES} premiers octets")
+    attrs = {name.decode().lower(): value for name, value in _SVG_ATTR.findall(tag.group(1))}
+    info.width = _svg_length(attrs.get('width'))
+    info.height = _svg_length(attrs.get('height'))
+    if 'viewbox' in attrs:
+        info.view_box = attrs['viewbox'].decode('ascii', 'replace')
+        parts = info.view_box.replace(',', ' ').split()
+        if len(parts) == 4 and info.width is None and info.height is None:
+            try:
+                info.width, info.height = float(parts[2]), float(parts[3])
+            except ValueError:
+                pass
+
+
+def read_image_info(path: Path) -> ImageInfo:
+    """Lit les informations d'en-tête d'une image (sans la décoder)."""
+    suffix = path.suffix.lower()
+    image_format = {'.jpg': 'jpeg', '.jpeg': 'jpeg'}.get(suffix, suffix.lstrip('.'))
+    try:
+        size = path.stat().st_size
+    except OSError as e:
+        return ImageInfo(path=str(path), format=image_format, bytes=0, error=str(e))
+    info = ImageInfo(path=str(path), format=image_format, bytes=size)
+
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SVG_HEAD_BYTES if image_format == 'svg' else HEADER_BYTES)
+            if head.startswith(b'\x89PNG\r\n\x1a\n'):
+                info.format = 'png'
+                _png(head, info)
+            elif head[:4] == b'\x00\x00\x01\x00':
+                info.format = 'ico'
+                _ico(f, head, info)
+            elif head[:3] == b'\xff\xd8\xff':
+                info.format = 'jpeg'
+                _jpeg(f, info)
+            elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                info.format = 'webp'
+                _webp(head, info)
+            elif image_format == 'svg':
+                _svg(head, info)
+            else:
+                raise ValueError("format non reconnu")
+    except (OSError, ValueError, struct.error) as e:
+        info.error = str(e)
+    return info
+
+
+def check_budget(info: ImageInfo, role: str) -> List[str]:
+    """Dépassements du budget d'un rôle (liste vide si le logo est conforme)."""
+    display, max_pixels, max_bytes = ROLE_BUDGETS[role]
+    problems = []
+    if info.error:
+        return [f"en-tête illisible ({info.error})"]
+    if info.bytes > max_bytes:
+        problems.append(f"{info.bytes / 1024:.0f} Ko > {max_bytes // 1024} Ko")
+    if info.format == 'svg':
+        if info.view_box is None:
+            problems.append("SVG sans viewBox : ne se redimensionne pas")
+    elif info.height:
+        # Le favicon est carré ; les autres logos sont affichés par leur hauteur
+        measured = max(info.width or 0, info.height) if role == 'favicon' else info.height
+        if measured > max_pixels:
+            decoded = info.decoded_bytes or 0
+            problems.append(f"{info.width:.0f}×{info.height:.0f} px pour un affichage à {display} px "
+                            f"(max {max_pixels} px, {decoded / 1048576:.1f} Mo décodé)")
+    return problems
+
+
+def guess_role(name: str) -> str:
+    """Rôle présumé d'un fichier non référencé par la configuration."""
+    lower = name.lower()
+    if lower.startswith('favicon'):
+        return 'favicon'
+    if lower.startswith(('icon', 'logo-icon')):
+        # logo-icon* : déclinaisons produites par --build-logos
+        return 'icon'
+    return 'main'
+
+
+def logo_roles(config: Dict, brand_id: str) -> Dict[str, str]:
+    """Nom de fichier source -> rôle, d'après branding.logo."""
+    logo = (config or {}).get('branding', {}).get('logo')
+    roles: Dict[str, str] = {}
+    if not isinstance(logo, dict):
+        return roles
+    prefix = f"/assets/brands/{brand_id}/"
+    for role in LOGO_ROLES:
+        urls = [logo.get(role)]
+        srcset = logo.get(f"{role}Srcset")
+        if isinstance(srcset, str):
+            # "url 1x, url 2x" (déclinaisons de --build-logos)
+            urls += [candidate.split()[0] for candidate in srcset.split(',') if candidate.strip()]
+        for url in urls:
+            if not isinstance(url, str) or not url.startswith(prefix):
+                continue
+            name = url[len(prefix):]
+            if name.startswith(f"{DIST_DIRNAME}/"):
+                # URL immuable (--build-assets) : logo.<hash>.png -> logo.png
+                match = _HASHED_NAME.match(name[len(DIST_DIRNAME) + 1:])
+                name = match.group(1) + match.group(2) if match else name
+            roles.setdefault(name, role)
+    return roles
+
+
+def image_files(assets_dir: Path) -> List[Path]:
+    """Images sources d'un dossier d'assets (dist/ exclu)."""
+    try:
+        return sorted(f for f in assets_dir.iterdir()
+                      if f.is_file() and f.suffix.lower() in ASSET_EXTENSIONS)
+    except OSError:
+        return []
+
+
+def scan_tenants(assets_dirs: Dict[str, Path], configs: Dict[str, Dict],
+                 workers: Optional[int] = None) -> List[TenantImages]:
+    """
+    Analyse les dossiers d'assets en parallèle : tous les fichiers de tous
+    les tenants sont répartis sur un même pool de threads (lectures courtes).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    tenants = []
+    jobs: List[Tuple[TenantImages, Path]] = []
+    for brand_id, assets_dir in assets_dirs.items():
+        tenant = TenantImages(brand_id, roles=logo_roles(configs.get(brand_id), brand_id))
+        tenants.append(tenant)
+        jobs += [(tenant, path) for path in image_files(assets_dir)]
+
+    with ThreadPoolExecutor(max_workers=workers or 16) as pool:
+        infos = list(pool.map(read_image_info, [path for _, path in jobs]))
+
+    for (tenant, path), info in zip(jobs, infos):
+        tenant.images.append(info)
+        role = tenant.roles.get(path.name) or guess_role(path.name)
+        for problem in check_budget(info, role):
+            tenant.issues.append(ImageIssue(path=path.name, role=role, message=problem))
+    return tenants
+
+
+def describe(info: ImageInfo) -> str:
+    """Résumé d'une image : format, dimensions, profondeur, taille."""
+    parts = [info.format.upper()]
+    if info.width and info.height:
+        parts.append(f"{info.width:g}×{info.height:g}")
+    if info.view_box:
+        parts.append(f"viewBox {info.view_box}")
+    if info.bit_depth:
+        depth = info.bit_depth * (info.channels or 1)
+        parts.append(f"{depth} bits/px")
+    if info.frames > 1:
+        parts.append(f"{info.frames} images")
+    parts.append(f"{info.bytes / 1024:.1f} Ko" if info.bytes >= 1024 else f"{info.bytes} octets")
+    return ", ".join(parts)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Analyse des logos de tous les tenants (ou de ceux passés en argument)."""
+    from branding_common import Colors, get_project_root, print_header
+    from branding_compile import load_config
+
+    args = sys.argv[1:] if argv is None else argv
+    if '-h' in args or '--help' in args:
+        print("Usage: python branding.py images [ids] [-j] [--workers N]")
+        print()
+        print("Lit dimensions et profondeur de couleur des logos (en-têtes seulement)")
+        print("et signale ceux qui dépassent le budget de leur rôle.")
+        return 0
+    workers = None
+    if '--workers' in args:
+        index = args.index('--workers')
+        try:
+            workers = int(args[index + 1])
+        except (IndexError, ValueError):
+            print(f"{Colors.RED}--workers attend un nombre entier{Colors.ENDC}")
+            return 2
+        args = args[:index] + args[index + 2:]
+    json_output = '-j' in args or '--json' in args
+
+    root = get_project_root()
+    brands_dir = root / "public" / "assets" / "brands"
+    brand_ids = [a for a in args if not a.startswith('-')]
+    if not brand_ids:
+        brand_ids = sorted(d.name for d in brands_dir.iterdir() if d.is_dir()) if brands_dir.is_dir() else []
+
+    configs: Dict[str, Dict] = {}
+    for brand_id in brand_ids:
+        try:
+            configs[brand_id] = load_config(root / "config" / "branding", brand_id)
+        except (OSError, ValueError):
+            continue
+    tenants = scan_tenants({b: brands_dir / b for b in brand_ids}, configs, workers)
+    failed = any(t.issues for t in tenants)
+
+    if json_output:
+        print(json.dumps({
+            'budgets': {role: {'display_px': d, 'max_px': p, 'max_bytes': b}
+                        for role, (d, p, b) in ROLE_BUDGETS.items()},
+            'tenants': [asdict(t) for t in tenants],
+            'ok': not failed,
+        }, ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+
+    print_header("ANALYSE DES LOGOS")
+    for tenant in tenants:
+        status = f"{Colors.YELLOW}⚠{Colors.ENDC}" if tenant.issues else f"{Colors.GREEN}✓{Colors.ENDC}"
+        print(f"{status} {Colors.BOLD}{tenant.brand_id}{Colors.ENDC} ({len(tenant.images)} image(s))")
+        for info in tenant.images:
+            name = Path(info.path).name
+            role = tenant.roles.get(name) or guess_role(name)
+            print(f"    {name} [{role}] : {describe(info)}")
+        for issue in tenant.issues:
+            print(f"    {Colors.YELLOW}{issue.path} : {issue.message}{Colors.ENDC}")
+    total = sum(len(t.images) for t in tenants)
+    over = sum(len(t.issues) for t in tenants)
+    print(f"\n{Colors.BOLD}Total:{Colors.ENDC} {total} image(s), {over} dépassement(s) de budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
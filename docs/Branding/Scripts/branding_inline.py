@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inlining du branding dans les pages HTML - EB-Vision 2.0
+========================================================
+
+Bloc qui porte la configuration du tenant actif dans chaque page
+public/*.html chargeant branding-loader.js, entre deux marqueurs :
+
+    <!-- branding:inline -->
+    <script data-brand="demo" data-hash="...">window.__BRANDING__=...</script>
+    <!-- /branding:inline -->
+
+Le script fixe aussi document.title immédiatement. branding-loader.js utilise
+window.__BRANDING__ au lieu d'attendre /api/branding/config, puis vérifie en
+arrière-plan (au plus une fois par durée de cache) que la configuration
+inlinée correspond toujours à celle du serveur.
+
+Le bloc est inséré juste avant la balise <script> de branding-loader.js au
+moment de servir la page : par server.js (src/middleware/brandingInline.js,
+portage de ce module, même octets) et par branding_preview.py. Les fichiers
+versionnés ne sont jamais modifiés ; clear_pages() retire les blocs écrits
+dans les pages par les versions précédentes de --build-inline.
+"""
+
+import re
+import json
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from branding_assets import content_hash
+
+MARKER_START = "<!-- branding:inline -->"
+MARKER_END = "<!-- /branding:inline -->"
+
+_BLOCK = re.compile(
+    r'^([ \t]*)' + re.escape(MARKER_START) + r'.*?' + re.escape(MARKER_END) + r'[ \t]*\r?\n',
+    re.S | re.M,
+)
+_LOADER_TAG = re.compile(r'^([ \t]*)<script src="js/branding-loader\.js"[^>]*></script>', re.M)
+
+
+def serialize_config(config: Dict) -> str:
+    """JSON compact utilisable sans risque dans une balise <script>."""
+    data = json.dumps(config, ensure_ascii=False, separators=(',', ':'))
+    # Empêche de fermer la balise ou d'ouvrir un commentaire HTML
+    return data.replace('</', '<\\/').replace('<!--', '<\\!--')
+
+
+def render_inline_block(brand_id: str, config: Dict, indent: str = "    ",
+                        newline: str = "\n") -> str:
+    """Produit le bloc à insérer (marqueurs compris)."""
+    data = serialize_config(config)
+    script = f"window.__BRANDING__={data};"
+    title = config.get('app', {}).get('name')
+    if isinstance(title, str) and title:
+        script += f"document.title={serialize_config(title)};"
+    lines = [
+        MARKER_START,
+        f'<script data-brand="{escape(brand_id, quote=True)}" data-hash="{content_hash(data.encode("utf-8"))}">{script}</script>',
+        MARKER_END,
+    ]
+    return "".join(f"{indent}{line}{newline}" for line in lines)
+
+
+def strip_inline_block(html: str) -> str:
+    """Retire le bloc inliné d'une page (s'il existe)."""
+    return _BLOCK.sub('', html)
+
+
+def inline_html(html: str, block_factory) -> Optional[str]:
+    """
+    Insère ou remplace le bloc dans le contenu d'une page. block_factory
+    reçoit (indentation, fin de ligne). Retourne None si la page ne charge
+    pas branding-loader.js.
+    """
+    newline = "\r\n" if "\r\n" in html else "\n"
+    existing = _BLOCK.search(html)
+    if existing:
+        block = block_factory(existing.group(1), newline)
+        return html[:existing.start()] + block + html[existing.end():]
+
+    loader = _LOADER_TAG.search(html)
+    if not loader:
+        return None
+    block = block_factory(loader.group(1), newline)
+    return html[:loader.start()] + block + html[loader.start():]
+
+
+def _read_pages(root: Path):
+    """Itère sur (chemin, contenu) des pages HTML lisibles en UTF-8."""
+    for page in sorted((root / "public").glob("*.html")):
+        try:
+            with open(page, 'r', encoding='utf-8', newline='') as f:
+                yield page, f.read()
+        except UnicodeDecodeError:
+            # Page non UTF-8 (copie de sauvegarde) : jamais modifiée
+            continue
+
+
+def inline_report(root: Path, brand_id: str) -> Tuple[List[str], int]:
+    """
+    Pages qui reçoivent le bloc de <brand_id> lorsqu'elles sont servies, et
+    taille du bloc en octets. Aucun fichier n'est écrit.
+    """
+    from branding_compile import load_config
+
+    config = load_config(root / "config" / "branding", brand_id)
+    block = render_inline_block(brand_id, config, "", "\n")
+    pages = [page.name for page, html in _read_pages(root)
+             if inline_html(html, lambda indent, newline: block) is not None]
+    return pages, len(block.encode('utf-8'))
+
+
+def clear_pages(root: Path) -> List[str]:
+    """Retire le bloc écrit dans les pages par les anciennes versions de --build-inline."""
+    cleared: List[str] = []
+    for page, html in _read_pages(root):
+        result = strip_inline_block(html)
+        if result != html:
+            with open(page, 'w', encoding='utf-8', newline='') as f:
+                f.write(result)
+            cleared.append(page.name)
+    return cleared
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mémoire du serveur au fil des changements de branding - EB-Vision 2.0
+=====================================================================
+
+Active tour à tour chaque branding via POST /api/branding/set/:brandId,
+pendant plusieurs cycles, tout en relevant à intervalle fixe la mémoire du
+processus qui écoute sur le port du serveur (/proc/<pid>/status) :
+
+- RSS (VmRSS) : mémoire résidente totale ;
+- mémoire anonyme (RssAnon) : tas V8 et allocations natives, hors code et
+  fichiers projetés ; c'est l'approximation du tas lisible depuis /proc.
+
+BrandingService garde chaque branding chargé dans son cache (Map) sans
+jamais l'en retirer : le rapport donne la mémoire observée par branding et
+le plancher (minimum) de chaque cycle. Le minimum écarte les pics entre deux
+passages du ramasse-miettes ; si le plancher continue de monter sur la
+seconde moitié des cycles au-delà du seuil, la croissance est signalée
+comme ne se stabilisant pas.
+
+Le branding actif avant la mesure (celui dont la configuration résolue est
+servie par /api/branding/config, à défaut BRAND_CONFIG) est réactivé à la
+fin, y compris en cas d'interruption ; un échec de restauration est signalé.
+
+Usage:
+    python branding.py memory [options]
+    python verify_branding.py --memory [options]
+
+Options:
+    --url URL          Serveur cible (défaut: PORT du .env, sinon 3000)
+    --token JWT        Jeton Bearer Super Admin (défaut: BRANDING_ADMIN_TOKEN)
+    --brands a,b       Brandings à parcourir (défaut: tous)
+    --cycles N         Passages sur la liste des brandings (défaut: 6)
+    --dwell S          Durée d'observation après chaque changement (défaut: 2)
+    --interval S       Intervalle d'échantillonnage (défaut: 0.25)
+    --threshold KO     Croissance tolérée par cycle en fin de mesure (défaut: 512)
+    --pid PID          Processus à mesurer (défaut: celui qui écoute sur le port)
+    -j, --json         Résultat au format JSON
+
+Le code de sortie vaut 1 si une croissance non stabilisée est détectée, si
+des changements de branding ont échoué ou si le branding initial n'a pas pu
+être restauré. Linux uniquement (/proc).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from branding_common import Colors, get_project_root
+from branding_proc import format_bytes, has_procfs, read_process_stats
+
+DEFAULT_CYCLES = 6
+DEFAULT_DWELL = 2.0
+DEFAULT_INTERVAL = 0.25
+DEFAULT_THRESHOLD_KB = 512
+# En dessous, la tendance de fin de mesure n'est pas significative
+MIN_CYCLES_FOR_VERDICT = 4
+
+IDLE = "(repos)"
+
+
+@dataclass
+class MemorySample:
+    """Relevé mémoire du serveur."""
+    elapsed: float
+    cycle: int
+    brand: str
+    rss_bytes: int
+    anon_bytes: Optional[int]
+
+
+def _slope(values: List[float]) -> float:
+    """Pente (moindres carrés) d'une série régulièrement espacée."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    den = sum((x - mean_x) ** 2 for x in range(n))
+    return num / den
+
+
+def read_memory(pids: List[int]) -> Optional[Tuple[int, Optional[int]]]:
+    """(RSS, mémoire anonyme) cumulées des processus (None si aucun n'est lisible)."""
+    rss, anon, seen = 0, 0, False
+    for pid in pids:
+        stats = read_process_stats(pid)
+        if stats is None:
+            continue
+        seen = True
+        rss += stats.rss_bytes
+        anon = None if anon is None or stats.rss_anon_bytes is None else anon + stats.rss_anon_bytes
+    return (rss, anon) if seen else None
+
+
+class MemorySampler:
+    """Relève la mémoire à intervalle fixe dans un thread, étiquetée par le branding actif."""
+
+    def __init__(self, pids: List[int], interval: float):
+        self.pids = pids
+        self.interval = interval
+        self.samples: List[MemorySample] = []
+        self.cycle = 0
+        self.brand = IDLE
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._start = 0.0
+
+    def _loop(self):
+        next_tick = self._start
+        while not self._stop.is_set():
+            memory = read_memory(self.pids)
+            if memory is None:
+                self.lost = True
+                return
+            self.samples.append(MemorySample(
+                elapsed=round(time.monotonic() - self._start, 3), cycle=self.cycle,
+                brand=self.brand, rss_bytes=memory[0], anon_bytes=memory[1]))
+            # Cadence fixe : l'échéance suivante ne dérive pas avec la durée de lecture
+            next_tick += self.interval
+            self._stop.wait(max(0.0, next_tick - time.monotonic()))
+
+    def start(self):
+        self._start = time.monotonic()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def switch_brand(base_url: str, token: str, brand: str, timeout: float = 10.0) -> Tuple[bool, str]:
+    """Active un branding via POST /api/branding/set/:brandId."""
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(
+        f"{base_url}/api/branding/set/{quote(brand, safe='')}", data=b'', method='POST',
+        headers={'Authorization': f"Bearer {token}"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read().decode('utf-8') or '{}')
+    except urllib.error.HTTPError as e:
+        return False, f"HTTP {e.code}"
+    except (OSError, ValueError) as e:
+        return False, str(e)
+    if not payload.get('success', False):
+        return False, payload.get('error') or "refusé par le serveur"
+    return True, ""
+
+
+def active_brand(base_url: str, candidates: List[str], preferred: Optional[str] = None) -> Optional[str]:
+    """
+    Branding dont la configuration résolue est celle servie par le serveur
+    (preferred testé en premier). None si le serveur ne répond pas ou si
+    aucune configuration ne correspond.
+    """
+    # Import à la demande : lecture de l'API et résolution de l'héritage
+    from configure_branding import fetch_served_config
+    from branding_compile import load_config
+
+    served = fetch_served_config(base_url)
+    if served is None:
+        return None
+    branding_dir = get_project_root() / "config" / "branding"
+    ordered = ([preferred] if preferred else []) + [b for b in candidates if b != preferred]
+    for brand in ordered:
+        try:
+            if load_config(branding_dir, brand) == served:
+                return brand
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def summarize(samples: List[MemorySample], brands: List[str], cycles: int,
+              threshold_bytes: int) -> Dict:
+    """Mémoire par branding, plancher par cycle et verdict de croissance."""
+    idle = [s for s in samples if s.brand == IDLE]
+    per_brand = []
+    for brand in brands:
+        own = [s for s in samples if s.brand == brand]
+        if not own:
+            continue
+        # Coût d'un changement : dernier relevé de la période moins le dernier relevé précédent
+        deltas = []
+        for cycle in range(1, cycles + 1):
+            period = [i for i, s in enumerate(samples) if s.brand == brand and s.cycle == cycle]
+            if period and period[0] > 0:
+                deltas.append(samples[period[-1]].rss_bytes - samples[period[0] - 1].rss_bytes)
+        anon = [s.anon_bytes for s in own if s.anon_bytes is not None]
+        per_brand.append({
+            'brand': brand,
+            'samples': len(own),
+            'rss_mean_bytes': int(sum(s.rss_bytes for s in own) / len(own)),
+            'rss_max_bytes': max(s.rss_bytes for s in own),
+            'anon_mean_bytes': int(sum(anon) / len(anon)) if anon else None,
+            'first_switch_delta_bytes': deltas[0] if deltas else None,
+            'later_switch_delta_bytes': int(sum(deltas[1:]) / len(deltas[1:])) if len(deltas) > 1 else None,
+        })
+
+    per_cycle = []
+    for cycle in range(1, cycles + 1):
+        own = [s for s in samples if s.cycle == cycle]
+        if own:
+            anon = [s.anon_bytes for s in own if s.anon_bytes is not None]
+            per_cycle.append({
+                'cycle': cycle,
+                'rss_floor_bytes': min(s.rss_bytes for s in own),
+                'rss_max_bytes': max(s.rss_bytes for s in own),
+                'anon_floor_bytes': min(anon) if anon else None,
+            })
+
+    def trend(key: str) -> Dict:
+        floors = [c[key] for c in per_cycle if c[key] is not None]
+        tail = floors[len(floors) // 2:]
+        result = {
+            'slope_bytes_per_cycle': int(_slope(floors)),
+            'tail_slope_bytes_per_cycle': int(_slope(tail)),
+            'verdict': 'indéterminé',
+        }
+        if len(floors) >= MIN_CYCLES_FOR_VERDICT:
+            result['verdict'] = 'croissance' if _slope(tail) > threshold_bytes else 'stable'
+        return result
+
+    return {
+        'baseline_rss_bytes': min((s.rss_bytes for s in idle), default=None),
+        'final_rss_bytes': samples[-1].rss_bytes if samples else None,
+        'brands': per_brand,
+        'cycles': per_cycle,
+        'rss': trend('rss_floor_bytes'),
+        'anon': trend('anon_floor_bytes'),
+    }
+
+
+def run_sampling(base_url: str, token: str, pids: List[int], brands: List[str], cycles: int,
+                 dwell: float, interval: float, threshold_bytes: int, progress: bool = True,
+                 restore_brand: Optional[str] = None) -> Dict:
+    """
+    Parcourt les brandings `cycles` fois en relevant la mémoire du serveur,
+    puis réactive restore_brand (le branding actif avant la mesure).
+    """
+    sampler = MemorySampler(pids, interval)
+    failures: Dict[str, str] = {}
+    switches = 0
+    restore_error = None
+    sampler.start()
+    try:
+        # Référence avant le premier changement
+        time.sleep(dwell)
+        for cycle in range(1, cycles + 1):
+            for brand in brands:
+                ok, error = switch_brand(base_url, token, brand)
+                if not ok:
+                    failures[brand] = error
+                    continue
+                switches += 1
+                sampler.cycle, sampler.brand = cycle, brand
+                time.sleep(dwell)
+                if sampler.lost:
+                    break
+            if sampler.lost:
+                break
+            if progress:
+                last = sampler.samples[-1] if sampler.samples else None
+                rss = format_bytes(last.rss_bytes) if last else "N/A"
+                print(f"  Cycle {cycle}/{cycles} terminé - RSS {rss}", file=sys.stderr)
+    finally:
+        sampler.stop()
+        if restore_brand:
+            restored, error = switch_brand(base_url, token, restore_brand)
+            if not restored:
+                restore_error = error
+                print(f"{Colors.RED}✗ Branding initial '{restore_brand}' non restauré: {error}{Colors.ENDC}",
+                      file=sys.stderr)
+
+    report = summarize(sampler.samples, brands, cycles, threshold_bytes)
+    report.update({
+        'url': base_url,
+        'pids': pids,
+        'cycles_requested': cycles,
+        'dwell_seconds': dwell,
+        'interval_seconds': interval,
+        'threshold_bytes': threshold_bytes,
+        'switches': switches,
+        'failures': failures,
+        'server_lost': sampler.lost,
+        'restored_brand': restore_brand,
+        'restore_error': restore_error,
+        'samples': [asdict(s) for s in sampler.samples],
+    })
+    report['ok'] = (not failures and not sampler.lost and restore_error is None
+                    and report['rss']['verdict'] != 'croissance'
+                    and report['anon']['verdict'] != 'croissance')
+    return report
+
+
+def print_report(report: Dict):
+    """Affiche le rapport."""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'MÉMOIRE DU SERVEUR PAR BRANDING'.center(70)}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+
+    print(f"{Colors.BOLD}Serveur:{Colors.ENDC} {report['url']} (PID {', '.join(str(p) for p in report['pids'])})")
+    print(f"{Colors.BOLD}Relevés:{Colors.ENDC} {len(report['samples'])} "
+          f"(toutes les {report['interval_seconds']} s, {report['dwell_seconds']} s par branding)")
+    print(f"{Colors.BOLD}Changements:{Colors.ENDC} {report['switches']}")
+    print(f"{Colors.BOLD}Référence (repos):{Colors.ENDC} {format_bytes(report['baseline_rss_bytes'])}"
+          f"  →  {Colors.BOLD}fin:{Colors.ENDC} {format_bytes(report['final_rss_bytes'])}\n")
+
+    print(f"{Colors.BOLD}{'Branding':<22} {'RSS moy.':>10} {'RSS max':>10} {'Anon moy.':>10} "
+          f"{'Δ 1er':>10} {'Δ suiv.':>10}{Colors.ENDC}")
+    for brand in report['brands']:
+        first = brand['first_switch_delta_bytes']
+        later = brand['later_switch_delta_bytes']
+        print(f"{brand['brand']:<22} {format_bytes(brand['rss_mean_bytes']):>10} "
+              f"{format_bytes(brand['rss_max_bytes']):>10} {format_bytes(brand['anon_mean_bytes']):>10} "
+              f"{_signed(first):>10} {_signed(later):>10}")
+
+    print(f"\n{Colors.BOLD}{'Cycle':<8} {'RSS plancher':>14} {'RSS max':>10} {'Anon plancher':>14}{Colors.ENDC}")
+    for cycle in report['cycles']:
+        print(f"{cycle['cycle']:<8} {format_bytes(cycle['rss_floor_bytes']):>14} "
+              f"{format_bytes(cycle['rss_max_bytes']):>10} {format_bytes(cycle['anon_floor_bytes']):>14}")
+
+    print()
+    threshold = format_bytes(report['threshold_bytes'])
+    for label, key in (("RSS", 'rss'), ("Mémoire anonyme", 'anon')):
+        trend = report[key]
+        detail = (f"pente {_signed(trend['slope_bytes_per_cycle'])}/cycle, "
+                  f"fin de mesure {_signed(trend['tail_slope_bytes_per_cycle'])}/cycle")
+        if trend['verdict'] == 'croissance':
+            print(f"{Colors.RED}✗ {label}: croissance non stabilisée ({detail}, seuil {threshold}){Colors.ENDC}")
+        elif trend['verdict'] == 'stable':
+            print(f"{Colors.GREEN}✓ {label}: stabilisée ({detail}){Colors.ENDC}")
+        else:
+            print(f"{Colors.YELLOW}⚠ {label}: tendance indéterminée, au moins "
+                  f"{MIN_CYCLES_FOR_VERDICT} cycles requis ({detail}){Colors.ENDC}")
+
+    for brand, error in report['failures'].items():
+        print(f"{Colors.RED}✗ Changement vers '{brand}' refusé: {error}{Colors.ENDC}")
+    if report['server_lost']:
+        print(f"{Colors.RED}✗ Le processus serveur a disparu pendant la mesure{Colors.ENDC}")
+    if report['restore_error']:
+        print(f"{Colors.RED}✗ Branding initial '{report['restored_brand']}' non restauré: "
+              f"{report['restore_error']}{Colors.ENDC}")
+    elif report['restored_brand']:
+        print(f"{Colors.GREEN}✓ Branding initial '{report['restored_brand']}' restauré{Colors.ENDC}")
+
+
+def _signed(size: Optional[int]) -> str:
+    if size is None:
+        return "N/A"
+    return ("-" if size < 0 else "+") + format_bytes(abs(size))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="branding.py memory",
+                                     description="Mémoire du serveur au fil des changements de branding")
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--token', default=None)
+    parser.add_argument('--brands', default=None, help="Liste séparée par des virgules")
+    parser.add_argument('--cycles', type=int, default=DEFAULT_CYCLES)
+    parser.add_argument('--dwell', type=float, default=DEFAULT_DWELL)
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_KB, help="Ko par cycle")
+    parser.add_argument('--pid', type=int, default=None)
+    parser.add_argument('-j', '--json', action='store_true')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la mesure mémoire."""
+    # Import à la demande : lecture du .env et découverte du serveur
+    from configure_branding import get_server_url, read_env_file
+    from branding_proc import find_listening_pids
+
+    args = build_parser().parse_args(argv)
+    if not has_procfs():
+        print(f"{Colors.RED}✗ /proc indisponible : mesure mémoire réservée à Linux{Colors.ENDC}")
+        return 2
+
+    base_url = (args.url or get_server_url()).rstrip('/')
+    token = args.token or os.environ.get('BRANDING_ADMIN_TOKEN') or read_env_file().get('BRANDING_ADMIN_TOKEN')
+    if not token:
+        print(f"{Colors.RED}✗ Jeton Super Admin requis pour /api/branding/set "
+              f"(--token ou BRANDING_ADMIN_TOKEN){Colors.ENDC}")
+        return 2
+
+    if args.pid is not None:
+        pids = [args.pid]
+    else:
+        port = urlsplit(base_url).port or (443 if base_url.startswith('https') else 80)
+        pids = find_listening_pids(port)
+        if not pids:
+            reason = "aucun processus en écoute" if pids == [] else "processus inaccessible (--pid)"
+            print(f"{Colors.RED}✗ Serveur introuvable sur le port {port}: {reason}{Colors.ENDC}")
+            return 2
+
+    branding_dir = get_project_root() / "config" / "branding"
+    available = sorted(f.stem for f in branding_dir.glob("*.json") if 'template' not in f.stem)
+    if args.brands:
+        brands = [b.strip() for b in args.brands.split(',') if b.strip()]
+    else:
+        brands = available
+
+    # Branding à réactiver après la mesure : celui que le serveur sert maintenant
+    configured = os.environ.get('BRAND_CONFIG') or read_env_file().get('BRAND_CONFIG') or 'default'
+    initial = active_brand(base_url, available, preferred=configured)
+    if initial is None:
+        initial = configured
+        print(f"{Colors.YELLOW}⚠ Branding actif non identifié, '{initial}' (BRAND_CONFIG) "
+              f"sera restauré{Colors.ENDC}", file=sys.stderr)
+
+    report = run_sampling(base_url, token, pids, brands, max(1, args.cycles), max(0.1, args.dwell),
+                          max(0.01, args.interval), int(args.threshold * 1024), progress=not args.json,
+                          restore_brand=initial)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nMesure interrompue par l'utilisateur")
+        sys.exit(130)
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Poids des pages et ressources en double - EB-Vision 2.0
+=======================================================
+
+Analyse chaque page public/*.html : feuilles de style, scripts, images et
+icônes référencés sont résolus comme le fait server.js (public/ à la racine,
+config/ sous /config, Font Awesome sous /vendor/fontawesome) puis mesurés.
+
+Pour chaque page :
+
+- poids total (octets bruts et estimation transférée avec gzip, le serveur
+  utilisant compression() à partir de 1 Ko) ;
+- ressources bloquantes : feuilles de style (hors media="print") et scripts
+  synchrones (ni async, ni defer, ni module) placés dans <head> ;
+- fichiers chargés plusieurs fois (même fichier sous deux URL, js/auth.js et
+  /js/auth.js par exemple, ou même contenu sous deux noms) ;
+- règles CSS identiques présentes dans plusieurs feuilles de la page.
+
+Avec --brand <id>, le thème précompilé du tenant remplace brand-active.css
+et ses logos (branding.logo) sont ajoutés aux pages qui chargent
+branding-loader.js ou sidebar-branding.js.
+
+Les pages analysées et les mesures des fichiers sont mémorisées dans le cache
+de vérification (config/branding/.verify-cache.sqlite) : une page ou une
+ressource inchangée n'est ni relue ni recompressée.
+
+Usage:
+    python branding.py pages [pages] [--brand id] [--top N] [-j]
+"""
+
+import re
+import sys
+import json
+import zlib
+import hashlib
+from dataclasses import asdict, dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# À incrémenter quand le résultat de l'analyse change pour un même fichier
+PARSER_VERSION = "1"
+
+# Préfixe d'URL -> dossier servi (ordre de server.js, préfixes les plus longs d'abord)
+STATIC_MOUNTS = [
+    ('/vendor/fontawesome/', 'node_modules/@fortawesome/fontawesome-free'),
+    ('/config/', 'config'),
+    ('/uploads/', 'uploads'),
+    ('/', 'public'),
+]
+ACTIVE_THEME_URL = "/config/themes/brands/brand-active.css"
+# Servi par server.js tant que le thème actif n'a pas été généré
+FALLBACK_THEME = "config/themes/brand-active.default.css"
+# Fichiers produits par une installation (npm install) : leur absence
+# n'est pas une référence cassée
+GENERATED_PATHS = ('node_modules/',)
+BRANDING_SCRIPTS = ('branding-loader.js', 'sidebar-branding.js')
+
+# compression() ne compresse pas les réponses de moins de 1 Ko
+COMPRESSION_THRESHOLD = 1024
+GZIP_LEVEL = 6
+# En-tête et pied d'un flux gzip autour des données deflate
+GZIP_OVERHEAD = 18
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.html', '.svg', '.json', '.ico'}
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_RULE = re.compile(r'([^{}@;]+)\{([^{}]*)\}')
+_SPACES = re.compile(r'\s+')
+
+
+@dataclass
+class PageResource:
+    """Ressource référencée par une page."""
+    url: str
+    kind: str  # stylesheet | script | image | icon | logo
+    path: Optional[str] = None  # relatif à la racine du projet
+    bytes: int = 0
+    transfer_bytes: int = 0
+    blocking: bool = False
+    external: bool = False
+    missing: bool = False
+    generated: bool = False  # fichier de build absent, non mesuré
+
+
+@dataclass
+class PageReport:
+    """Mesures d'une page."""
+    page: str
+    html_bytes: int = 0
+    html_transfer_bytes: int = 0
+    resources: List[PageResource] = field(default_factory=list)
+    duplicates: List[Dict] = field(default_factory=list)
+    css_overlap_bytes: int = 0
+    css_overlap_rules: int = 0
+
+    @property
+    def local(self) -> List[PageResource]:
+        """Ressources servies par l'application (une fois chacune)."""
+        seen, result = set(), []
+        for resource in self.resources:
+            if resource.path and not resource.missing and resource.path not in seen:
+                seen.add(resource.path)
+                result.append(resource)
+        return result
+
+    @property
+    def total_bytes(self) -> int:
+        return self.html_bytes + sum(r.bytes for r in self.local)
+
+    @property
+    def transfer_bytes(self) -> int:
+        return self.html_transfer_bytes + sum(r.transfer_bytes for r in self.local)
+
+    @property
+    def blocking(self) -> List[PageResource]:
+        return [r for r in self.resources if r.blocking]
+
+    @property
+    def missing(self) -> List[PageResource]:
+        return [r for r in self.resources if r.missing and not r.generated]
+
+    @property
+    def unmeasured(self) -> List[PageResource]:
+        return [r for r in self.resources if r.generated]
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Octets économisables : doublons et règles CSS répétées."""
+        return sum(d['bytes'] * (d['count'] - 1) for d in self.duplicates) + self.css_overlap_bytes
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.update(total_bytes=self.total_bytes, transfer_bytes=self.transfer_bytes,
+                    blocking=len(self.blocking), missing=len(self.missing),
+                    unmeasured=len(self.unmeasured),
+                    wasted_bytes=self.wasted_bytes)
+        return data
+
+
+class _ReferenceParser(HTMLParser):
+    """Relève les ressources chargées par une page, dans l'ordre du document."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.references: List[Dict] = []
+        self.in_head = False
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value or '') for name, value in attrs}
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'link':
+            rel = attributes.get('rel', '').lower().split()
+            href = attributes.get('href')
+            if not href:
+                return
+            if 'stylesheet' in rel:
+                media = attributes.get('media', 'all').lower()
+                blocking = 'disabled' not in attributes and media not in ('print', 'none')
+                self._add(href, 'stylesheet', blocking)
+            elif 'icon' in rel:
+                self._add(href, 'icon', False)
+        elif tag == 'script':
+            src = attributes.get('src')
+            if src:
+                blocking = (self.in_head and 'async' not in attributes and 'defer' not in attributes
+                            and attributes.get('type', '').lower() != 'module')
+                self._add(src, 'script', blocking)
+        elif tag == 'img':
+            src = attributes.get('src')
+            if src:
+                self._add(src, 'image', False)
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+
+    def _add(self, url: str, kind: str, blocking: bool):
+        self.references.append({'url': url.strip(), 'kind': kind, 'blocking': blocking})
+
+
+def parse_page(html: str) -> List[Dict]:
+    """Références d'une page : [{'url', 'kind', 'blocking'}]."""
+    parser = _ReferenceParser()
+    parser.feed(html)
+    parser.close()
+    return parser.references
+
+
+def is_external(url: str) -> bool:
+    """URL servie par un autre hôte (CDN) ou intégrée (data:)."""
+    return bool(re.match(r'^(?:[a-z][a-z0-9+.-]*:|//)', url, re.I))
+
+
+def resolve_url(root: Path, url: str) -> Optional[Path]:
+    """Fichier servi pour une URL locale (None si aucun dossier ne la sert)."""
+    url = url.split('#', 1)[0].split('?', 1)[0]
+    if not url or is_external(url):
+        return None
+    if not url.startswith('/'):
+        # Les pages sont à la racine de public/
+        url = '/' + url
+    for prefix, directory in STATIC_MOUNTS:
+        if url.startswith(prefix):
+            return root / directory / url[len(prefix):]
+    return None
+
+
+def transfer_size(data: bytes, suffix: str) -> int:
+    """Taille transférée : gzip au-delà du seuil de compression() pour les formats texte."""
+    size = len(data)
+    if size < COMPRESSION_THRESHOLD or suffix.lower() not in COMPRESSIBLE_EXTENSIONS:
+        return size
+    return min(size, len(zlib.compress(data, GZIP_LEVEL)) + GZIP_OVERHEAD)
+
+
+def css_rules(text: str) -> List[Tuple[str, int]]:
+    """Règles d'une feuille de style : (empreinte de la règle normalisée, longueur)."""
+    text = _CSS_COMMENT.sub('', text)
+    rules = []
+    for selector, body in _CSS_RULE.findall(text):
+        selector = _SPACES.sub(' ', selector).strip()
+        body = _SPACES.sub(' ', body).strip()
+        if not selector or not body:
+            continue
+        rule = f"{selector}{{{body}}}"
+        rules.append((hashlib.sha1(rule.encode('utf-8')).hexdigest()[:16], len(rule)))
+    return rules
+
+
+class PageAuditor:
+    """Mesure les pages de public/ en réutilisant le cache de vérification."""
+
+    def __init__(self, root: Path, cache=None, brand_id: Optional[str] = None):
+        self.root = Path(root)
+        self.cache = cache
+        self.brand_id = brand_id
+        self._code = Path(__file__).resolve()
+        self._stats: Dict[str, Optional[Dict]] = {}
+        self._brand_logos: List[str] = []
+        self._brand_theme: Optional[Path] = None
+        if brand_id:
+            self._load_brand(brand_id)
+
+    def _load_brand(self, brand_id: str):
+        """Thème précompilé et logos du tenant."""
+        theme = self.root / "config" / "themes" / "brands" / f"brand-{brand_id}.css"
+        if theme.exists():
+            self._brand_theme = theme
+        from branding_compile import load_config
+
+        try:
+            logo = load_config(self.root / "config" / "branding", brand_id).get('branding', {}).get('logo', {})
+        except (OSError, ValueError, AttributeError):
+            return
+        if isinstance(logo, dict):
+            self._brand_logos = [url for key, url in logo.items()
+                                 if key in ('main', 'icon', 'favicon') and isinstance(url, str)]
+
+    def _cached(self, key: str, path: Path, compute):
+        """Valeur mémorisée pour un fichier, recalculée seulement s'il a changé."""
+        if self.cache is None:
+            return compute()
+        fingerprint = self.cache.fingerprint([path, self._code], PARSER_VERSION)
+        hit = self.cache.get(key, fingerprint)
+        if hit is not None:
+            return hit[0]
+        value = compute()
+        self.cache.put(key, fingerprint, value, [])
+        return value
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def page_info(self, page: Path) -> Dict:
+        """Taille et références d'une page (analyse mise en cache)."""
+        def compute():
+            with open(page, 'rb') as f:
+                data = f.read()
+            return {
+                'bytes': len(data),
+                'transfer': transfer_size(data, page.suffix),
+                'references': parse_page(data.decode('utf-8', errors='replace')),
+            }
+        return self._cached(f"page:{self._relative(page)}", page, compute)
+
+    def resource_stats(self, path: Path) -> Optional[Dict]:
+        """Taille, taille transférée, empreinte et règles CSS d'un fichier (None s'il manque)."""
+        key = self._relative(path)
+        if key in self._stats:
+            return self._stats[key]
+
+        def compute():
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+            stats = {
+                'bytes': len(data),
+                'transfer': transfer_size(data, path.suffix),
+                'digest': hashlib.sha256(data).hexdigest(),
+            }
+            if path.suffix.lower() == '.css':
+                stats['rules'] = css_rules(data.decode('utf-8', errors='replace'))
+            return stats
+
+        stats = self._cached(f"resource:{key}", path, compute) if path.is_file() else None
+        self._stats[key] = stats
+        return stats
+
+    def audit_page(self, page: Path) -> PageReport:
+        """Mesure une page et ses ressources."""
+        info = self.page_info(page)
+        report = PageReport(page=page.name, html_bytes=info['bytes'],
+                            html_transfer_bytes=info['transfer'])
+        references = list(info['references'])
+        if self.brand_id and any(r['url'].split('?')[0].endswith(BRANDING_SCRIPTS) for r in references):
+            # Logos posés à l'exécution par branding-loader.js / sidebar-branding.js
+            references += [{'url': url, 'kind': 'logo', 'blocking': False} for url in self._brand_logos]
+
+        for reference in references:
+            resource = PageResource(url=reference['url'], kind=reference['kind'],
+                                    blocking=reference['blocking'])
+            report.resources.append(resource)
+            if is_external(resource.url):
+                resource.external = True
+                continue
+            if resource.url.split('?')[0] == ACTIVE_THEME_URL:
+                path = self._brand_theme or resolve_url(self.root, resource.url)
+                if not path.exists():
+                    path = self.root / FALLBACK_THEME
+            else:
+                path = resolve_url(self.root, resource.url)
+            if path is None:
+                resource.missing = True
+                continue
+            resource.path = self._relative(path)
+            stats = self.resource_stats(path)
+            if stats is None:
+                resource.missing = True
+                resource.generated = resource.path.startswith(GENERATED_PATHS)
+                continue
+            resource.bytes = stats['bytes']
+            resource.transfer_bytes = stats['transfer']
+
+        self._find_duplicates(report)
+        self._find_css_overlap(report)
+        return report
+
+    def _find_duplicates(self, report: PageReport):
+        """Même fichier (ou même contenu) chargé plusieurs fois par la page."""
+        groups: Dict[str, List[PageResource]] = {}
+        for resource in report.resources:
+            if resource.path and not resource.missing:
+                digest = self._stats[resource.path]['digest']
+                groups.setdefault(digest, []).append(resource)
+        for resources in groups.values():
+            if len(resources) > 1:
+                report.duplicates.append({
+                    'urls': [r.url for r in resources],
+                    'paths': sorted({r.path for r in resources}),
+                    'count': len(resources),
+                    'bytes': resources[0].bytes,
+                })
+
+    def _find_css_overlap(self, report: PageReport):
+        """Règles CSS identiques dans plusieurs feuilles distinctes de la page."""
+        seen: Dict[str, str] = {}
+        for resource in report.local:
+            if resource.kind != 'stylesheet':
+                continue
+            for digest, length in self._stats[resource.path].get('rules', []):
+                owner = seen.setdefault(digest, resource.path)
+                if owner != resource.path:
+                    report.css_overlap_rules += 1
+                    report.css_overlap_bytes += length
+
+    def pages(self, names: Optional[List[str]] = None) -> List[Path]:
+        """Pages public/*.html (toutes, ou celles nommées)."""
+        pages = sorted((self.root / "public").glob("*.html"))
+        if names:
+            wanted = {n if n.endswith('.html') else f"{n}.html" for n in names}
+            pages = [p for p in pages if p.name in wanted]
+        return pages
+
+    def audit(self, names: Optional[List[str]] = None) -> List[PageReport]:
+        """Mesure toutes les pages demandées."""
+        return [self.audit_page(page) for page in self.pages(names)]
+
+
+def summarize(reports: List[PageReport]) -> Dict:
+    """Totaux et ressources les plus chargées, toutes pages confondues."""
+    usage: Dict[str, Dict] = {}
+    for report in reports:
+        for resource in report.local:
+            entry = usage.setdefault(resource.path, {'path': resource.path, 'pages': 0,
+                                                     'bytes': resource.bytes,
+                                                     'transfer_bytes': resource.transfer_bytes})
+            entry['pages'] += 1
+    return {
+        'pages': len(reports),
+        'total_bytes': sum(r.total_bytes for r in reports),
+        'transfer_bytes': sum(r.transfer_bytes for r in reports),
+        'pages_with_duplicates': sum(1 for r in reports if r.duplicates),
+        'wasted_bytes': sum(r.wasted_bytes for r in reports),
+        'missing': sum(len(r.missing) for r in reports),
+        'unmeasured': sorted({res.url for r in reports for res in r.unmeasured}),
+        'resources': sorted(usage.values(), key=lambda e: -e['pages'] * e['transfer_bytes']),
+    }
+
+
+def format_size(size: int) -> str:
+    """Taille lisible en octets ou Ko."""
+    return f"{size / 1024:.1f} Ko" if size >= 1024 else f"{size} o"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Rapport de poids des pages (toutes, ou celles passées en argument)."""
+    from branding_cache import ResultCache
+    from branding_common import Colors, get_project_root, print_header
+
+    args = sys.argv[1:] if argv is None else list(argv)
+    if '-h' in args or '--help' in args:
+        print("Usage: python branding.py pages [pages] [--brand id] [--top N] [-j]")
+        print()
+        print("Poids, ressources bloquantes et fichiers chargés plusieurs fois")
+        print("pour chaque page public/*.html.")
+        return 0
+    options: Dict[str, Optional[str]] = {'--brand': None, '--top': '15'}
+    for option in options:
+        if option in args:
+            index = args.index(option)
+            if index + 1 >= len(args):
+                print(f"{Colors.RED}{option} attend une valeur{Colors.ENDC}")
+                return 2
+            options[option] = args[index + 1]
+            del args[index:index + 2]
+    try:
+        top = int(options['--top'])
+    except ValueError:
+        print(f"{Colors.RED}--top attend un nombre entier{Colors.ENDC}")
+        return 2
+    json_output = '-j' in args or '--json' in args
+    names = [a for a in args if not a.startswith('-')]
+
+    root = get_project_root()
+    cache = ResultCache(root / "config" / "branding")
+    try:
+        reports = PageAuditor(root, cache, options['--brand']).audit(names)
+    finally:
+        cache.close()
+    summary = summarize(reports)
+    failed = summary['missing'] > 0
+
+    if json_output:
+        print(json.dumps({'brand': options['--brand'], 'pages': [r.to_dict() for r in reports],
+                          'summary': summary, 'ok': not failed}, ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+
+    print_header("POIDS DES PAGES")
+    if options['--brand']:
+        print(f"Tenant: {options['--brand']}\n")
+    reports.sort(key=lambda r: -r.transfer_bytes)
+    print(f"{Colors.BOLD}{'Page':<38} {'Fichiers':>8} {'Brut':>10} {'Transféré':>10} "
+          f"{'Bloq.':>6} {'Doublons':>8}{Colors.ENDC}")
+    for report in reports[:top] if top > 0 else reports:
+        color = Colors.YELLOW if report.duplicates or report.missing else ''
+        end = Colors.ENDC if color else ''
+        print(f"{color}{report.page:<38} {len(report.local):>8} {format_size(report.total_bytes):>10} "
+              f"{format_size(report.transfer_bytes):>10} {len(report.blocking):>6} "
+              f"{len(report.duplicates):>8}{end}")
+    if 0 < top < len(reports):
+        print(f"... et {len(reports) - top} autre(s) page(s) (--top 0 pour tout afficher)")
+
+    problems = [r for r in reports if r.duplicates or r.missing or r.css_overlap_rules]
+    if problems:
+        print(f"\n{Colors.BOLD}Économies possibles{Colors.ENDC}")
+    for report in sorted(problems, key=lambda r: r.page):
+        print(f"  {Colors.BOLD}{report.page}{Colors.ENDC}")
+        for duplicate in report.duplicates:
+            print(f"    {Colors.YELLOW}chargé {duplicate['count']} fois "
+                  f"({format_size(duplicate['bytes'])}) : {', '.join(duplicate['urls'])}{Colors.ENDC}")
+        if report.css_overlap_rules:
+            print(f"    {report.css_overlap_rules} règle(s) CSS répétée(s) entre feuilles "
+                  f"({format_size(report.css_overlap_bytes)})")
+        for resource in report.missing:
+            print(f"    {Colors.RED}introuvable : {resource.url}{Colors.ENDC}")
+
+    print(f"\n{Colors.BOLD}Ressources les plus chargées{Colors.ENDC} (pages × taille transférée)")
+    for entry in summary['resources'][:10]:
+        print(f"  {entry['path']:<52} {entry['pages']:>3} page(s) × {format_size(entry['transfer_bytes'])}")
+
+    print(f"\n{Colors.BOLD}Total:{Colors.ENDC} {summary['pages']} page(s), "
+          f"{format_size(summary['transfer_bytes'])} transférés, "
+          f"{summary['pages_with_duplicates']} page(s) avec doublons, "
+          f"{format_size(summary['wasted_bytes'])} économisables, "
+          f"{summary['missing']} référence(s) introuvable(s)")
+    if summary['unmeasured']:
+        print(f"{Colors.CYAN}Non mesurés (fichiers de build absents : npm install) : "
+              f"{', '.join(summary['unmeasured'])}{Colors.ENDC}")
+    print(f"{Colors.CYAN}Cache: {cache.hits} lecture(s) évitée(s), {cache.misses} fichier(s) analysé(s){Colors.ENDC}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
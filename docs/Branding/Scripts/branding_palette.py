@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Palettes et contrastes des tenants - EB-Vision 2.0
+==================================================
+
+Calcule en une passe, pour toutes les configurations, à partir de
+branding.colors :
+
+- les variantes claires/foncées (même calcul qu'adjustColorBrightness dans
+  public/js/branding-loader.js) ;
+- une couleur de texte lisible sur chaque couleur de marque
+  (--brand-<clé>-contrast) : blanc tant qu'il atteint le ratio WCAG 3:1,
+  sinon le texte sombre du thème (#212529) s'il contraste mieux ;
+- les ratios de contraste WCAG 2.x des couples texte/fond réellement
+  utilisés par config/themes/brand-variables.css (sidebar, boutons, liens).
+
+Les couleurs de tous les tenants sont empilées dans une matrice
+(tenants × couleurs × RVB) et traitées par NumPy si le module est installé
+(« pip install numpy »), sinon par un calcul Python équivalent.
+
+Un couple sous 3:1 est illisible (erreur) ; sous 4.5:1, il n'atteint pas le
+niveau AA pour le texte courant (avertissement).
+
+Usage:
+    python branding.py palette [ids|--all] [-j]
+"""
+
+import re
+import sys
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # Optionnel : pip install numpy
+except ImportError:
+    np = None
+
+# Même correspondance que colorMap dans branding-loader.js
+COLOR_KEYS = ['primary', 'secondary', 'accent', 'success', 'warning',
+              'danger', 'info', 'dark', 'light']
+
+# Valeurs de config/themes/brand-variables.css, en vigueur pour les clés
+# absentes d'une configuration
+DEFAULT_COLORS = {
+    'primary': '#2c3e50',
+    'secondary': '#3498db',
+    'accent': '#27ae60',
+    'success': '#27ae60',
+    'warning': '#f39c12',
+    'danger': '#e74c3c',
+    'info': '#3498db',
+    'dark': '#1a252f',
+    'light': '#ecf0f1',
+}
+
+# Variantes générées (generateColorVariations) : (clé, suffixe, pourcentage)
+DERIVED_VARIANTS = [
+    ('primary', 'light', 20),
+    ('primary', 'dark', -20),
+    ('secondary', 'light', 20),
+    ('secondary', 'dark', -20),
+]
+
+WHITE = '#ffffff'
+# --text-primary de brand-variables.css
+DARK_TEXT = '#212529'
+PAGE_BACKGROUND = '#ffffff'
+
+# Seuils WCAG 2.x
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+
+# Couples (texte, fond, usage) de brand-variables.css. Les noms désignent
+# une couleur de marque, une variante (<clé>-light/-dark), la couleur de
+# texte calculée (<clé>-contrast) ou le fond de page (page)
+CONTRAST_PAIRS = [
+    ('primary-contrast', 'primary', "Sidebar et boutons principaux"),
+    ('primary-contrast', 'primary-light', "Sidebar (survol)"),
+    ('primary-contrast', 'primary-dark', "Boutons principaux (survol)"),
+    ('secondary-contrast', 'secondary', "Boutons secondaires"),
+    ('secondary-contrast', 'secondary-dark', "Boutons secondaires (survol)"),
+    ('accent-contrast', 'accent', "Sidebar (lien actif)"),
+    ('primary', 'page', "En-tête, liens et .text-primary"),
+    ('primary-dark', 'page', "Liens (survol)"),
+]
+
+_HEX_COLOR = re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+
+
+@dataclass
+class ContrastIssue:
+    """Couple texte/fond sous le seuil WCAG."""
+    usage: str
+    foreground: str
+    background: str
+    ratio: float
+    level: str  # error | warning
+
+
+@dataclass
+class Palette:
+    """Jetons calculés et audit de contraste d'un tenant."""
+    brand_id: str
+    tokens: Dict[str, str] = field(default_factory=dict)
+    ratios: Dict[str, float] = field(default_factory=dict)
+    issues: List[ContrastIssue] = field(default_factory=list)
+    invalid: List[str] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[ContrastIssue]:
+        return [issue for issue in self.issues if issue.level == 'error']
+
+
+def is_hex_color(value) -> bool:
+    """Vrai pour #rgb ou #rrggbb."""
+    return isinstance(value, str) and bool(_HEX_COLOR.match(value))
+
+
+def parse_hex(hex_color: str) -> Tuple[int, int, int]:
+    """#rgb ou #rrggbb -> (r, v, b)."""
+    value = hex_color.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    num = int(value, 16)
+    return num >> 16, (num >> 8) & 0xFF, num & 0xFF
+
+
+def to_hex(rgb) -> str:
+    """(r, v, b) -> #rrggbb."""
+    r, g, b = (int(c) for c in rgb)
+    return '#' + format((r << 16) | (g << 8) | b, '06x')
+
+
+def _js_round(value: float) -> int:
+    # Math.round de JavaScript arrondit .5 vers le haut
+    return int((value + 0.5) // 1)
+
+
+def _channel(c: float) -> float:
+    c = c / 255
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def relative_luminance(rgb) -> float:
+    """Luminance relative WCAG 2.x d'une couleur (r, v, b)."""
+    r, g, b = rgb
+    return 0.2126 * _channel(r) + 0.7152 * _channel(g) + 0.0722 * _channel(b)
+
+
+def contrast_ratio(l1: float, l2: float) -> float:
+    """Ratio de contraste WCAG entre deux luminances."""
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+
+def engine() -> str:
+    """Moteur de calcul utilisé."""
+    return "numpy" if np is not None else "python"
+
+
+# Table des couleurs d'une palette : couleurs de marque, variantes, puis
+# texte blanc, texte sombre et fond de page
+_COLUMNS = COLOR_KEYS + [f"{key}-{suffix}" for key, suffix, _ in DERIVED_VARIANTS]
+_WHITE, _DARK, _PAGE = len(_COLUMNS), len(_COLUMNS) + 1, len(_COLUMNS) + 2
+_VARIANT_SOURCES = [COLOR_KEYS.index(key) for key, _, _ in DERIVED_VARIANTS]
+_VARIANT_DELTAS = [_js_round(percent * 2.55) for _, _, percent in DERIVED_VARIANTS]
+
+
+def _column(name: str) -> int:
+    """Index d'un nom de CONTRAST_PAIRS dans la table étendue (couleurs puis textes calculés)."""
+    if name == 'page':
+        return _PAGE
+    if name.endswith('-contrast'):
+        return _PAGE + 1 + COLOR_KEYS.index(name[:-len('-contrast')])
+    return _COLUMNS.index(name)
+
+
+_PAIR_FG = [_column(fg) for fg, _, _ in CONTRAST_PAIRS]
+_PAIR_BG = [_column(bg) for _, bg, _ in CONTRAST_PAIRS]
+
+
+def _compute_numpy(base: List[List[Tuple[int, int, int]]]):
+    """Variantes, choix du texte et ratios pour toutes les palettes (matrices NumPy)."""
+    rgb = np.asarray(base, dtype=np.int32)                      # (N, K, 3)
+    n = rgb.shape[0]
+    derived = np.clip(rgb[:, _VARIANT_SOURCES, :]
+                      + np.asarray(_VARIANT_DELTAS, dtype=np.int32)[None, :, None], 0, 255)
+    fixed = np.asarray([parse_hex(WHITE), parse_hex(DARK_TEXT), parse_hex(PAGE_BACKGROUND)],
+                       dtype=np.int32)
+    table = np.concatenate([rgb, derived, np.broadcast_to(fixed, (n, 3, 3))], axis=1)
+
+    channels = table / 255.0
+    linear = np.where(channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+    luminance = linear @ np.asarray([0.2126, 0.7152, 0.0722])  # (N, T)
+
+    def ratio(a, b):
+        return (np.maximum(a, b) + 0.05) / (np.minimum(a, b) + 0.05)
+
+    keys = luminance[:, :len(COLOR_KEYS)]
+    on_white = ratio(keys, luminance[:, [_WHITE]])
+    on_dark = ratio(keys, luminance[:, [_DARK]])
+    use_dark = (on_white < AA_LARGE) & (on_dark > on_white)    # (N, K)
+    text = np.where(use_dark, luminance[:, [_DARK]], luminance[:, [_WHITE]])
+
+    extended = np.concatenate([luminance, text], axis=1)
+    ratios = ratio(extended[:, _PAIR_FG], extended[:, _PAIR_BG])  # (N, P)
+    return derived.tolist(), use_dark.tolist(), ratios.tolist()
+
+
+def _compute_python(base: List[List[Tuple[int, int, int]]]):
+    """Même calcul que _compute_numpy, palette par palette."""
+    white_l = relative_luminance(parse_hex(WHITE))
+    dark_l = relative_luminance(parse_hex(DARK_TEXT))
+    page_l = relative_luminance(parse_hex(PAGE_BACKGROUND))
+    all_derived, all_dark, all_ratios = [], [], []
+    for colors in base:
+        derived = [[max(0, min(255, c + delta)) for c in colors[source]]
+                   for source, delta in zip(_VARIANT_SOURCES, _VARIANT_DELTAS)]
+        luminance = [relative_luminance(rgb) for rgb in colors + derived] + [white_l, dark_l, page_l]
+        use_dark = []
+        for key_l in luminance[:len(COLOR_KEYS)]:
+            on_white = contrast_ratio(key_l, white_l)
+            use_dark.append(on_white < AA_LARGE and contrast_ratio(key_l, dark_l) > on_white)
+        extended = luminance + [dark_l if dark else white_l for dark in use_dark]
+        all_derived.append(derived)
+        all_dark.append(use_dark)
+        all_ratios.append([contrast_ratio(extended[fg], extended[bg])
+                           for fg, bg in zip(_PAIR_FG, _PAIR_BG)])
+    return all_derived, all_dark, all_ratios
+
+
+def compute_palettes(colors_by_brand: Dict[str, Dict]) -> Dict[str, Palette]:
+    """
+    Calcule les jetons et l'audit de contraste de plusieurs tenants à la fois.
+    `colors_by_brand` associe l'ID du tenant à sa section branding.colors.
+
+    Les jetons (variantes, couleurs de texte) ne sont produits que pour les
+    couleurs définies par le tenant ; l'audit porte sur la palette effective
+    (couleurs du tenant, à défaut celles de brand-variables.css).
+    """
+    brand_ids = list(colors_by_brand)
+    base: List[List[Tuple[int, int, int]]] = []
+    defined: List[List[bool]] = []
+    palettes: Dict[str, Palette] = {}
+    for brand_id in brand_ids:
+        colors = colors_by_brand[brand_id] or {}
+        palette = Palette(brand_id)
+        row, mask = [], []
+        for key in COLOR_KEYS:
+            value = colors.get(key)
+            valid = is_hex_color(value)
+            if value is not None and not valid:
+                palette.invalid.append(key)
+            row.append(parse_hex(value if valid else DEFAULT_COLORS[key]))
+            mask.append(valid)
+        base.append(row)
+        defined.append(mask)
+        palettes[brand_id] = palette
+    if not brand_ids:
+        return palettes
+
+    compute = _compute_numpy if np is not None else _compute_python
+    derived, use_dark, ratios = compute(base)
+
+    for index, brand_id in enumerate(brand_ids):
+        palette = palettes[brand_id]
+        mask = defined[index]
+        for variant, (key, suffix, _) in enumerate(DERIVED_VARIANTS):
+            if mask[COLOR_KEYS.index(key)]:
+                palette.tokens[f"--brand-{key}-{suffix}"] = to_hex(derived[index][variant])
+        for k, key in enumerate(COLOR_KEYS):
+            if mask[k]:
+                palette.tokens[f"--brand-{key}-contrast"] = DARK_TEXT if use_dark[index][k] else WHITE
+        for (foreground, background, usage), ratio in zip(CONTRAST_PAIRS, ratios[index]):
+            ratio = round(ratio, 2)
+            palette.ratios[usage] = ratio
+            if ratio < AA_NORMAL:
+                palette.issues.append(ContrastIssue(
+                    usage=usage, foreground=foreground, background=background, ratio=ratio,
+                    level='error' if ratio < AA_LARGE else 'warning'))
+    return palettes
+
+
+def audit_colors(colors: Dict) -> Palette:
+    """Jetons et audit d'une seule palette."""
+    return compute_palettes({'': colors})['']
+
+
+def describe(issue: ContrastIssue) -> str:
+    """Message lisible d'un défaut de contraste."""
+    threshold = AA_LARGE if issue.level == 'error' else AA_NORMAL
+    return (f"Contraste {issue.ratio:.2f}:1 < {threshold}:1 - {issue.usage} "
+            f"({issue.foreground} sur {issue.background})")
+
+
+def load_colors(branding_dir: Path, brand_ids: List[str]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """Lit branding.colors des tenants. Retourne (couleurs, erreurs de lecture)."""
+    from branding_compile import load_config
+
+    colors: Dict[str, Dict] = {}
+    errors: Dict[str, str] = {}
+    for brand_id in brand_ids:
+        try:
+            config = load_config(branding_dir, brand_id)
+        except (OSError, ValueError) as e:
+            errors[brand_id] = str(e)
+            continue
+        colors[brand_id] = config.get('branding', {}).get('colors', {}) or {}
+    return colors, errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Audit de contraste de tous les tenants (ou de ceux passés en argument)."""
+    from branding_common import Colors, get_project_root, print_header
+
+    args = sys.argv[1:] if argv is None else argv
+    if '-h' in args or '--help' in args:
+        print("Usage: python branding.py palette [ids|--all] [-j]")
+        print()
+        print("Calcule les variantes et les couleurs de texte de chaque tenant et")
+        print("contrôle les contrastes WCAG (erreur sous 3:1, avertissement sous 4.5:1).")
+        return 0
+    json_output = '-j' in args or '--json' in args
+    branding_dir = get_project_root() / "config" / "branding"
+    brand_ids = [a for a in args if not a.startswith('-')]
+    if not brand_ids:
+        brand_ids = sorted(f.stem for f in branding_dir.glob("*.json") if 'template' not in f.stem)
+
+    colors, read_errors = load_colors(branding_dir, brand_ids)
+    palettes = compute_palettes(colors)
+    failed = bool(read_errors) or any(p.errors for p in palettes.values())
+
+    if json_output:
+        print(json.dumps({
+            'engine': engine(),
+            'tenants': {brand_id: asdict(palette) for brand_id, palette in palettes.items()},
+            'read_errors': read_errors,
+            'ok': not failed,
+        }, ensure_ascii=False, indent=2))
+        return 1 if failed else 0
+
+    print_header("PALETTES ET CONTRASTES")
+    print(f"{Colors.BOLD}Moteur:{Colors.ENDC} {engine()} ({len(palettes)} tenants)\n")
+    for brand_id, error in read_errors.items():
+        print(f"{Colors.RED}✗ {brand_id}: lecture impossible ({error}){Colors.ENDC}")
+    for brand_id, palette in palettes.items():
+        worst = min(palette.ratios.values())
+        if palette.errors:
+            status = f"{Colors.RED}✗{Colors.ENDC}"
+        elif palette.issues:
+            status = f"{Colors.YELLOW}⚠{Colors.ENDC}"
+        else:
+            status = f"{Colors.GREEN}✓{Colors.ENDC}"
+        print(f"{status} {Colors.BOLD}{brand_id}{Colors.ENDC} (contraste minimal {worst:.2f}:1)")
+        for key in palette.invalid:
+            print(f"    {Colors.YELLOW}branding.colors.{key} invalide : couleur par défaut utilisée{Colors.ENDC}")
+        for issue in palette.issues:
+            color = Colors.RED if issue.level == 'error' else Colors.YELLOW
+            print(f"    {color}{describe(issue)}{Colors.ENDC}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
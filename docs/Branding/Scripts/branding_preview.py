@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serveur d'aperçu des brandings - EB-Vision 2.0
+==============================================
+
+Serveur HTTP asyncio autonome : il sert public/ et répond à
+/api/branding/config depuis n'importe quel config/branding/<id>.json, sans
+toucher au serveur Node, ni au .env partagé.
+
+- /t/<id>/login.html : page servie avec le branding <id> (configuration
+  inlinée dans la page comme par server.js, thème brand-active.css calculé
+  à la volée) ;
+- les URL absolues d'une page (/js/auth.js, /api/branding/config...) sont
+  rattachées au tenant de la page d'après l'en-tête Referer ;
+- / : liste des tenants et comparaison côte à côte
+  (/__preview/compare?brands=a,b&page=login.html).
+
+Les fichiers sont relus à chaque requête (configuration et thème mémorisés
+par date de modification) et une tâche de fond surveille configurations,
+thèmes et pages : les pages ouvertes se rechargent seules après un
+changement.
+
+Les autres routes /api/ répondent 503 : les pages qui exigent une session
+renvoient vers login.html, page de référence de l'aperçu.
+
+Usage:
+    python branding.py preview [--port 8090] [--host 127.0.0.1] [--page login.html]
+"""
+
+import sys
+import json
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from branding_common import Colors, get_project_root
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8090
+DEFAULT_PAGE = "login.html"
+DEFAULT_INTERVAL = 1.0
+
+TENANT_PREFIX = "/t/"
+PREVIEW_PREFIX = "/__preview/"
+CONFIG_URL = "api/branding/config"
+ACTIVE_THEME_URL = "config/themes/brands/brand-active.css"
+MAX_HEADER_BYTES = 64 * 1024
+
+# Fichiers surveillés pour le rechargement des pages ouvertes
+WATCHED = [
+    ("config/branding", "*.json"),
+    ("config/themes", "*.css"),
+    ("public", "*.html"),
+    ("public/css", "*"),
+    ("public/js", "*"),
+    ("public/assets/brands", "*/*"),
+]
+
+RELOAD_SCRIPT = (
+    "<script>(function(){var v=null;setInterval(function(){"
+    "fetch('/__preview/version').then(function(r){return r.json();}).then(function(d){"
+    "if(v!==null&&d.version!==v){location.reload();}v=d.version;}).catch(function(){});"
+    "},1000);})();</script>"
+)
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def split_tenant(path: str) -> Tuple[Optional[str], str]:
+    """'/t/demo/js/a.js' -> ('demo', 'js/a.js') ; sans préfixe -> (None, 'js/a.js')."""
+    if path.startswith(TENANT_PREFIX):
+        brand, _, rest = path[len(TENANT_PREFIX):].partition('/')
+        return (brand or None), rest
+    return None, path.lstrip('/')
+
+
+def referer_tenant(referer: Optional[str]) -> Optional[str]:
+    """Tenant de la page à l'origine d'une requête (en-tête Referer)."""
+    if not referer:
+        return None
+    return split_tenant(unquote(urlsplit(referer).path))[0]
+
+
+def is_page(path: str) -> bool:
+    """Requête de page HTML (navigation) plutôt que de ressource."""
+    return path == '' or path.endswith('/') or path.endswith('.html')
+
+
+def json_response(status: int, payload: Dict) -> Response:
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+
+def html_response(status: int, html: str) -> Response:
+    return status, {'Content-Type': 'text/html; charset=utf-8'}, html.encode('utf-8')
+
+
+def redirect(location: str) -> Response:
+    return 302, {'Location': location}, b''
+
+
+class PreviewServer:
+    """Sert public/ avec le branding choisi par préfixe d'URL."""
+
+    def __init__(self, root: Path, default_page: str = DEFAULT_PAGE,
+                 default_brand: Optional[str] = None, interval: float = DEFAULT_INTERVAL):
+        self.root = Path(root)
+        self.default_page = default_page
+        self.default_brand = default_brand or 'default'
+        self.interval = interval
+        self.version = self.scan_version()
+        # Tenant -> (configuration résolue, thème CSS)
+        self._configs: Dict[str, Tuple[Dict, Optional[str]]] = {}
+
+    # ---- Tenants -------------------------------------------------------
+
+    def brands(self) -> List[str]:
+        """Tenants disponibles (hors modèles)."""
+        branding_dir = self.root / "config" / "branding"
+        return sorted(f.stem for f in branding_dir.glob("*.json") if 'template' not in f.stem)
+
+    def load_config(self, brand: str) -> Optional[Dict]:
+        """Configuration d'un tenant (héritage résolu), relue seulement si un fichier de sa chaîne a changé."""
+        from branding_compile import load_config
+
+        if not brand or '/' in brand or brand.startswith('.'):
+            return None
+        try:
+            config = load_config(self.root / "config" / "branding", brand)
+        except (OSError, ValueError):
+            return None
+        cached = self._configs.get(brand)
+        if not cached or cached[0] is not config:
+            self._configs[brand] = (config, None)
+        return config
+
+    def theme_css(self, brand: str, config: Dict) -> str:
+        """Thème brand-active.css du tenant, calculé à la volée puis mémorisé."""
+        from branding_theme import render_theme_css, theme_variables
+
+        cached_config, css = self._configs[brand]
+        if css is None:
+            variables, _ = theme_variables(config)
+            css = render_theme_css(brand, variables)
+            self._configs[brand] = (cached_config, css)
+        return css
+
+    # ---- Surveillance --------------------------------------------------
+
+    def scan_version(self) -> str:
+        """Empreinte des dates de modification des fichiers surveillés."""
+        digest = hashlib.sha1()
+        for directory, pattern in WATCHED:
+            for path in sorted((self.root / directory).glob(pattern)):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    async def watch(self):
+        """Tâche de fond : met à jour la version quand un fichier surveillé change."""
+        while True:
+            await asyncio.sleep(self.interval)
+            version = await asyncio.to_thread(self.scan_version)
+            if version != self.version:
+                self.version = version
+                print(f"{Colors.CYAN}↻ Fichiers modifiés, rechargement des pages ouvertes{Colors.ENDC}")
+
+    # ---- Routage -------------------------------------------------------
+
+    async def route(self, path: str, query: Dict[str, List[str]], headers: Dict[str, str]) -> Response:
+        """Réponse à une requête GET."""
+        if path == '/':
+            return html_response(200, self.index_page())
+        if path.startswith(PREVIEW_PREFIX):
+            return self.preview_route(path[len(PREVIEW_PREFIX):], query)
+
+        brand, rest = split_tenant(path)
+        if brand is None:
+            brand = referer_tenant(headers.get('referer'))
+            if brand and is_page(rest):
+                # Navigation vers une URL absolue : on reste dans le tenant
+                return redirect(f"{TENANT_PREFIX}{quote(brand)}/{rest}")
+            brand = brand or self.default_brand
+
+        config = self.load_config(brand)
+        if config is None:
+            return html_response(404, f"<h1>Branding '{escape(brand)}' introuvable</h1>"
+                                      f"<p><a href=\"/\">Tenants disponibles</a></p>")
+        if rest == '' or rest.endswith('/'):
+            return redirect(f"{TENANT_PREFIX}{quote(brand)}/{rest}{self.default_page}")
+        if rest == CONFIG_URL:
+            return json_response(200, {'success': True, 'data': config})
+        if rest.startswith('api/'):
+            return json_response(503, {'success': False, 'error': "API indisponible en aperçu"})
+        if rest == ACTIVE_THEME_URL:
+            css = self.theme_css(brand, config)
+            return 200, {'Content-Type': 'text/css; charset=utf-8'}, css.encode('utf-8')
+        return await self.static_file(rest, brand, config)
+
+    def preview_route(self, name: str, query: Dict[str, List[str]]) -> Response:
+        """Routes propres à l'aperçu : version surveillée et comparaison."""
+        if name == 'version':
+            return json_response(200, {'version': self.version})
+        if name == 'compare':
+            brands = [b for value in query.get('brands', []) for b in value.split(',') if b]
+            page = (query.get('page') or [self.default_page])[0]
+            return html_response(200, self.compare_page(brands or self.brands(), page))
+        return html_response(404, "<h1>Introuvable</h1>")
+
+    async def static_file(self, rest: str, brand: str, config: Dict) -> Response:
+        """Fichier servi comme par server.js (public/, /config, /vendor/fontawesome)."""
+        from branding_pages import resolve_url
+
+        path = resolve_url(self.root, '/' + unquote(rest))
+        if path is None or any(part.startswith('.') for part in Path(rest).parts):
+            return html_response(404, "<h1>Introuvable</h1>")
+        path = path.resolve()
+        if not path.is_relative_to(self.root.resolve()) or not path.is_file():
+            return html_response(404, f"<h1>Introuvable : {escape(rest)}</h1>")
+
+        data = await asyncio.to_thread(path.read_bytes)
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if path.suffix.lower() == '.html':
+            html = self.render_page(data.decode('utf-8', errors='replace'), brand, config)
+            return html_response(200, html)
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        return 200, {'Content-Type': content_type}, data
+
+    def render_page(self, html: str, brand: str, config: Dict) -> str:
+        """Inline la configuration du tenant et ajoute le rechargement automatique."""
+        from branding_inline import inline_html, render_inline_block
+
+        inlined = inline_html(html, lambda indent, newline: render_inline_block(brand, config, indent, newline))
+        html = inlined if inlined is not None else html
+        index = html.lower().rfind('</body>')
+        return html[:index] + RELOAD_SCRIPT + html[index:] if index >= 0 else html + RELOAD_SCRIPT
+
+    # ---- Pages de l'aperçu ---------------------------------------------
+
+    def index_page(self) -> str:
+        """Liste des tenants et formulaire de comparaison."""
+        items = []
+        for brand in self.brands():
+            config = self.load_config(brand) or {}
+            name = config.get('app', {}).get('name', brand) if isinstance(config.get('app'), dict) else brand
+            items.append(
+                f'<li><label><input type="checkbox" name="brands" value="{escape(brand)}"> '
+                f'<a href="{TENANT_PREFIX}{quote(brand)}/{escape(self.default_page)}">{escape(brand)}</a>'
+                f' — {escape(str(name))}</label></li>')
+        return (
+            "<!DOCTYPE html><html lang=\"fr\"><head><meta charset=\"utf-8\">"
+            "<title>Aperçu des brandings</title></head><body style=\"font-family:sans-serif\">"
+            "<h1>Aperçu des brandings</h1>"
+            f"<form action=\"{PREVIEW_PREFIX}compare\"><ul>{''.join(items)}</ul>"
+            f"<p>Page : <input name=\"page\" value=\"{escape(self.default_page)}\"> "
+            "<button type=\"submit\">Comparer côte à côte</button></p></form>"
+            "</body></html>")
+
+    def compare_page(self, brands: List[str], page: str) -> str:
+        """Une même page affichée pour plusieurs tenants."""
+        frames = "".join(
+            f"<figure style=\"margin:0\"><figcaption><a href=\"{TENANT_PREFIX}{quote(b)}/{escape(page)}\">"
+            f"{escape(b)}</a></figcaption><iframe src=\"{TENANT_PREFIX}{quote(b)}/{escape(page)}\" "
+            "style=\"width:100%;height:720px;border:1px solid #ccc\"></iframe></figure>"
+            for b in brands)
+        return (
+            "<!DOCTYPE html><html lang=\"fr\"><head><meta charset=\"utf-8\">"
+            f"<title>Comparaison — {escape(page)}</title></head><body style=\"font-family:sans-serif\">"
+            f"<p><a href=\"/\">← Tenants</a> · {escape(page)}</p>"
+            "<div style=\"display:grid;grid-template-columns:repeat(auto-fill,minmax(480px,1fr));gap:12px\">"
+            f"{frames}</div></body></html>")
+
+    # ---- HTTP ----------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Traite une requête HTTP/1.1 (connexion fermée après la réponse)."""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            writer.close()
+            return
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        if method not in ('GET', 'HEAD'):
+            status, response_headers, body = 405, {'Allow': 'GET, HEAD'}, b''
+        else:
+            try:
+                status, response_headers, body = await self.route(unquote(url.path), parse_qs(url.query), headers)
+            except Exception as e:
+                status, response_headers, body = html_response(500, f"<h1>Erreur</h1><pre>{escape(str(e))}</pre>")
+
+        reason = {200: 'OK', 302: 'Found', 404: 'Not Found', 405: 'Method Not Allowed',
+                  500: 'Internal Server Error', 503: 'Service Unavailable'}.get(status, '')
+        response_headers.update({
+            'Content-Length': str(len(body)),
+            # Aperçu : toujours la dernière version des fichiers
+            'Cache-Control': 'no-store',
+            'Connection': 'close',
+        })
+        out = [f"HTTP/1.1 {status} {reason}"] + [f"{k}: {v}" for k, v in response_headers.items()]
+        writer.write(("\r\n".join(out) + "\r\n\r\n").encode('latin-1'))
+        if method != 'HEAD':
+            writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        """Démarre le serveur et la surveillance des fichiers."""
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="branding.py preview",
+                                     description="Aperçu de n'importe quel branding sans le serveur Node")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--page', default=DEFAULT_PAGE, help="Page ouverte par défaut")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help="Intervalle de surveillance des fichiers (s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du serveur d'aperçu."""
+    from configure_branding import get_current_config
+
+    args = build_parser().parse_args(argv)
+    server = PreviewServer(get_project_root(), args.page, get_current_config(), max(0.2, args.interval))
+    base = f"http://{args.host}:{args.port}"
+    print(f"{Colors.BOLD}Aperçu des brandings{Colors.ENDC} : {base}/")
+    for brand in server.brands():
+        print(f"  {base}{TENANT_PREFIX}{quote(brand)}/{args.page}")
+    print(f"Comparaison : {base}{PREVIEW_PREFIX}compare?brands=a,b&page={args.page}")
+    print("Ctrl+C pour arrêter")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except OSError as e:
+        print(f"{Colors.RED}✗ Impossible d'écouter sur {args.host}:{args.port}: {e}{Colors.ENDC}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\nAperçu arrêté")
+        sys.exit(130)
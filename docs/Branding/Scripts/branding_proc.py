@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Découverte du serveur et métriques de processus - EB-Vision 2.0
+===============================================================
+
+Identifie le processus qui écoute sur le port du serveur, plutôt que tout
+processus dont la ligne de commande contient « node » :
+
+- Linux : /proc/net/tcp et /proc/net/tcp6 donnent l'inode de la socket en
+  écoute sur le port, retrouvée ensuite parmi les descripteurs de
+  /proc/<pid>/fd ;
+- Windows : netstat -ano ;
+- autres systèmes : lsof.
+
+Sous Linux, les ressources du processus sont lues dans /proc sans aucune
+dépendance : mémoire résidente (RSS, pic, part anonyme), temps CPU, threads,
+descripteurs ouverts (et limite), durée de fonctionnement.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Set
+
+PROC = Path("/proc")
+TCP_LISTEN = '0A'
+
+# Seuils d'alerte de verify_branding.py
+RSS_WARNING_BYTES = 1024 * 1024 * 1024
+FD_WARNING_RATIO = 0.8
+
+
+@dataclass
+class ProcessStats:
+    """Ressources d'un processus lues dans /proc."""
+    pid: int
+    name: str
+    cmdline: str
+    rss_bytes: int
+    rss_peak_bytes: Optional[int]
+    rss_anon_bytes: Optional[int]
+    cpu_seconds: float
+    threads: int
+    open_fds: Optional[int]
+    fd_limit: Optional[int]
+    uptime_seconds: float
+
+
+def has_procfs() -> bool:
+    """Vrai si /proc expose les sockets TCP (Linux)."""
+    return (PROC / "net" / "tcp").exists()
+
+
+def listening_inodes(port: int) -> Set[int]:
+    """Inodes des sockets TCP (IPv4 et IPv6) en écoute sur le port."""
+    inodes: Set[int] = set()
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(PROC / "net" / table, 'r', encoding='ascii') as f:
+                next(f, None)  # en-tête
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10 or fields[3] != TCP_LISTEN:
+                        continue
+                    if int(fields[1].rsplit(':', 1)[1], 16) == port:
+                        inodes.add(int(fields[9]))
+        except OSError:
+            continue
+    return inodes
+
+
+def pids_for_inodes(inodes: Set[int]) -> List[int]:
+    """PID des processus détenant l'une des sockets (processus accessibles seulement)."""
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    pids: List[int] = []
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            with os.scandir(entry / "fd") as fds:
+                for fd in fds:
+                    try:
+                        if os.readlink(fd.path) in targets:
+                            pids.append(int(entry.name))
+                            break
+                    except OSError:
+                        continue
+        except OSError:
+            # Processus terminé entre-temps, ou appartenant à un autre utilisateur
+            continue
+    return sorted(pids)
+
+
+def _run(command: List[str]) -> str:
+    import subprocess
+
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return ''
+    return result.stdout
+
+
+def find_listening_pids(port: int) -> Optional[List[int]]:
+    """
+    PID des processus en écoute sur le port. Retourne une liste vide si
+    personne n'écoute, et None si un processus écoute mais que son PID n'est
+    pas accessible (processus d'un autre utilisateur).
+    """
+    if has_procfs():
+        inodes = listening_inodes(port)
+        if not inodes:
+            return []
+        return pids_for_inodes(inodes) or None
+
+    pids: Set[int] = set()
+    if sys.platform == "win32":
+        for line in _run(["netstat", "-ano", "-p", "TCP"]).splitlines():
+            fields = line.split()
+            if len(fields) == 5 and fields[3] == "LISTENING" and fields[1].rsplit(':', 1)[-1] == str(port):
+                pids.add(int(fields[4]))
+    else:
+        for line in _run(["lsof", "-nP", f"-iTCP:{port}", "-sTCP:LISTEN", "-t"]).split():
+            if line.isdigit():
+                pids.add(int(line))
+    return sorted(pids)
+
+
+def _status_kb(status: str, key: str) -> Optional[int]:
+    for line in status.splitlines():
+        if line.startswith(key + ':'):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def read_process_stats(pid: int) -> Optional[ProcessStats]:
+    """Ressources du processus (None si /proc est indisponible ou le processus terminé)."""
+    base = PROC / str(pid)
+    clock_ticks = os.sysconf('SC_CLK_TCK')
+    try:
+        stat = (base / "stat").read_text()
+        status = (base / "status").read_text()
+        cmdline = (base / "cmdline").read_bytes().replace(b'\0', b' ').decode('utf-8', 'replace').strip()
+        with open(PROC / "uptime", 'r', encoding='ascii') as f:
+            system_uptime = float(f.read().split()[0])
+    except (OSError, ValueError):
+        return None
+
+    # Le nom (2e champ) peut contenir des espaces : découper après la parenthèse fermante
+    name = stat[stat.index('(') + 1:stat.rindex(')')]
+    fields = stat[stat.rindex(')') + 2:].split()
+    # fields[0] est le champ 3 (state) de proc(5)
+    utime, stime = int(fields[11]), int(fields[12])
+    threads = int(fields[17])
+    start_ticks = int(fields[19])
+
+    open_fds: Optional[int]
+    try:
+        open_fds = len(os.listdir(base / "fd"))
+    except OSError:
+        open_fds = None
+
+    fd_limit: Optional[int] = None
+    try:
+        for line in (base / "limits").read_text().splitlines():
+            if line.startswith("Max open files"):
+                soft = line[len("Max open files"):].split()[0]
+                fd_limit = int(soft) if soft.isdigit() else None
+    except OSError:
+        pass
+
+    return ProcessStats(
+        pid=pid,
+        name=name,
+        cmdline=cmdline,
+        rss_bytes=_status_kb(status, 'VmRSS') or 0,
+        rss_peak_bytes=_status_kb(status, 'VmHWM'),
+        rss_anon_bytes=_status_kb(status, 'RssAnon'),
+        cpu_seconds=(utime + stime) / clock_ticks,
+        threads=threads,
+        open_fds=open_fds,
+        fd_limit=fd_limit,
+        uptime_seconds=max(0.0, system_uptime - start_ticks / clock_ticks),
+    )
+
+
+def format_bytes(size: Optional[int]) -> str:
+    """Taille lisible (Ko, Mo, Go)."""
+    if size is None:
+        return "N/A"
+    value = float(size)
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if value < 1024 or unit == "Go":
+            return f"{value:.0f} {unit}" if unit == "o" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} Go"
+
+
+def format_duration(seconds: float) -> str:
+    """Durée lisible (ex: 2 j 03 h, 1 h 05 min, 42 s)."""
+    seconds = int(seconds)
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    if days:
+        return f"{days} j {hours:02d} h"
+    if hours:
+        return f"{hours} h {minutes:02d} min"
+    if minutes:
+        return f"{minutes} min {secs:02d} s"
+    return f"{secs} s"
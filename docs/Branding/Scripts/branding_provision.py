@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Provisionnement des tenants de branding - EB-Vision 2.0
+=======================================================
+
+Construction d'une configuration à partir de config/branding/client-template.json
+(compilé une fois par branding_template, sans aucune saisie), et création en
+masse depuis un fichier CSV ou JSONL :
+
+    id,name,tagline,primary_color,phone
+    acme,ACME CONSEIL,Audit et Conseil,#0d47a1,+33 1 23 45 67 89
+
+Chaque ligne valide produit config/branding/<id>.json et le dossier
+public/assets/brands/<id>/. Les lignes sont traitées en parallèle ; une ligne
+en erreur n'empêche pas les autres d'être créées.
+"""
+
+import re
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from branding_template import SubstitutionPlan, compile_template_file
+
+TEMPLATE_ID = "client-template"
+DEFAULT_TAGLINE = "Solution de Gestion d'Entreprise"
+DEFAULT_PRIMARY_COLOR = "#2c3e50"
+
+_CONFIG_ID = re.compile(r'^[a-z0-9-]+$')
+_HEX_COLOR = re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+
+# Noms de colonnes acceptés pour chaque champ
+FIELD_ALIASES = {
+    'id': ('id', 'config_id'),
+    'name': ('name', 'app_name'),
+    'tagline': ('tagline',),
+    'primary_color': ('primary_color', 'primary', 'color'),
+    'phone': ('phone',),
+}
+
+# Couleurs de remplacement des placeholders #YOUR_<NOM>_COLOR non fournis
+DEFAULT_COLORS = {
+    'secondary_color': '#34495e',
+    'accent_color': '#3498db',
+    'dark_color': '#1a252f',
+    'light_color': '#ecf0f1',
+}
+
+
+def load_template(root: Path) -> Optional[SubstitutionPlan]:
+    """Compile client-template.json en plan de substitution (None s'il n'existe pas)."""
+    template_file = root / "config" / "branding" / f"{TEMPLATE_ID}.json"
+    if not template_file.exists():
+        return None
+    return compile_template_file(template_file)
+
+
+def template_variables(config_id: str, app_name: str, tagline: str,
+                       primary_color: str, **extra: str) -> Dict[str, str]:
+    """Variables disponibles pour les placeholders du template."""
+    variables = dict(DEFAULT_COLORS)
+    variables.update({
+        'config_id': config_id,
+        'app_name': app_name,
+        'short_name': ''.join([w[0] for w in app_name.split()]).upper(),
+        'tagline': tagline,
+        'domain': config_id.lower().replace('-', '').replace('_', ''),
+        'primary_color': primary_color,
+    })
+    variables.update({key: value for key, value in extra.items() if value})
+    return variables
+
+
+def build_configuration(plan: SubstitutionPlan, config_id: str, app_name: str,
+                        tagline: str, primary_color: str,
+                        **extra: str) -> Tuple[Dict, List[str]]:
+    """
+    Construit la configuration d'un tenant à partir du template compilé.
+    Retourne (configuration, placeholders restés sans valeur).
+    """
+    variables = template_variables(config_id, app_name, tagline, primary_color, **extra)
+    config, missing = plan.render(variables)
+    config['id'] = config_id
+    return config, missing
+
+
+def write_configuration(root: Path, config_id: str, config: Dict, exclusive: bool = False):
+    """
+    Écrit config/branding/<id>.json. En mode exclusif, échoue (FileExistsError)
+    si le fichier existe déjà.
+    """
+    config_file = root / "config" / "branding" / f"{config_id}.json"
+    with open(config_file, 'x' if exclusive else 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+
+
+def create_assets_dir(root: Path, config_id: str, app_name: str) -> bool:
+    """Crée public/assets/brands/<id>/ et son README. Retourne False s'il existait."""
+    assets_dir = root / "public" / "assets" / "brands" / config_id
+    if assets_dir.exists():
+        return False
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    readme = assets_dir / "README.md"
+    with open(readme, 'w', encoding='utf-8') as f:
+        f.write(f"# Assets pour {app_name}\n\n")
+        f.write("Placez ici vos fichiers de logos et icônes personnalisés:\n\n")
+        f.write("- `logo.svg` ou `logo.png` : Logo principal\n")
+        f.write("- `favicon.ico` : Icône du navigateur\n\n")
+        f.write("Ou déposez un seul logo haute résolution dans `source/` puis lancez\n")
+        f.write(f"`python docs/Branding/Scripts/branding.py build-logos {config_id} --update-config` :\n")
+        f.write("favicon.ico et les logos PNG/WebP aux bonnes tailles sont générés.\n")
+    return True
+
+
+@dataclass
+class BatchRow:
+    """Ligne du fichier de provisionnement."""
+    line: int
+    config_id: str
+    app_name: str
+    tagline: str
+    primary_color: str
+    phone: str = ''
+
+
+@dataclass
+class BatchResult:
+    """Résultat du traitement d'une ligne."""
+    line: int
+    config_id: str
+    ok: bool
+    message: str
+
+
+def _field(record: Dict, name: str) -> str:
+    for alias in FIELD_ALIASES[name]:
+        value = record.get(alias)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ''
+
+
+def read_batch_file(path: Path) -> Tuple[List[BatchRow], List[BatchResult]]:
+    """
+    Lit un fichier CSV (en-tête obligatoire) ou JSONL (un objet par ligne).
+    Retourne (lignes, erreurs de lecture).
+    """
+    records: List[Tuple[int, Dict]] = []
+    errors: List[BatchResult] = []
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    errors.append(BatchResult(line_number, '', False, f"JSON invalide: {e.msg}"))
+                    continue
+                if not isinstance(record, dict):
+                    errors.append(BatchResult(line_number, '', False, "Objet JSON attendu"))
+                    continue
+                records.append((line_number, record))
+        else:
+            reader = csv.DictReader(f)
+            for record in reader:
+                records.append((reader.line_num, record))
+
+    rows = []
+    for line_number, record in records:
+        config_id = _field(record, 'id').lower()
+        app_name = _field(record, 'name') or config_id.upper().replace('-', ' ')
+        rows.append(BatchRow(
+            line=line_number,
+            config_id=config_id,
+            app_name=app_name,
+            tagline=_field(record, 'tagline') or DEFAULT_TAGLINE,
+            primary_color=_field(record, 'primary_color') or DEFAULT_PRIMARY_COLOR,
+            phone=_field(record, 'phone'),
+        ))
+    return rows, errors
+
+
+def validate_rows(root: Path, rows: List[BatchRow]) -> Tuple[List[BatchRow], List[BatchResult]]:
+    """Sépare les lignes valides des lignes en erreur (ID, doublons, couleur)."""
+    branding_dir = root / "config" / "branding"
+    valid: List[BatchRow] = []
+    errors: List[BatchResult] = []
+    seen: Dict[str, int] = {}
+
+    for row in rows:
+        if not row.config_id:
+            message = "ID manquant"
+        elif not _CONFIG_ID.match(row.config_id):
+            message = "ID invalide - lettres minuscules, chiffres et tirets uniquement"
+        elif row.config_id == TEMPLATE_ID:
+            message = "ID réservé au template"
+        elif row.config_id in seen:
+            message = f"Doublon de la ligne {seen[row.config_id]}"
+        elif (branding_dir / f"{row.config_id}.json").exists():
+            message = "La configuration existe déjà"
+        elif not _HEX_COLOR.match(row.primary_color):
+            message = f"Couleur primaire invalide: {row.primary_color}"
+        else:
+            message = None
+
+        if message:
+            errors.append(BatchResult(row.line, row.config_id, False, message))
+        else:
+            valid.append(row)
+        if row.config_id and row.config_id not in seen:
+            seen[row.config_id] = row.line
+    return valid, errors
+
+
+def provision_row(root: Path, plan: SubstitutionPlan, row: BatchRow, dry_run: bool = False) -> BatchResult:
+    """Crée la configuration et le dossier d'assets d'une ligne."""
+    try:
+        config, missing = build_configuration(plan, row.config_id, row.app_name,
+                                               row.tagline, row.primary_color, phone=row.phone)
+        note = f" - placeholders restants: {', '.join(missing)}" if missing else ""
+        if dry_run:
+            return BatchResult(row.line, row.config_id, True, f"serait créé ({row.app_name}){note}")
+        write_configuration(root, row.config_id, config, exclusive=True)
+        create_assets_dir(root, row.config_id, row.app_name)
+        return BatchResult(row.line, row.config_id, True, f"créé ({row.app_name}){note}")
+    except FileExistsError:
+        return BatchResult(row.line, row.config_id, False, "La configuration existe déjà")
+    except Exception as e:
+        return BatchResult(row.line, row.config_id, False, str(e))
+
+
+def provision_batch(root: Path, path: Path, dry_run: bool = False,
+                    workers: Optional[int] = None) -> List[BatchResult]:
+    """
+    Provisionne tous les tenants d'un fichier CSV/JSONL.
+    Retourne un résultat par ligne, dans l'ordre du fichier.
+    """
+    plan = load_template(root)
+    if plan is None:
+        raise FileNotFoundError(f"Template introuvable: config/branding/{TEMPLATE_ID}.json")
+
+    rows, results = read_batch_file(path)
+    valid, errors = validate_rows(root, rows)
+    results.extend(errors)
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results.extend(pool.map(lambda row: provision_row(root, plan, row, dry_run), valid))
+
+    return sorted(results, key=lambda result: result.line)
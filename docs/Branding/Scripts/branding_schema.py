@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validation des configurations de branding - EB-Vision 2.0
+=========================================================
+
+Le schéma config/branding.schema.json (sous-ensemble de JSON Schema draft-07)
+est compilé une seule fois en un arbre de fonctions de validation, puis
+réutilisé pour chaque fichier : aucune interprétation du schéma n'a lieu
+pendant la validation.
+
+Mots-clés pris en charge : type, required, properties, additionalProperties,
+items, enum, pattern, minLength, minItems et $ref (#/definitions/...). Un
+mot-clé inconnu fait échouer la compilation plutôt que d'être ignoré.
+
+Chaque violation est rapportée avec son chemin JSON ; les placeholders du
+template (#YOUR_PRIMARY_COLOR...) sont signalés comme tels.
+"""
+
+import re
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCHEMA_FILENAME = "branding.schema.json"
+
+# Mots-clés purement descriptifs
+_ANNOTATIONS = {'$schema', '$id', 'title', 'description', 'definitions', '$comment', 'default', 'examples'}
+
+_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'boolean': bool,
+    'null': type(None),
+}
+
+_PLACEHOLDER = re.compile(r'#?YOUR_[A-Z_]+')
+
+
+@dataclass
+class Violation:
+    """Écart au schéma."""
+    path: str
+    message: str
+
+
+# Chemin chaîné (parent, clé) : construit sans coût pendant le parcours,
+# mis en forme uniquement lorsqu'une violation est rapportée
+Location = Optional[Tuple[object, object]]
+Validator = Callable[[object, Location, List[Violation]], None]
+
+
+def format_path(location: Location) -> str:
+    """Chemin lisible (ex: branding.colors.primary, localization.availableLanguages[0])."""
+    keys = []
+    while location is not None:
+        location, key = location
+        keys.append(key)
+    text = ''
+    for key in reversed(keys):
+        text += f'[{key}]' if isinstance(key, int) else (f'.{key}' if text else str(key))
+    return text or '(racine)'
+
+
+def _type_name(value) -> str:
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    for name, python_type in _TYPES.items():
+        if isinstance(value, python_type):
+            return name
+    return type(value).__name__
+
+
+def _check_type(expected: str) -> Callable[[object], bool]:
+    if expected == 'number':
+        return lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
+    if expected == 'integer':
+        return lambda v: isinstance(v, int) and not isinstance(v, bool)
+    if expected not in _TYPES:
+        raise ValueError(f"Type de schéma non pris en charge: {expected}")
+    python_type = _TYPES[expected]
+    # bool n'hérite que de int : object/array/string/boolean/null sont sûrs
+    return lambda v: isinstance(v, python_type)
+
+
+class SchemaCompiler:
+    """Compile un schéma en fonctions de validation."""
+
+    def __init__(self, schema: Dict):
+        self.definitions = schema.get('definitions', {})
+        self._refs: Dict[str, Validator] = {}
+
+    def compile(self, node: Dict) -> Validator:
+        unknown = set(node) - _ANNOTATIONS - {
+            'type', 'required', 'properties', 'additionalProperties',
+            'items', 'enum', 'pattern', 'minLength', 'minItems', '$ref'}
+        if unknown:
+            raise ValueError(f"Mots-clés de schéma non pris en charge: {', '.join(sorted(unknown))}")
+
+        if '$ref' in node:
+            return self._ref(node['$ref'])
+
+        checks: List[Validator] = []
+        if 'enum' in node:
+            checks.append(self._enum(node['enum']))
+        if 'pattern' in node or 'minLength' in node:
+            checks.append(self._string(node.get('pattern'), node.get('minLength')))
+        if any(k in node for k in ('required', 'properties', 'additionalProperties')):
+            checks.append(self._object(node))
+        if 'items' in node or 'minItems' in node:
+            checks.append(self._array(node))
+
+        expected = node.get('type')
+        if expected:
+            # Inutile de poursuivre si le type est faux (une seule violation)
+            type_ok, label = self._type(expected)
+
+            def validate(value, path, out):
+                if not type_ok(value):
+                    out.append(Violation(format_path(path), f"type attendu: {label} (reçu: {_type_name(value)})"))
+                    return
+                for check in checks:
+                    check(value, path, out)
+            return validate
+
+        def validate(value, path, out):
+            for check in checks:
+                check(value, path, out)
+        return validate
+
+    def _ref(self, ref: str) -> Validator:
+        prefix = '#/definitions/'
+        if not ref.startswith(prefix) or ref[len(prefix):] not in self.definitions:
+            raise ValueError(f"Référence de schéma introuvable: {ref}")
+        if ref not in self._refs:
+            # Entrée provisoire : autorise les définitions récursives
+            holder: List[Validator] = []
+            self._refs[ref] = lambda value, path, out: holder[0](value, path, out)
+            holder.append(self.compile(self.definitions[ref[len(prefix):]]))
+            self._refs[ref] = holder[0]
+        return self._refs[ref]
+
+    def _type(self, expected) -> Tuple[Callable[[object], bool], str]:
+        names = expected if isinstance(expected, list) else [expected]
+        predicates = [_check_type(name) for name in names]
+        if len(predicates) == 1:
+            return predicates[0], names[0]
+        return (lambda value: any(predicate(value) for predicate in predicates)), ' | '.join(names)
+
+    def _enum(self, allowed: List) -> Validator:
+        def validate(value, path, out):
+            if value not in allowed:
+                out.append(Violation(format_path(path), f"valeur non autorisée: {value!r}"))
+        return validate
+
+    def _string(self, pattern: Optional[str], min_length: Optional[int]) -> Validator:
+        regex = re.compile(pattern) if pattern else None
+
+        def validate(value, path, out):
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                out.append(Violation(format_path(path), "valeur vide" if min_length == 1 else f"longueur minimale: {min_length}"))
+            elif regex and not regex.search(value):
+                if _PLACEHOLDER.search(value):
+                    out.append(Violation(format_path(path), f"placeholder non remplacé: {value}"))
+                else:
+                    out.append(Violation(format_path(path), f"valeur invalide: {value!r} (motif {pattern})"))
+        return validate
+
+    def _object(self, node: Dict) -> Validator:
+        required = tuple(node.get('required', ()))
+        properties = {key: self.compile(sub) for key, sub in node.get('properties', {}).items()}
+        additional = node.get('additionalProperties', True)
+        if isinstance(additional, dict):
+            additional = self.compile(additional)
+
+        def validate(value, path, out):
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    out.append(Violation(format_path((path, key)), "champ requis manquant"))
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, (path, key), out)
+                elif additional is False:
+                    out.append(Violation(format_path((path, key)), "champ non prévu par le schéma"))
+                elif additional is not True:
+                    additional(item, (path, key), out)
+        return validate
+
+    def _array(self, node: Dict) -> Validator:
+        items = self.compile(node['items']) if 'items' in node else None
+        min_items = node.get('minItems')
+
+        def validate(value, path, out):
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                out.append(Violation(format_path(path), f"au moins {min_items} élément(s) attendu(s)"))
+            if items is not None:
+                for index, item in enumerate(value):
+                    items(item, (path, index), out)
+        return validate
+
+
+class BrandingValidator:
+    """Validateur compilé, réutilisable pour un nombre quelconque de fichiers."""
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self._validate = SchemaCompiler(schema).compile(schema)
+
+    def validate(self, config) -> List[Violation]:
+        """Retourne toutes les violations (liste vide si la configuration est conforme)."""
+        violations: List[Violation] = []
+        self._validate(config, None, violations)
+        return violations
+
+    def validate_file(self, path: Path) -> List[Violation]:
+        """
+        Lit et valide un fichier (une erreur de lecture devient une violation).
+        Une configuration qui hérite d'un parent (extends) est validée résolue.
+        """
+        from branding_compile import EXTENDS_KEY, load_config_file
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            if isinstance(config, dict) and EXTENDS_KEY in config:
+                config = load_config_file(path)
+        except json.JSONDecodeError as e:
+            return [Violation('(racine)', f"JSON invalide: {e.msg} (ligne {e.lineno}, colonne {e.colno})")]
+        except OSError as e:
+            return [Violation('(racine)', f"lecture impossible: {e}")]
+        except ValueError as e:
+            return [Violation(EXTENDS_KEY, str(e))]
+        return self.validate(config)
+
+
+_VALIDATOR_CACHE: Dict[Path, Tuple[Tuple[int, int], BrandingValidator]] = {}
+
+
+def schema_path(root: Path) -> Path:
+    """Emplacement du schéma (config/branding.schema.json)."""
+    return root / "config" / SCHEMA_FILENAME
+
+
+def load_validator(root: Path) -> BrandingValidator:
+    """Compile le schéma du projet (mis en cache tant qu'il n'est pas modifié)."""
+    path = schema_path(root)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _VALIDATOR_CACHE.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        validator = BrandingValidator(json.load(f))
+    _VALIDATOR_CACHE[path] = (signature, validator)
+    return validator
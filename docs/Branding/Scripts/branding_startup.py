@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temps de démarrage des commandes de branding - EB-Vision 2.0
+============================================================
+
+Lance chaque commande de branding.py plusieurs fois dans un nouveau
+processus et mesure son temps total (interpréteur, imports, exécution).
+
+Le démarrage de l'interpréteur seul (python -c pass) est mesuré à part : il
+dépend de l'installation Python (fichiers .pth de site-packages...) et non
+des scripts. Le budget s'applique au surcoût propre de chaque commande : son
+temps minimal moins celui de l'interpréteur seul (le minimum est la mesure
+la moins sensible à la charge de la machine). Les scripts sont compilés
+(.pyc) avant la mesure, comme ils le sont après la première exécution sur
+un hôte de déploiement.
+
+Usage:
+    python branding.py startup [options] [commande ...]
+
+Options:
+    --budget MS   Surcoût maximal accepté par commande (défaut: 50)
+    --runs N      Exécutions mesurées par commande (défaut: 10)
+    -j, --json    Résultat au format JSON
+
+Sans commande, mesure : --help, list, verify --help et validate. Une commande
+avec options se passe entre guillemets ("list --sort name"). Le code de
+sortie vaut 1 si une commande dépasse le budget.
+"""
+
+import sys
+import json
+import time
+import argparse
+import compileall
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from branding_common import Colors
+
+DEFAULT_COMMANDS = ["--help", "list", "verify --help", "validate"]
+DEFAULT_BUDGET_MS = 50.0
+
+CLI = Path(__file__).resolve().parent / "branding.py"
+
+
+def measure(argv: List[str], runs: int) -> List[float]:
+    """Durées (ms) de `runs` exécutions, après une exécution de chauffe (.pyc, cache disque)."""
+    timings = []
+    for index in range(runs + 1):
+        start = time.perf_counter()
+        subprocess.run(argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        if index:
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_benchmark(commands: List[str], runs: int, budget_ms: float) -> Dict:
+    """Mesure l'interpréteur seul puis chaque commande."""
+    # Sans .pyc (PYTHONDONTWRITEBYTECODE...), chaque lancement recompilerait les scripts
+    compileall.compile_dir(str(CLI.parent), maxlevels=0, quiet=1)
+    baseline = min(measure([sys.executable, "-c", "pass"], runs))
+    results = []
+    for command in commands:
+        timings = measure([sys.executable, str(CLI), *command.split()], runs)
+        overhead = max(0.0, min(timings) - baseline)
+        results.append({
+            'command': command,
+            'min_ms': round(min(timings), 1),
+            'median_ms': round(statistics.median(timings), 1),
+            'overhead_ms': round(overhead, 1),
+            'ok': overhead <= budget_ms,
+        })
+    return {
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'budget_ms': budget_ms,
+        'interpreter_ms': round(baseline, 1),
+        'commands': results,
+        'ok': all(result['ok'] for result in results),
+    }
+
+
+def print_report(report: Dict):
+    """Affiche le rapport."""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'TEMPS DE DÉMARRAGE - BRANDING.PY'.center(70)}{Colors.ENDC}")
+    print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+
+    print(f"{Colors.BOLD}Python:{Colors.ENDC} {report['python']} "
+          f"({report['runs']} exécutions par commande)")
+    print(f"{Colors.BOLD}Interpréteur seul:{Colors.ENDC} {report['interpreter_ms']:.1f} ms (minimum)")
+    print(f"{Colors.BOLD}Budget:{Colors.ENDC} {report['budget_ms']:.0f} ms de surcoût par commande\n")
+
+    print(f"{Colors.BOLD}{'Commande':<24} {'min':>9} {'médiane':>9} {'surcoût':>9}  Statut{Colors.ENDC}")
+    for result in report['commands']:
+        status = f"{Colors.GREEN}✓ OK{Colors.ENDC}" if result['ok'] else f"{Colors.RED}✗ HORS BUDGET{Colors.ENDC}"
+        print(f"{result['command']:<24} {result['min_ms']:>6.1f} ms {result['median_ms']:>6.1f} ms "
+              f"{result['overhead_ms']:>6.1f} ms  {status}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="branding.py startup",
+                                     description="Temps de démarrage des commandes de branding")
+    parser.add_argument('commands', nargs='*', help="Commandes à mesurer (défaut: --help, list, verify --help, validate)")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('-j', '--json', action='store_true')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la mesure."""
+    args = build_parser().parse_args(argv)
+    report = run_benchmark(args.commands or DEFAULT_COMMANDS, max(1, args.runs), args.budget)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 0 if report['ok'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
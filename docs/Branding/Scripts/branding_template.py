@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de substitution du template client - EB-Vision 2.0
+=========================================================
+
+client-template.json est compilé une seule fois en un plan de substitution :
+la liste des chemins JSON dont la valeur contient des placeholders, chaque
+valeur étant découpée en segments (texte fixe / variable). Les placeholders
+sont recherchés dans toutes les chaînes du template, quelle que soit la
+section : un nouveau placeholder ajouté au template est pris en compte dès
+qu'il correspond à un motif de PLACEHOLDERS. La détection reste limitée à
+cette liste : une chaîne qui ressemble à un texte à personnaliser (motifs de
+TEMPLATE_HINTS, ex. "Description de votre entreprise") sans correspondre à
+aucun motif est signalée dans SubstitutionPlan.unmatched et dans les
+placeholders non résolus de render(), jamais substituée.
+
+Appliquer le plan à un dictionnaire de variables est une seule passe
+linéaire sur les entrées du plan : seuls les conteneurs situés sur le chemin
+d'une substitution sont copiés (copie superficielle), le reste de la
+configuration produite est partagé avec le template compilé.
+"""
+
+import re
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+PathKey = Union[str, int]
+
+# Motif -> nom de variable (ou fonction du match retournant ce nom).
+# Les motifs les plus longs d'abord : l'alternance s'arrête au premier trouvé.
+PLACEHOLDERS: List[Tuple[str, Union[str, Callable[[re.Match], str]]]] = [
+    (r'\[CLIENT-ID\]', 'config_id'),
+    (r'\[NOM\]', 'app_name'),
+    (r'NOM_CLIENT', 'app_name'),
+    (r'\bSIGLE\b', 'short_name'),
+    (r'#YOUR_(?P<color>[A-Z]+)_COLOR', lambda m: f"{m.group('color').lower()}_color"),
+    (r'VOTRE TITRE', 'app_name'),
+    (r'Votre slogan personnalisé', 'tagline'),
+    (r'Votre sous-titre', 'tagline'),
+    (r'Nom de votre entreprise', 'app_name'),
+    (r'Votre Entreprise', 'app_name'),
+    (r'votre-entreprise', 'domain'),
+    (r'\+33 X XX XX XX XX', 'phone'),
+]
+
+# Textes d'exemple qui appellent une personnalisation. Une chaîne du template
+# qui en contient un sans correspondre à PLACEHOLDERS est signalée.
+TEMPLATE_HINTS = re.compile(
+    r'[Vv]otre (?:entreprise|société|client|slogan|titre)|YOUR_|\bX{2}\b|\[[A-Z][A-Z-]*\]|_CLIENT\b'
+)
+
+_PATTERN = re.compile('|'.join(f'(?P<p{i}>{pattern})' for i, (pattern, _) in enumerate(PLACEHOLDERS)))
+
+
+def _variable_for(match: re.Match) -> str:
+    resolver = PLACEHOLDERS[int(match.lastgroup[1:])][1]
+    return resolver(match) if callable(resolver) else resolver
+
+
+def find_placeholders(value: str) -> List[str]:
+    """Placeholders du template encore présents dans une chaîne."""
+    return [match.group(0) for match in _PATTERN.finditer(value)]
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    """Valeur du template contenant au moins un placeholder."""
+    path: Tuple[PathKey, ...]
+    # (est_variable, texte fixe ou nom de variable)
+    segments: Tuple[Tuple[bool, str], ...]
+    # Texte d'origine de chaque variable (conservé si la variable manque)
+    tokens: Tuple[str, ...]
+
+    @property
+    def dotted_path(self) -> str:
+        """Chemin lisible (ex: branding.colors.primary, localization.availableLanguages[0])."""
+        text = ''
+        for key in self.path:
+            text += f'[{key}]' if isinstance(key, int) else (f'.{key}' if text else key)
+        return text
+
+    def render(self, variables: Dict[str, str], missing: List[str]) -> str:
+        parts = []
+        token_index = 0
+        for is_variable, text in self.segments:
+            if not is_variable:
+                parts.append(text)
+                continue
+            value = variables.get(text)
+            if value is None:
+                parts.append(self.tokens[token_index])
+                missing.append(f"{self.dotted_path} ({text})")
+            else:
+                parts.append(value)
+            token_index += 1
+        return ''.join(parts)
+
+
+def _compile_string(path: Tuple[PathKey, ...], value: str) -> Optional[PlanEntry]:
+    segments: List[Tuple[bool, str]] = []
+    tokens: List[str] = []
+    position = 0
+    for match in _PATTERN.finditer(value):
+        if match.start() > position:
+            segments.append((False, value[position:match.start()]))
+        segments.append((True, _variable_for(match)))
+        tokens.append(match.group(0))
+        position = match.end()
+    if not tokens:
+        return None
+    if position < len(value):
+        segments.append((False, value[position:]))
+    return PlanEntry(path, tuple(segments), tuple(tokens))
+
+
+class SubstitutionPlan:
+    """Template compilé : squelette JSON + liste des substitutions."""
+
+    def __init__(self, template: Dict):
+        self.template = template
+        self.entries: List[PlanEntry] = []
+        # Chemins des chaînes à personnaliser qu'aucun motif ne reconnaît
+        self.unmatched: List[str] = []
+        self._compile(template, ())
+
+    def _compile(self, node, path: Tuple[PathKey, ...]):
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            return
+        for key, value in items:
+            if isinstance(value, str):
+                entry = _compile_string(path + (key,), value)
+                if entry:
+                    self.entries.append(entry)
+                elif TEMPLATE_HINTS.search(value) and not str(key).startswith('_'):
+                    self.unmatched.append(PlanEntry(path + (key,), (), ()).dotted_path)
+            else:
+                self._compile(value, path + (key,))
+
+    @property
+    def variables(self) -> Set[str]:
+        """Noms de toutes les variables utilisées par le template."""
+        return {text for entry in self.entries for is_variable, text in entry.segments if is_variable}
+
+    def render(self, variables: Dict[str, str]) -> Tuple[Dict, List[str]]:
+        """
+        Applique le plan. Retourne (configuration, placeholders non résolus) ;
+        un placeholder sans variable est laissé tel quel dans la valeur, une
+        chaîne de unmatched est signalée "(non reconnu)".
+
+        Seuls les conteneurs sur le chemin d'une substitution sont copiés : les
+        autres sous-arbres sont ceux du template, à ne pas modifier en place.
+        """
+        data = dict(self.template)
+        # id des conteneurs déjà copiés pour ce rendu
+        copied = {id(data)}
+        missing: List[str] = []
+        for entry in self.entries:
+            parent = data
+            for key in entry.path[:-1]:
+                child = parent[key]
+                if id(child) not in copied:
+                    child = list(child) if isinstance(child, list) else dict(child)
+                    parent[key] = child
+                    copied.add(id(child))
+                parent = child
+            parent[entry.path[-1]] = entry.render(variables, missing)
+        missing.extend(f"{path} (non reconnu)" for path in self.unmatched)
+        return data, missing
+
+
+_PLAN_CACHE: Dict[Path, Tuple[Tuple[int, int], SubstitutionPlan]] = {}
+
+
+def compile_template_file(template_file: Path) -> SubstitutionPlan:
+    """Compile un fichier template (mis en cache tant qu'il n'est pas modifié)."""
+    stat = template_file.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _PLAN_CACHE.get(template_file)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(template_file, 'r', encoding='utf-8') as f:
+        plan = SubstitutionPlan(json.load(f))
+    _PLAN_CACHE[template_file] = (signature, plan)
+    return plan
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thèmes CSS précompilés par tenant - EB-Vision 2.0
+=================================================
+
+Génère, à partir de config/branding/<id>.json, une feuille de style statique
+config/themes/brands/brand-<id>.css contenant toutes les variables --brand-*
+ainsi que les jetons calculés par branding_palette.py : variantes
+claires/foncées (même calcul que adjustColorBrightness dans
+public/js/branding-loader.js) et couleur de texte lisible sur chaque couleur
+de marque (--brand-<clé>-contrast).
+
+La copie brand-active.css correspond au tenant actif (BRAND_CONFIG) : les
+pages la chargent juste après brand-variables.css, et branding-loader.js
+n'applique plus les couleurs au runtime lorsqu'elles sont déjà en place.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from branding_palette import COLOR_KEYS, Palette, audit_colors, compute_palettes, describe, is_hex_color
+
+THEMES_DIRNAME = "brands"
+ACTIVE_THEME_FILENAME = "brand-active.css"
+
+
+def theme_variables(config: Dict, palette: Optional[Palette] = None) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Calcule les variables CSS d'une configuration : couleurs de marque puis
+    jetons de la palette (variantes, couleurs de texte). `palette` évite de
+    la recalculer lorsqu'elle provient d'un calcul groupé.
+    Retourne (variables, avertissements).
+    """
+    colors = config.get('branding', {}).get('colors', {}) or {}
+    if palette is None:
+        palette = audit_colors(colors)
+    variables: Dict[str, str] = {}
+    warnings: List[str] = []
+
+    for key in COLOR_KEYS:
+        value = colors.get(key)
+        if value is None:
+            continue
+        if not is_hex_color(value):
+            warnings.append(f"branding.colors.{key}: couleur invalide '{value}' (ignorée)")
+            continue
+        variables[f"--brand-{key}"] = value
+
+    variables.update(palette.tokens)
+    warnings += [describe(issue) for issue in palette.issues]
+    return variables, warnings
+
+
+def render_theme_css(brand_id: str, variables: Dict[str, str]) -> str:
+    """Produit le contenu de la feuille de style."""
+    lines = [
+        "/**",
+        f" * Thème précompilé du branding '{brand_id}'",
+        " * Généré par docs/Branding/Scripts/configure_branding.py --build-theme",
+        " * NE PAS MODIFIER : éditer config/branding/<id>.json puis régénérer",
+        " */",
+        "",
+        ":root {",
+        f"    --brand-theme: \"{brand_id}\";",
+    ]
+    lines += [f"    {name}: {value};" for name, value in variables.items()]
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def themes_dir(root: Path) -> Path:
+    """Dossier des thèmes générés (servi sous /config/themes/brands/)."""
+    return root / "config" / "themes" / THEMES_DIRNAME
+
+
+def read_config(root: Path, brand_id: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """Lit config/branding/<id>.json (héritage résolu). Retourne (configuration, erreur)."""
+    from branding_compile import load_config
+    try:
+        return load_config(root / "config" / "branding", brand_id), None
+    except (OSError, ValueError) as e:
+        return None, f"Lecture impossible de {brand_id}.json: {e}"
+
+
+def write_theme(root: Path, brand_id: str, config: Dict,
+                palette: Optional[Palette] = None) -> Tuple[Path, List[str]]:
+    """Écrit brand-<id>.css (seulement si son contenu change)."""
+    variables, warnings = theme_variables(config, palette)
+    output_dir = themes_dir(root)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output = output_dir / f"brand-{brand_id}.css"
+    css = render_theme_css(brand_id, variables)
+    if not output.exists() or output.read_text(encoding='utf-8') != css:
+        output.write_text(css, encoding='utf-8')
+    return output, warnings
+
+
+def build_theme(root: Path, brand_id: str) -> Tuple[Optional[Path], List[str]]:
+    """
+    Génère brand-<id>.css. Retourne (chemin, avertissements) ; le chemin est
+    None si la configuration est introuvable ou illisible.
+    """
+    config, error = read_config(root, brand_id)
+    if config is None:
+        return None, [error]
+    return write_theme(root, brand_id, config)
+
+
+def build_themes(root: Path, brand_ids: List[str]) -> Dict[str, Tuple[Optional[Path], List[str]]]:
+    """
+    Génère les thèmes de plusieurs tenants : les palettes de tous les tenants
+    sont calculées en une seule passe (compute_palettes).
+    """
+    results: Dict[str, Tuple[Optional[Path], List[str]]] = {}
+    configs: Dict[str, Dict] = {}
+    for brand_id in brand_ids:
+        config, error = read_config(root, brand_id)
+        if config is None:
+            results[brand_id] = (None, [error])
+        else:
+            configs[brand_id] = config
+
+    palettes = compute_palettes({brand_id: config.get('branding', {}).get('colors', {})
+                                 for brand_id, config in configs.items()})
+    for brand_id, config in configs.items():
+        results[brand_id] = write_theme(root, brand_id, config, palettes[brand_id])
+    return {brand_id: results[brand_id] for brand_id in brand_ids}
+
+
+def publish_active_theme(output: Path) -> Path:
+    """Publie un thème généré comme brand-active.css."""
+    active = output.parent / ACTIVE_THEME_FILENAME
+    active.write_text(output.read_text(encoding='utf-8'), encoding='utf-8')
+    return active
+
+
+def write_active_theme(root: Path, brand_id: str) -> Tuple[Optional[Path], List[str]]:
+    """Régénère le thème du tenant et le publie comme brand-active.css."""
+    output, warnings = build_theme(root, brand_id)
+    if output is None:
+        return None, warnings
+    return publish_active_theme(output), warnings
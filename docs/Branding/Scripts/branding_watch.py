@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Surveillance des fichiers de branding - EB-Vision 2.0
+=====================================================
+
+Détecte les modifications de fichiers dans un ensemble de dossiers, pour
+verify_branding.py --watch. Deux implémentations :
+
+- inotify (Linux, via ctypes) : le noyau signale chaque écriture, aucun
+  parcours des dossiers n'est nécessaire ;
+- scrutation (autres systèmes, ou si inotify est indisponible) : comparaison
+  périodique de (mtime, taille) des fichiers surveillés.
+
+Chaque dossier est surveillé sur une profondeur donnée (0 : ses entrées,
+1 : également les entrées de ses sous-dossiers). Les modifications proches
+(un éditeur écrit souvent en plusieurs étapes) sont regroupées en un seul
+lot, restitué lorsque plus rien ne change pendant DEBOUNCE secondes.
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+DEBOUNCE = 0.2
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT = struct.Struct('iIII')
+
+# Dossier surveillé et profondeur
+WatchTarget = Tuple[Path, int]
+
+
+class PollingWatcher:
+    """Détection par comparaison périodique de (mtime, taille)."""
+
+    backend = "scrutation"
+
+    def __init__(self, targets: List[WatchTarget], accept: Callable[[Path], bool],
+                 interval: float = 1.0):
+        self.targets = targets
+        self.accept = accept
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        pending = list(self.targets)
+        while pending:
+            directory, depth = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        path = Path(entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            if depth > 0:
+                                pending.append((path, depth - 1))
+                            continue
+                        if not self.accept(path):
+                            continue
+                        stat = entry.stat()
+                        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """Lots de chemins modifiés, créés ou supprimés (générateur infini)."""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed:
+                yield changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Détection par inotify (Linux)."""
+
+    backend = "inotify"
+
+    def __init__(self, targets: List[WatchTarget], accept: Callable[[Path], bool],
+                 libc: ctypes.CDLL):
+        self.accept = accept
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        # Descripteur de watch -> (dossier, profondeur restante)
+        self._watches: Dict[int, WatchTarget] = {}
+        for directory, depth in targets:
+            self._add(directory, depth)
+
+    def _add(self, directory: Path, depth: int):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            # Dossier absent ou illisible : les autres restent surveillés
+            return
+        self._watches[wd] = (directory, depth)
+        if depth > 0:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            self._add(Path(entry.path), depth - 1)
+            except OSError:
+                pass
+
+    def _read(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # File d'événements saturée : tout ce qui est surveillé est suspect
+                changed.update(self._all_files())
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            target = self._watches.get(wd)
+            if target is None or not name:
+                continue
+            directory, depth = target
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if depth > 0 and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add(path, depth - 1)
+                    changed.update(p for p in self._files_in(path) if self.accept(p))
+                continue
+            if self.accept(path):
+                changed.add(path)
+        return changed
+
+    def _files_in(self, directory: Path) -> List[Path]:
+        try:
+            return [p for p in directory.iterdir() if p.is_file()]
+        except OSError:
+            return []
+
+    def _all_files(self) -> Set[Path]:
+        return {p for directory, _ in self._watches.values()
+                for p in self._files_in(directory) if self.accept(p)}
+
+    def changes(self) -> Iterator[Set[Path]]:
+        """Lots de chemins modifiés, créés ou supprimés (générateur infini)."""
+        while True:
+            batch = self._read(None)
+            if not batch:
+                continue
+            # Attendre que les écritures se calment avant de restituer le lot
+            while True:
+                more = self._read(DEBOUNCE)
+                if not more:
+                    break
+                batch |= more
+            yield batch
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    name = ctypes.util.find_library('c')
+    if not name:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    return libc
+
+
+def open_watcher(targets: List[WatchTarget], accept: Callable[[Path], bool],
+                 interval: float = 1.0, polling: bool = False):
+    """inotify si disponible (et non désactivé), scrutation sinon."""
+    if not polling:
+        libc = _load_libc()
+        if libc is not None:
+            try:
+                return InotifyWatcher(targets, accept, libc)
+            except OSError:
+                pass
+    return PollingWatcher(targets, accept, interval)
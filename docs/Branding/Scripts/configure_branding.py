@@ -22,73 +22,37 @@ Version: 1.0
 import os
 import sys
 import json
-import subprocess
-import platform
+import time
+import signal
 from pathlib import Path
 from typing import Optional, Dict, List
 
-# Codes couleur ANSI
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    CYAN = '\033[96m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
+from branding_catalog import BrandingCatalog, SORT_KEYS
+from branding_compile import compile_brands, descendants, load_config
+from branding_common import (Colors, print_header, print_success, print_error,
+                             print_warning, print_info, get_project_root)
 
-def print_header(text: str):
-    """Affiche un en-tête formaté."""
-    print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
-    print(f"{Colors.CYAN}{Colors.BOLD}{text.center(70)}{Colors.ENDC}")
-    print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
-
-def print_success(text: str):
-    """Affiche un message de succès."""
-    print(f"{Colors.GREEN}✓ {text}{Colors.ENDC}")
-
-def print_error(text: str):
-    """Affiche un message d'erreur."""
-    print(f"{Colors.RED}✗ {text}{Colors.ENDC}")
-
-def print_warning(text: str):
-    """Affiche un avertissement."""
-    print(f"{Colors.YELLOW}⚠ {text}{Colors.ENDC}")
-
-def print_info(text: str):
-    """Affiche une information."""
-    print(f"{Colors.BLUE}ℹ {text}{Colors.ENDC}")
-
-def get_project_root() -> Path:
-    """Retourne la racine du projet."""
-    script_dir = Path(__file__).resolve().parent
-    # Remonter de Scripts/ -> Branding/ -> docs/ -> racine
-    return script_dir.parent.parent.parent
-
-def list_available_configs() -> List[Dict]:
-    """Liste toutes les configurations disponibles."""
+def list_available_configs(filter_text: Optional[str] = None, sort_by: str = 'id') -> List[Dict]:
+    """
+    Liste toutes les configurations disponibles.
+    
+    S'appuie sur le catalogue persistant (config/branding/.catalog.sqlite) :
+    seuls les fichiers modifiés depuis le dernier appel sont relus.
+    """
     root = get_project_root()
     branding_dir = root / "config" / "branding"
     
-    configs = []
-    if branding_dir.exists():
-        for config_file in branding_dir.glob("*.json"):
-            if config_file.stem not in ['client-template']:
-                try:
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        configs.append({
-                            'id': config_file.stem,
-                            'name': data.get('name', 'N/A'),
-                            'file': config_file.name,
-                            'path': str(config_file)
-                        })
-                except Exception as e:
-                    print_warning(f"Impossible de lire {config_file.name}: {e}")
-    
-    return sorted(configs, key=lambda x: x['id'])
+    if not branding_dir.exists():
+        return []
+    
+    catalog = BrandingCatalog(branding_dir)
+    try:
+        catalog.refresh()
+        for broken in catalog.errors():
+            print_warning(f"Impossible de lire {broken['file']}: {broken['error']}")
+        return catalog.query(filter_text=filter_text, sort_by=sort_by)
+    finally:
+        catalog.close()
 
 def display_available_configs(configs: List[Dict]):
     """Affiche les configurations disponibles."""
@@ -149,15 +113,18 @@ def set_config(config_id: str) -> bool:
         print_info(f"Fichier recherché: {config_file}")
         return False
     
-    # Lire et valider le fichier JSON
+    # Lire et valider le fichier JSON (héritage résolu)
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            config_name = config_data.get('name', 'N/A')
+        config_data = load_config(config_file.parent, config_id)
+        config_name = config_data.get('name', 'N/A')
     except Exception as e:
         print_error(f"Erreur lors de la lecture du fichier de configuration: {e}")
         return False
     
+    # Artefacts compilés chargés par le serveur (le tenant et ceux qui en héritent)
+    if not compile_configs([config_id], quiet=True):
+        return False
+    
     # Mettre à jour le fichier .env
     env_vars = read_env_file()
     old_config = env_vars.get('BRAND_CONFIG', 'aucune')
@@ -169,29 +136,160 @@ def set_config(config_id: str) -> bool:
         print_info(f"Ancienne configuration: {old_config}")
         print_info(f"Nouvelle configuration: {config_id}")
         print_info(f"Nom de l'application: {config_name}")
-        return True
     except Exception as e:
         print_error(f"Erreur lors de l'écriture du fichier .env: {e}")
         return False
+    
+    # Publier le thème précompilé du nouveau tenant (brand-active.css)
+    import branding_theme
+    active, warnings = branding_theme.write_active_theme(root, config_id)
+    for warning in warnings:
+        print_warning(warning)
+    if active:
+        print_success(f"Thème CSS actif régénéré: config/themes/{branding_theme.THEMES_DIRNAME}/{active.name}")
+    
+    return True
+
+def find_server_pids() -> List[int]:
+    """
+    PID des processus Node exécutant server.js depuis la racine du projet
+    (Linux uniquement, via /proc). Les autres processus Node ne sont jamais
+    concernés.
+    """
+    root = get_project_root()
+    proc = Path("/proc")
+    pids: List[int] = []
+    if not proc.is_dir():
+        return pids
+    
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            args = [a.decode('utf-8', 'replace')
+                    for a in (entry / "cmdline").read_bytes().split(b'\0') if a]
+            cwd = Path(os.readlink(entry / "cwd"))
+        except OSError:
+            continue
+        if not args or not Path(args[0]).name.startswith('node') or cwd != root:
+            continue
+        if any(Path(arg).name == 'server.js' for arg in args[1:]):
+            pids.append(int(entry.name))
+    return sorted(pids)
+
+def get_server_url() -> str:
+    """URL locale du serveur (PORT du .env, 3000 par défaut)."""
+    port = read_env_file().get('PORT') or os.environ.get('PORT') or '3000'
+    return f"http://localhost:{port}"
+
+def fetch_served_config(base_url: str, timeout: float = 3.0) -> Optional[Dict]:
+    """Configuration actuellement servie par /api/branding/config (None si injoignable)."""
+    import urllib.request
+    
+    try:
+        with urllib.request.urlopen(f"{base_url}/api/branding/config", timeout=timeout) as response:
+            payload = json.loads(response.read().decode('utf-8'))
+    except (OSError, ValueError):
+        return None
+    return payload.get('data') if payload.get('success') else None
+
+def hot_reload_server(config_id: str) -> Optional[bool]:
+    """
+    Applique la configuration au serveur en cours d'exécution, sans redémarrage :
+    SIGHUP aux processus server.js du projet, sinon POST /api/branding/reload
+    (jeton BRANDING_ADMIN_TOKEN). Retourne None si aucun serveur ne répond.
+    """
+    import urllib.error
+    import urllib.request
+    
+    print_header("RECHARGEMENT À CHAUD DU SERVEUR")
+    root = get_project_root()
+    base_url = get_server_url()
+    
+    if fetch_served_config(base_url) is None:
+        print_info(f"Aucun serveur ne répond sur {base_url}")
+        return None
+    
+    # Le serveur sert la configuration résolue (héritage "extends" compris)
+    expected = load_config(root / "config" / "branding", config_id)
+    
+    pids = find_server_pids()
+    if pids and hasattr(signal, 'SIGHUP'):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGHUP)
+            except OSError as e:
+                print_warning(f"Signal impossible vers le PID {pid}: {e}")
+        print_success(f"SIGHUP envoyé au serveur (PID {', '.join(str(p) for p in pids)})")
+    else:
+        token = os.environ.get('BRANDING_ADMIN_TOKEN') or read_env_file().get('BRANDING_ADMIN_TOKEN')
+        if not token:
+            print_warning("Processus serveur introuvable localement et BRANDING_ADMIN_TOKEN non défini")
+            return False
+        request = urllib.request.Request(
+            f"{base_url}/api/branding/reload",
+            data=json.dumps({'brandId': config_id}).encode('utf-8'),
+            headers={'Content-Type': 'application/json', 'Authorization': f"Bearer {token}"},
+            method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=5):
+                pass
+        except urllib.error.HTTPError as e:
+            print_error(f"POST /api/branding/reload refusé: HTTP {e.code}")
+            return False
+        except OSError as e:
+            print_error(f"POST /api/branding/reload impossible: {e}")
+            return False
+        print_success("Rechargement demandé via /api/branding/reload")
+    
+    # Confirmer que la nouvelle configuration est bien servie
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if fetch_served_config(base_url) == expected:
+            print_success(f"Le serveur sert la configuration '{config_id}'")
+            return True
+        time.sleep(0.2)
+    
+    print_error(f"Le serveur ne sert pas la configuration '{config_id}' après rechargement")
+    return False
+
+def apply_to_server(config_id: str):
+    """Recharge le serveur à chaud, ou propose de le (re)démarrer."""
+    status = hot_reload_server(config_id)
+    if status:
+        return
+    
+    if status is None:
+        question = "Voulez-vous démarrer le serveur maintenant? (o/N): "
+    else:
+        question = "Voulez-vous redémarrer le serveur maintenant? (o/N): "
+    print(f"{Colors.BOLD}{question}{Colors.ENDC}", end='')
+    answer = input().strip().lower()
+    
+    if answer in ['o', 'oui', 'y', 'yes']:
+        restart_server()
+    else:
+        print_info("N'oubliez pas de redémarrer le serveur: npm restart")
 
 def restart_server():
-    """Redémarre le serveur Node.js."""
+    """Redémarre le serveur Node.js du projet (les autres processus Node ne sont pas touchés)."""
+    import platform
+    import subprocess
+    
     print_header("REDÉMARRAGE DU SERVEUR")
     
-    system = platform.system()
-    
-    # Arrêter les processus Node existants
-    print_info("Arrêt des processus Node.js existants...")
-    try:
-        if system == "Windows":
-            subprocess.run(["taskkill", "/F", "/IM", "node.exe"], 
-                          capture_output=True, check=False)
-        else:
-            subprocess.run(["pkill", "-f", "node"], 
-                          capture_output=True, check=False)
-        print_success("Processus Node.js arrêtés")
-    except Exception as e:
-        print_warning(f"Impossible d'arrêter les processus Node: {e}")
+    # Arrêter uniquement le serveur de ce projet
+    pids = find_server_pids()
+    if pids:
+        print_info(f"Arrêt du serveur (PID {', '.join(str(p) for p in pids)})...")
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError as e:
+                print_warning(f"Impossible d'arrêter le PID {pid}: {e}")
+        print_success("Serveur arrêté")
+    elif platform.system() == "Windows":
+        print_warning("Arrêtez le serveur en cours (Ctrl+C dans son terminal) avant de continuer")
     
     # Démarrer le serveur
     print_info("Démarrage du serveur...")
@@ -207,12 +305,222 @@ def restart_server():
         print("\n")
         print_info("Serveur arrêté par l'utilisateur")
 
+def build_assets(config_ids: List[str], update_config: bool = False) -> bool:
+    """Construit les assets hachés et précompressés des tenants indiqués."""
+    import branding_assets
+    
+    print_header("CONSTRUCTION DES ASSETS DE BRANDING")
+    root = get_project_root()
+    
+    if branding_assets.brotli is None:
+        print_warning("Module 'brotli' absent : seules les variantes .gz seront produites")
+        print_info("   pip install brotli")
+    
+    for config_id in config_ids:
+        manifest = branding_assets.build_brand_assets(root, config_id)
+        if not manifest:
+            print_warning(f"{config_id}: aucun asset (public/assets/brands/{config_id}/)")
+            continue
+        
+        print_success(f"{config_id}: {len(manifest)} asset(s) → public/assets/brands/{config_id}/dist/")
+        for name, entry in manifest.items():
+            sizes = f"{entry['size']} → {entry['minifiedSize']} octets"
+            if 'gzipSize' in entry:
+                sizes += f", gzip {entry['gzipSize']}"
+            if 'brotliSize' in entry:
+                sizes += f", br {entry['brotliSize']}"
+            print(f"   {name:<20} {entry['url']}  ({sizes})")
+        
+        if update_config:
+            changed = branding_assets.update_config_paths(root, config_id, manifest)
+            if changed:
+                print_success(f"{config_id}.json: branding.logo.{', '.join(changed)} mis à jour")
+    
+    if update_config:
+        return compile_configs(config_ids, quiet=True)
+    return True
+
+def build_logos(config_ids: List[str], source: Optional[str] = None,
+                update_config: bool = False, force: bool = False) -> bool:
+    """Produit favicon et logos dimensionnés (PNG/WebP) depuis le logo source des tenants."""
+    import branding_derivatives
+    
+    print_header("DÉCLINAISONS DES LOGOS")
+    root = get_project_root()
+    
+    if branding_derivatives.Image is None:
+        print_error("Module 'Pillow' absent : aucune image ne peut être produite")
+        print_info("   pip install Pillow")
+        return False
+    
+    source_path = Path(source).resolve() if source else None
+    results = branding_derivatives.build_all(root, config_ids, source_path, force)
+    success = True
+    for result in results:
+        if result.status == 'error':
+            print_error(f"{result.brand_id}: {result.message}")
+            success = False
+            continue
+        if result.status == 'skipped':
+            print_warning(f"{result.brand_id}: {result.message}")
+            continue
+        if result.status == 'unchanged':
+            print_info(f"{result.brand_id}: source inchangée ({result.manifest['source']}), rien à refaire")
+        else:
+            manifest = result.manifest
+            width, height = manifest['sourceSize']
+            print_success(f"{result.brand_id}: {len(result.written)} fichier(s) depuis "
+                          f"{manifest['source']} ({width}×{height})")
+            for context, entry in manifest['contexts'].items():
+                sizes = ", ".join(f"{image['width']}×{image['height']} "
+                                  f"(png {image['pngSize']} o, webp {image['webpSize']} o)"
+                                  for image in entry['images'])
+                print(f"   {context:<8} {sizes}")
+        
+        if update_config:
+            changed = branding_derivatives.update_config_logos(root, result.brand_id, result.manifest)
+            if changed:
+                print_success(f"{result.brand_id}.json: branding.logo.{', '.join(changed)} mis à jour")
+    
+    if update_config:
+        success = compile_configs(config_ids, quiet=True) and success
+    return success
+
+def compile_configs(config_ids: List[str], quiet: bool = False) -> bool:
+    """
+    Régénère les artefacts compilés (config/branding/compiled/) des tenants
+    indiqués et de ceux qui en héritent.
+    """
+    branding_dir = get_project_root() / "config" / "branding"
+    targets = list(dict.fromkeys(config_ids))
+    for config_id in config_ids:
+        targets += sorted(descendants(branding_dir, config_id) - set(targets))
+    if not targets:
+        return True
+    success = True
+    for result in compile_brands(branding_dir, targets):
+        if result.error:
+            print_error(f"{result.brand_id}: {result.error}")
+            success = False
+        elif result.changed or not quiet:
+            print_success(f"{result.brand_id}: config/branding/compiled/{result.brand_id}.json "
+                          f"({' → '.join(result.chain)}, {result.size} octets)")
+    return success
+
+def build_themes(config_ids: List[str]) -> bool:
+    """Génère les thèmes CSS précompilés des tenants indiqués."""
+    import branding_theme
+    
+    print_header("GÉNÉRATION DES THÈMES CSS")
+    root = get_project_root()
+    current = get_current_config() or 'default'
+    success = True
+    
+    # Palettes de tous les tenants calculées en une passe (branding_palette.py)
+    for config_id, (output, warnings) in branding_theme.build_themes(root, config_ids).items():
+        for warning in warnings:
+            print_warning(f"{config_id}: {warning}")
+        if output is None:
+            success = False
+            continue
+        if config_id == current:
+            branding_theme.publish_active_theme(output)
+        print_success(f"{config_id}: config/themes/{branding_theme.THEMES_DIRNAME}/brand-{config_id}.css")
+        if config_id == current:
+            print_info(f"   publié comme {branding_theme.ACTIVE_THEME_FILENAME} (tenant actif)")
+    
+    return success
+
+def build_inline(config_id: str, quiet: bool = False) -> bool:
+    """
+    Contrôle le bloc inliné par server.js dans les pages public/*.html
+    (rien n'est écrit) et retire les blocs laissés par les anciennes versions.
+    """
+    import branding_inline
+    
+    if not quiet:
+        print_header("BRANDING INLINÉ DANS LES PAGES")
+    root = get_project_root()
+    
+    try:
+        pages, block_size = branding_inline.inline_report(root, config_id)
+    except Exception as e:
+        print_error(f"Bloc inliné impossible pour '{config_id}': {e}")
+        return False
+    
+    print_success(f"Branding '{config_id}' inliné à la volée par server.js: {len(pages)} page(s), "
+                  f"bloc de {block_size} octets")
+    cleared = branding_inline.clear_pages(root)
+    if cleared:
+        print_warning(f"{len(cleared)} page(s) contenaient un bloc écrit sur disque (retiré)")
+    if not quiet:
+        for page in cleared:
+            print(f"   public/{page}")
+    return True
+
+def clear_inline() -> bool:
+    """Retire des pages public/*.html les blocs écrits sur disque par les anciennes versions."""
+    import branding_inline
+    
+    print_header("SUPPRESSION DU BRANDING INLINÉ")
+    cleared = branding_inline.clear_pages(get_project_root())
+    print_success(f"{len(cleared)} page(s) nettoyée(s) - bloc inséré par server.js au service")
+    return True
+
+def provision_batch(batch_file: str, dry_run: bool = False, workers: Optional[int] = None) -> bool:
+    """Crée en masse les configurations décrites dans un fichier CSV ou JSONL."""
+    import branding_provision
+    
+    print_header("PROVISIONNEMENT EN MASSE" + (" (SIMULATION)" if dry_run else ""))
+    path = Path(batch_file)
+    if not path.exists():
+        print_error(f"Fichier introuvable: {batch_file}")
+        return False
+    
+    try:
+        results = branding_provision.provision_batch(get_project_root(), path,
+                                                     dry_run=dry_run, workers=workers)
+    except Exception as e:
+        print_error(f"Provisionnement impossible: {e}")
+        return False
+    
+    for result in results:
+        label = f"ligne {result.line:<4} {result.config_id or '-'}"
+        if result.ok:
+            print_success(f"{label}: {result.message}")
+        else:
+            print_error(f"{label}: {result.message}")
+    
+    failed = sum(1 for result in results if not result.ok)
+    print()
+    print_info(f"{len(results) - failed} tenant(s) {'valide(s)' if dry_run else 'créé(s)'}, {failed} ligne(s) en erreur")
+    return failed == 0
+
+def display_template_plan() -> bool:
+    """Affiche le plan de substitution compilé de client-template.json."""
+    import branding_provision
+    
+    print_header("PLAN DE SUBSTITUTION DU TEMPLATE")
+    plan = branding_provision.load_template(get_project_root())
+    if plan is None:
+        print_error("Fichier template introuvable!")
+        return False
+    
+    for entry in plan.entries:
+        variables = [text for is_variable, text in entry.segments if is_variable]
+        print(f"  {entry.dotted_path:<28} {', '.join(entry.tokens)} → {', '.join(variables)}")
+    for path in plan.unmatched:
+        print_warning(f"{path:<28} texte à personnaliser non reconnu par PLACEHOLDERS")
+    print()
+    print_info(f"{len(plan.entries)} valeur(s) à substituer, variables: {', '.join(sorted(plan.variables))}")
+    return True
+
 def display_next_steps(config_id: str):
     """Affiche les prochaines étapes."""
     print_header("PROCHAINES ÉTAPES")
     
-    print(f"{Colors.YELLOW}1. Redémarrer le serveur{Colors.ENDC}")
-    print("   → npm restart")
+    print(f"{Colors.YELLOW}1. Appliquer au serveur{Colors.ENDC}")
+    print("   → Rechargement à chaud automatique (SIGHUP), sinon npm restart")
     print()
     
     print(f"{Colors.YELLOW}2. Vider le cache du navigateur{Colors.ENDC}")
@@ -229,6 +537,8 @@ def display_next_steps(config_id: str):
 
 def create_new_configuration(config_id: str) -> bool:
     """Crée une nouvelle configuration à partir du template."""
+    import branding_provision
+    
     root = get_project_root()
     template_file = root / "config" / "branding" / "client-template.json"
     new_config_file = root / "config" / "branding" / f"{config_id}.json"
@@ -302,80 +612,14 @@ def create_new_configuration(config_id: str) -> bool:
     if not primary_color:
         primary_color = "#2c3e50"
     
-    # Lire le template
+    # Construire la configuration à partir du template
     try:
-        with open(template_file, 'r', encoding='utf-8') as f:
-            template_data = json.load(f)
-        
-        # Personnaliser avec les valeurs saisies
-        template_data['id'] = config_id
-        
-        # Gérer la structure app.name ou name directement
-        if 'app' in template_data:
-            template_data['app']['name'] = app_name
-            if 'tagline' in template_data['app']:
-                template_data['app']['tagline'] = tagline
-            if 'shortName' in template_data['app']:
-                template_data['app']['shortName'] = ''.join([w[0] for w in app_name.split()]).upper()
-        else:
-            template_data['name'] = app_name
-            template_data['tagline'] = tagline
-        
-        # Remplacer les couleurs avec des valeurs réelles
-        if 'branding' in template_data and 'colors' in template_data['branding']:
-            template_data['branding']['colors']['primary'] = primary_color
-            # Remplacer les placeholders
-            if 'YOUR_' in str(template_data['branding']['colors'].get('secondary', '')):
-                template_data['branding']['colors']['secondary'] = '#34495e'
-            if 'YOUR_' in str(template_data['branding']['colors'].get('accent', '')):
-                template_data['branding']['colors']['accent'] = '#3498db'
-            if 'YOUR_' in str(template_data['branding']['colors'].get('dark', '')):
-                template_data['branding']['colors']['dark'] = '#1a252f'
-            if 'YOUR_' in str(template_data['branding']['colors'].get('light', '')):
-                template_data['branding']['colors']['light'] = '#ecf0f1'
-        elif 'colors' in template_data:
-            template_data['colors']['primary'] = primary_color
-        
-        # Mettre à jour les chemins de logos et remplacer [CLIENT-ID]
-        if 'branding' in template_data and 'logo' in template_data['branding']:
-            if 'main' in template_data['branding']['logo']:
-                template_data['branding']['logo']['main'] = template_data['branding']['logo']['main'].replace('[CLIENT-ID]', config_id)
-            if 'icon' in template_data['branding']['logo']:
-                template_data['branding']['logo']['icon'] = template_data['branding']['logo']['icon'].replace('[CLIENT-ID]', config_id)
-            if 'favicon' in template_data['branding']['logo']:
-                template_data['branding']['logo']['favicon'] = template_data['branding']['logo']['favicon'].replace('[CLIENT-ID]', config_id)
-        elif 'logos' in template_data:
-            template_data['logos']['main'] = f"/assets/brands/{config_id}/logo.svg"
-            template_data['logos']['favicon'] = f"/assets/brands/{config_id}/favicon.ico"
-        
-        # Remplacer les placeholders UI
-        if 'ui' in template_data:
-            if 'sidebarTitle' in template_data['ui'] and 'VOTRE' in template_data['ui']['sidebarTitle']:
-                template_data['ui']['sidebarTitle'] = app_name
-            if 'sidebarSubtitle' in template_data['ui'] and 'Votre' in template_data['ui']['sidebarSubtitle']:
-                template_data['ui']['sidebarSubtitle'] = tagline
-            if 'loginTitle' in template_data['ui'] and '[NOM]' in template_data['ui']['loginTitle']:
-                template_data['ui']['loginTitle'] = f"Bienvenue sur {app_name}"
-            if 'footer' in template_data['ui']:
-                if 'text' in template_data['ui']['footer'] and 'votre' in template_data['ui']['footer']['text'].lower():
-                    template_data['ui']['footer']['text'] = app_name
-                template_data['ui']['footer']['copyright'] = f"© 2024 {app_name}. Tous droits réservés."
-        elif 'footer' in template_data:
-            template_data['footer']['copyright'] = f"© 2024 {app_name}"
-        
-        # Remplacer les placeholders de contact
-        if 'contact' in template_data:
-            domain_name = config_id.lower().replace('-', '').replace('_', '')
-            if 'votre-entreprise' in template_data['contact'].get('email', ''):
-                template_data['contact']['email'] = f"contact@{domain_name}.com"
-            if 'votre-entreprise' in template_data['contact'].get('website', ''):
-                template_data['contact']['website'] = f"https://{domain_name}.com"
-            if 'votre-entreprise' in template_data['contact'].get('supportUrl', ''):
-                template_data['contact']['supportUrl'] = f"https://support.{domain_name}.com"
+        plan = branding_provision.load_template(root)
+        config_data, missing = branding_provision.build_configuration(
+            plan, config_id, app_name, tagline, primary_color)
         
         # Écrire la nouvelle configuration
-        with open(new_config_file, 'w', encoding='utf-8') as f:
-            json.dump(template_data, f, indent=2, ensure_ascii=False)
+        branding_provision.write_configuration(root, config_id, config_data)
         
         print()
         print_success(f"Configuration créée avec succès!")
@@ -384,19 +628,13 @@ def create_new_configuration(config_id: str) -> bool:
         print_info(f"Slogan: {tagline}")
         print_info(f"Couleur: {primary_color}")
         print()
+        for placeholder in missing:
+            print_warning(f"Placeholder à compléter: {placeholder}")
         print_warning("⚠ N'oubliez pas de personnaliser le fichier JSON si nécessaire!")
         print_info(f"   Éditez: config/branding/{config_id}.json")
         
         # Créer le dossier assets
-        assets_dir = root / "public" / "assets" / "brands" / config_id
-        if not assets_dir.exists():
-            assets_dir.mkdir(parents=True, exist_ok=True)
-            readme = assets_dir / "README.md"
-            with open(readme, 'w', encoding='utf-8') as f:
-                f.write(f"# Assets pour {app_name}\n\n")
-                f.write("Placez ici vos fichiers de logos et icônes personnalisés:\n\n")
-                f.write("- `logo.svg` ou `logo.png` : Logo principal\n")
-                f.write("- `favicon.ico` : Icône du navigateur\n")
+        if branding_provision.create_assets_dir(root, config_id, app_name):
             print_success(f"Dossier assets créé: public/assets/brands/{config_id}/")
         
         return True
@@ -510,16 +748,102 @@ def main():
             print("  python configure_branding.py eb-vision-2        # Activer config existante")
             print("  python configure_branding.py mon-nouveau-client # Créer si n'existe pas")
             print("  python configure_branding.py --list             # Lister toutes")
+            print("  python configure_branding.py --list demo        # Filtrer (id, nom, slogan)")
+            print("  python configure_branding.py --list --sort name # Trier (id, name, mtime, size)")
             print("  python configure_branding.py --new              # Mode création")
+            print("  python configure_branding.py --build-assets demo   # Assets hachés + .gz/.br")
+            print("  python configure_branding.py --build-assets --all --update-config")
+            print("  python configure_branding.py --build-logos demo    # Favicon + logos PNG/WebP depuis source/")
+            print("  python configure_branding.py --build-logos --all --update-config")
+            print("  python configure_branding.py --build-theme --all   # Thèmes CSS précompilés")
+            print("  python configure_branding.py --build-inline        # Pages servies avec le branding inliné")
+            print("  python configure_branding.py --build-inline --clear")
+            print("  python configure_branding.py --batch tenants.csv --dry-run   # Création en masse (CSV/JSONL)")
+            print("  python configure_branding.py --template-plan      # Placeholders du template")
             print()
             print("Sans argument, le script démarre en mode interactif.")
             sys.exit(0)
         
         if config_id in ['-l', '--list', 'list']:
-            configs = list_available_configs()
+            args = sys.argv[2:]
+            sort_by = 'id'
+            if '--sort' in args:
+                index = args.index('--sort')
+                sort_by = args[index + 1] if index + 1 < len(args) else ''
+                if sort_by not in SORT_KEYS:
+                    print_error(f"Tri invalide - Valeurs possibles: {', '.join(SORT_KEYS)}")
+                    sys.exit(1)
+                del args[index:index + 2]
+            filter_text = args[0] if args else None
+            configs = list_available_configs(filter_text=filter_text, sort_by=sort_by)
             display_available_configs(configs)
             sys.exit(0)
         
+        if config_id == '--build-assets':
+            args = sys.argv[2:]
+            update_config = '--update-config' in args
+            if '--all' in args:
+                ids = [c['id'] for c in list_available_configs()]
+            else:
+                ids = [a for a in args if not a.startswith('--')] or [get_current_config() or 'default']
+            sys.exit(0 if build_assets(ids, update_config=update_config) else 1)
+        
+        if config_id == '--build-logos':
+            args = sys.argv[2:]
+            source = None
+            if '--source' in args:
+                index = args.index('--source')
+                if index + 1 >= len(args):
+                    print_error("--source attend un fichier image")
+                    sys.exit(1)
+                source = args[index + 1]
+                del args[index:index + 2]
+            if '--all' in args:
+                ids = [c['id'] for c in list_available_configs()]
+            else:
+                ids = [a for a in args if not a.startswith('--')] or [get_current_config() or 'default']
+            if source and len(ids) > 1:
+                print_error("--source ne s'utilise qu'avec un seul tenant")
+                sys.exit(1)
+            sys.exit(0 if build_logos(ids, source, update_config='--update-config' in args,
+                                      force='--force' in args) else 1)
+        
+        if config_id == '--build-theme':
+            args = sys.argv[2:]
+            if '--all' in args:
+                ids = [c['id'] for c in list_available_configs()]
+            else:
+                ids = [a for a in args if not a.startswith('--')] or [get_current_config() or 'default']
+            sys.exit(0 if build_themes(ids) else 1)
+        
+        if config_id == '--template-plan':
+            sys.exit(0 if display_template_plan() else 1)
+        
+        if config_id == '--batch':
+            args = sys.argv[2:]
+            workers = None
+            if '--workers' in args:
+                index = args.index('--workers')
+                try:
+                    workers = int(args[index + 1])
+                except (IndexError, ValueError):
+                    print_error("--workers attend un nombre")
+                    sys.exit(1)
+                del args[index:index + 2]
+            files = [a for a in args if not a.startswith('--')]
+            if not files:
+                print_error("Fichier CSV ou JSONL requis: --batch <fichier> [--dry-run] [--workers N]")
+                sys.exit(1)
+            sys.exit(0 if provision_batch(files[0], dry_run='--dry-run' in args, workers=workers) else 1)
+        
+        if config_id == '--build-inline':
+            args = sys.argv[2:]
+            if '--clear' in args:
+                sys.exit(0 if clear_inline() else 1)
+            ids = [a for a in args if not a.startswith('--')]
+            target = ids[0] if ids else (get_current_config() or 'default')
+            sys.exit(0 if build_inline(target) else 1)
+        
         if config_id in ['-n', '--new', 'new']:
             print()
             print(f"{Colors.BOLD}Entrez l'ID de la nouvelle configuration{Colors.ENDC}")
@@ -572,15 +896,7 @@ def main():
         if set_config(config_id):
             print()
             display_next_steps(config_id)
-            
-            # Demander si on veut redémarrer
-            print(f"{Colors.BOLD}Voulez-vous redémarrer le serveur maintenant? (o/N): {Colors.ENDC}", end='')
-            restart = input().strip().lower()
-            
-            if restart in ['o', 'oui', 'y', 'yes']:
-                restart_server()
-            else:
-                print_info("N'oubliez pas de redémarrer le serveur: npm restart")
+            apply_to_server(config_id)
         else:
             sys.exit(1)
     
@@ -590,15 +906,7 @@ def main():
             print()
             current_config = get_current_config()
             display_next_steps(current_config)
-            
-            # Demander si on veut redémarrer
-            print(f"{Colors.BOLD}Voulez-vous redémarrer le serveur maintenant? (o/N): {Colors.ENDC}", end='')
-            restart = input().strip().lower()
-            
-            if restart in ['o', 'oui', 'y', 'yes']:
-                restart_server()
-            else:
-                print_info("N'oubliez pas de redémarrer le serveur: npm restart")
+            apply_to_server(current_config)
 
 if __name__ == "__main__":
     try:
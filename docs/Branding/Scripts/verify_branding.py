@@ -11,8 +11,34 @@ Usage:
     
 Options:
     -v, --verbose    Mode verbeux (affiche plus de détails)
-    -j, --json       Sortie au format JSON
+    -j, --json       Sortie NDJSON (un enregistrement JSON par ligne, en flux)
     --fix            Tente de corriger automatiquement les problèmes
+    --sequential     Exécute les vérifications une par une (débogage)
+    --all            Vérifie tous les tenants de config/branding (mode flotte)
+    --workers N      Nombre de processus en mode flotte (défaut: nb de CPU)
+    --no-cache       Réexécute toutes les vérifications (ignore le cache)
+    --watch          Surveille config/branding/, public/assets/brands/ et .env :
+                     revérifie le tenant modifié et invalide le cache du serveur
+    --poll [S]       Avec --watch : scrutation toutes les S secondes (défaut: 1)
+                     au lieu d'inotify
+    --bench [...]    Test de charge de /api/branding/config (voir branding_bench.py)
+    --memory [...]   Mémoire du serveur au fil des changements de branding
+                     (voir branding_memory.py)
+    --validate [...] Valide des configurations (ID, fichiers, dossiers ; défaut :
+                     tous les tenants) contre config/branding.schema.json
+
+Les vérifications indépendantes (fichiers, processus, API) sont exécutées
+en parallèle ; l'affichage reste dans l'ordre des sections 1 à 8.
+
+En mode --json, chaque résultat est écrit dès que disponible sous forme
+d'une ligne {"type": "check", ...} (section, status, message, duration,
+tenant) ; la dernière ligne est un document {"type": "summary", ...}.
+
+Les vérifications qui ne lisent que des fichiers (configuration, assets,
+fichiers source, documentation) sont mises en cache par empreinte de leurs
+entrées (voir branding_cache.py) : un tenant inchangé depuis la dernière
+exécution n'est pas revérifié, ses résultats sont rejoués. Le cache est
+désactivé avec --fix.
 
 Auteur: Assistant IA
 Date: 2 novembre 2024
@@ -22,30 +48,191 @@ Version: 1.0
 import os
 import sys
 import json
-import subprocess
-import requests
-import platform
+import time
+import signal
+import threading
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Set, Tuple, Optional
 from datetime import datetime
 
-# Codes couleur ANSI
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    CYAN = '\033[96m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
+from branding_common import Colors, get_project_root
+from branding_compile import (InheritanceError, artifact_status, chain_files, compile_brands, compiled_dir,
+                              descendants, load_config, prune_artifacts, resolve, resolve_chain)
+from branding_schema import load_validator, schema_path, SCHEMA_FILENAME
+
+SOURCE_FILES = {
+    "src/services/brandingService.js": "Service backend",
+    "src/routes/branding.js": "Routes API",
+    "public/js/branding-loader.js": "Loader frontend",
+    "public/js/sidebar-branding.js": "Branding sidebar",
+    "config/themes/brand-variables.css": "Variables CSS",
+    "config/themes/brand-active.default.css": "Thème de repli"
+}
+
+DOC_FILES = {
+    "docs/Branding/README.md": "Index principal",
+    "docs/Branding/START-HERE.md": "Démarrage rapide",
+    "docs/Branding/REFERENCE-RAPIDE.md": "Référence rapide",
+    "docs/Branding/Guides/LISEZ-MOI-EN-PREMIER.md": "Guide démarrage",
+    "config/branding/README.md": "Guide configurations"
+}
+
+# Délais des sondes réseau (secondes) : GET /api/branding/config, puis
+# chaque requête de branding_http (jusqu'à 3 par URL : GET, ETag, date)
+API_TIMEOUT = 5.0
+HTTP_PROBE_TIMEOUT = 3.0
+
+# Vérifications exécutées pour chaque tenant en mode flotte
+TENANT_CHECKS = {
+    'config': 'verify_configuration_file',
+    'assets': 'verify_assets',
+}
+
+@dataclass
+class CheckRecord:
+    """Résultat élémentaire d'une vérification."""
+    section: str
+    status: str  # section | success | warning | error | info
+    message: str
+    duration: Optional[float] = None
+    tenant: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable (ligne NDJSON)."""
+        data = {'type': 'check', **asdict(self)}
+        if self.duration is not None:
+            data['duration'] = round(self.duration, 4)
+        return data
+
+@dataclass
+class Check:
+    """Vérification planifiable avec ses dépendances."""
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    timeout: float = 30.0
+    default: Any = None
+    abort_if: Optional[Callable[[Any], bool]] = None
+    abort_message: str = ""
+
+class CheckScheduler:
+    """
+    Exécute les vérifications sur un pool de threads en respectant leurs
+    dépendances. Chaque vérification écrit dans son propre tampon ; les
+    tampons sont restitués dans l'ordre de déclaration dès que possible.
+
+    Le délai d'une vérification n'interrompt pas son thread (Python ne sait
+    pas arrêter un thread en cours) : son résultat est abandonné et le pool
+    est fermé avec cancel_futures=True, ce qui n'annule que les vérifications
+    pas encore démarrées. Chaque appel bloquant porte donc son propre délai
+    (API_TIMEOUT, HTTP_PROBE_TIMEOUT, subprocess de branding_proc) pour que
+    le processus se termine au plus tard à l'expiration de ceux-ci.
+    """
+
+    def __init__(self, verifier: 'BrandingVerifier', checks: List[Check], max_workers: Optional[int] = None):
+        self.verifier = verifier
+        self.checks = checks
+        self.max_workers = max_workers or len(checks)
+        self.results: Dict[str, Any] = {}
+        self.durations: Dict[str, float] = {}
+
+    def _execute(self, check: Check, buffer: List[CheckRecord]) -> Any:
+        """Exécute une vérification dans un thread du pool."""
+        self.verifier._local.buffer = buffer
+        try:
+            return check.func(self.results)
+        finally:
+            self.verifier._local.buffer = None
+
+    def run(self) -> bool:
+        """Lance toutes les vérifications. Retourne False en cas d'arrêt."""
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+        
+        buffers: Dict[str, List[CheckRecord]] = {c.name: [] for c in self.checks}
+        outputs: Dict[str, List[CheckRecord]] = {}
+        started: Dict[str, float] = {}
+        running = {}
+        submitted = set()
+        flushed = 0
+        aborted = False
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while flushed < len(self.checks) and not aborted:
+                # Soumettre les vérifications dont les dépendances sont résolues
+                for check in self.checks:
+                    if check.name in submitted or len(running) >= self.max_workers:
+                        continue
+                    if all(dep in outputs for dep in check.deps):
+                        future = pool.submit(self._execute, check, buffers[check.name])
+                        running[future] = check
+                        started[check.name] = time.monotonic()
+                        submitted.add(check.name)
+
+                if not running:
+                    break
+
+                now = time.monotonic()
+                next_deadline = min(started[c.name] + c.timeout for c in running.values())
+                finished, _ = wait(list(running), timeout=max(0.0, next_deadline - now),
+                                   return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    check = running.pop(future)
+                    try:
+                        self.results[check.name] = future.result()
+                        outputs[check.name] = buffers[check.name]
+                    except Exception as e:
+                        self.results[check.name] = check.default
+                        outputs[check.name] = buffers[check.name] + [
+                            self._failure(check, buffers[check.name], f"Erreur inattendue ({check.name}): {e}")]
+                    self.durations[check.name] = time.monotonic() - started[check.name]
+
+                # Vérifications ayant dépassé leur délai
+                now = time.monotonic()
+                for future, check in list(running.items()):
+                    if now - started[check.name] >= check.timeout:
+                        # Le thread continue jusqu'au délai propre de ses sondes
+                        running.pop(future)
+                        self.results[check.name] = check.default
+                        outputs[check.name] = list(buffers[check.name]) + [
+                            self._failure(check, buffers[check.name],
+                                          f"Délai dépassé ({check.timeout:.0f}s) - résultat abandonné")]
+                        self.durations[check.name] = check.timeout
+
+                # Restituer les sorties dans l'ordre de déclaration
+                while flushed < len(self.checks) and self.checks[flushed].name in outputs:
+                    check = self.checks[flushed]
+                    for record in outputs[check.name]:
+                        record.duration = self.durations[check.name]
+                        self.verifier._emit(record)
+                    flushed += 1
+                    if check.abort_if and check.abort_if(self.results[check.name]):
+                        self.verifier._emit(self._failure(check, outputs[check.name], check.abort_message))
+                        aborted = True
+                        break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return not aborted
+
+    def _failure(self, check: Check, records: List[CheckRecord], message: str) -> CheckRecord:
+        """Construit un enregistrement d'erreur rattaché à la section de la vérification."""
+        section = next((r.section for r in records if r.status == 'section'), check.name)
+        return CheckRecord(section=section, status='error', message=message,
+                           tenant=self.verifier.tenant)
 
 class BrandingVerifier:
     """Classe pour vérifier la configuration du branding."""
     
-    def __init__(self, verbose: bool = False, auto_fix: bool = False):
+    def __init__(self, verbose: bool = False, auto_fix: bool = False, max_workers: Optional[int] = None,
+                 tenant: Optional[str] = None, json_output: bool = False, use_cache: bool = False):
         self.verbose = verbose
+        self.json_output = json_output
         self.auto_fix = auto_fix
+        self.max_workers = max_workers
+        self.tenant = tenant
         self.root = self._get_project_root()
         self.results = []
         self.errors = []
@@ -53,44 +240,89 @@ class BrandingVerifier:
         self.success_count = 0
         self.error_count = 0
         self.warning_count = 0
+        self._local = threading.local()
+        # Les corrections automatiques modifient les fichiers : pas de cache
+        self.cache = None
+        if use_cache and not auto_fix:
+            from branding_cache import ResultCache
+            self.cache = ResultCache(self.root / "config" / "branding")
+        self._cache_salt = self._code_fingerprint() if self.cache else ''
     
     def _get_project_root(self) -> Path:
         """Retourne la racine du projet."""
-        script_dir = Path(__file__).resolve().parent
-        return script_dir.parent.parent.parent
+        return get_project_root()
     
     def print_header(self, text: str):
         """Affiche un en-tête."""
+        if self.json_output:
+            return
         print(f"\n{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}")
         print(f"{Colors.CYAN}{Colors.BOLD}{text.center(70)}{Colors.ENDC}")
         print(f"{Colors.CYAN}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
     
+    def _record(self, kind: str, text: str):
+        """Écrit dans le tampon de la vérification courante, ou affiche directement."""
+        if kind == 'section':
+            self._local.section = text
+        record = CheckRecord(section=getattr(self._local, 'section', ''), status=kind,
+                             message=text, tenant=self.tenant)
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            buffer.append(record)
+        else:
+            self._emit(record)
+    
+    def _emit(self, record: CheckRecord):
+        """Affiche un enregistrement et met à jour les compteurs."""
+        kind = record.status
+        if kind == 'success':
+            self.success_count += 1
+        elif kind == 'error':
+            self.error_count += 1
+        elif kind == 'warning':
+            self.warning_count += 1
+        
+        if self.json_output:
+            # Flux NDJSON : rien n'est conservé en mémoire
+            if kind != 'section':
+                print(json.dumps(record.to_dict(), ensure_ascii=False), flush=True)
+            return
+        
+        text = f"[{record.tenant}] {record.message}" if record.tenant else record.message
+        if kind == 'section':
+            print(f"\n{Colors.YELLOW}{Colors.BOLD}{text}{Colors.ENDC}")
+            print(f"{Colors.YELLOW}{'-'*len(text)}{Colors.ENDC}")
+        elif kind == 'success':
+            print(f"{Colors.GREEN}✓ {text}{Colors.ENDC}")
+        elif kind == 'error':
+            print(f"{Colors.RED}✗ {text}{Colors.ENDC}")
+            self.errors.append(text)
+        elif kind == 'warning':
+            print(f"{Colors.YELLOW}⚠ {text}{Colors.ENDC}")
+            self.warnings.append(text)
+        elif kind == 'info':
+            print(f"{Colors.BLUE}ℹ {text}{Colors.ENDC}")
+    
     def print_section(self, text: str):
         """Affiche une section."""
-        print(f"\n{Colors.YELLOW}{Colors.BOLD}{text}{Colors.ENDC}")
-        print(f"{Colors.YELLOW}{'-'*len(text)}{Colors.ENDC}")
+        self._record('section', text)
     
     def print_success(self, text: str):
         """Affiche un succès."""
-        print(f"{Colors.GREEN}✓ {text}{Colors.ENDC}")
-        self.success_count += 1
+        self._record('success', text)
     
     def print_error(self, text: str):
         """Affiche une erreur."""
-        print(f"{Colors.RED}✗ {text}{Colors.ENDC}")
-        self.errors.append(text)
-        self.error_count += 1
+        self._record('error', text)
     
     def print_warning(self, text: str):
         """Affiche un avertissement."""
-        print(f"{Colors.YELLOW}⚠ {text}{Colors.ENDC}")
-        self.warnings.append(text)
-        self.warning_count += 1
+        self._record('warning', text)
     
     def print_info(self, text: str):
         """Affiche une information."""
         if self.verbose:
-            print(f"{Colors.BLUE}ℹ {text}{Colors.ENDC}")
+            self._record('info', text)
     
     def verify_project_structure(self) -> bool:
         """Vérifie la structure du projet."""
@@ -201,60 +433,76 @@ class BrandingVerifier:
         
         self.print_success(f"Fichier de configuration existe: {config_file.name}")
         
-        # Lire et valider le JSON
+        # Lire et valider le JSON (héritage "extends" résolu)
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            chain = resolve_chain(config_file.parent, config_id)
+            config_data = resolve(chain)
             
             self.print_success("JSON valide")
+            if len(chain) > 1:
+                self.print_success(f"Hérite de: {' → '.join(layer_id for layer_id, _ in chain[1:])}")
             
-            # Vérifier les champs requis
-            required_fields = {
-                'id': 'ID',
-                'name': 'Nom de l\'application',
-                'tagline': 'Slogan',
-                'colors': 'Couleurs',
-                'footer': 'Footer'
-            }
+            # Artefact chargé par le serveur (config/branding/compiled/)
+            status = artifact_status(config_file.parent, config_id)
+            if status:
+                self.print_warning(f"{status} → python docs/Branding/Scripts/branding.py compile {config_id}")
             
-            all_fields_present = True
-            for field, description in required_fields.items():
-                if field in config_data:
-                    self.print_success(f"{description}: ✓")
-                    if self.verbose and isinstance(config_data[field], str):
-                        self.print_info(f"   Valeur: {config_data[field]}")
-                else:
-                    self.print_warning(f"{description}: manquant")
-                    all_fields_present = False
+            # Valider la structure (config/branding.schema.json)
+            violations = load_validator(self.root).validate(config_data)
+            if violations:
+                for violation in violations:
+                    self.print_error(f"{violation.path}: {violation.message}")
+            else:
+                self.print_success(f"Conforme au schéma ({SCHEMA_FILENAME})")
             
-            # Vérifier les couleurs
-            if 'colors' in config_data:
-                colors = config_data['colors']
-                color_fields = ['primary', 'secondary', 'success', 'danger', 'warning', 'info']
-                
-                missing_colors = [c for c in color_fields if c not in colors]
-                if missing_colors:
-                    self.print_warning(f"Couleurs manquantes: {', '.join(missing_colors)}")
-                else:
-                    self.print_success(f"Toutes les couleurs définies ({len(color_fields)})")
+            contrast_errors = self.verify_palette(config_data)
             
-            return all_fields_present, config_data
+            if self.verbose:
+                app = config_data.get('app', {})
+                self.print_info(f"   Nom: {app.get('name', 'N/A')}")
+                self.print_info(f"   Slogan: {app.get('tagline', 'N/A')}")
+            
+            return not violations and not contrast_errors, config_data
             
         except json.JSONDecodeError as e:
             self.print_error(f"JSON invalide: {e}")
             return False, None
+        except InheritanceError as e:
+            self.print_error(f"Héritage invalide: {e}")
+            return False, None
         except Exception as e:
             self.print_error(f"Erreur lors de la lecture: {e}")
             return False, None
     
-    def verify_assets(self, config_id: str) -> bool:
-        """Vérifie les assets de branding."""
-        self.print_section("4. ASSETS DE BRANDING")
+    def verify_palette(self, config_data: Dict) -> int:
+        """Contrastes WCAG des couleurs de marque. Retourne le nombre de couples illisibles."""
+        # Import à la demande : NumPy (optionnel) n'est chargé que pour cette vérification
+        from branding_palette import AA_NORMAL, audit_colors, describe
         
+        palette = audit_colors(config_data.get('branding', {}).get('colors', {}) or {})
+        for issue in palette.errors:
+            self.print_error(describe(issue))
+        if not palette.issues:
+            self.print_success(f"Contrastes conformes (≥ {AA_NORMAL}:1)")
+        elif self.verbose:
+            # Sous le niveau AA mais lisible : détaillé en mode verbeux seulement
+            for issue in palette.issues:
+                if issue.level == 'warning':
+                    self.print_warning(describe(issue))
+        return len(palette.errors)
+    
+    def assets_dir(self, config_id: str) -> Path:
+        """Dossier d'assets d'un tenant."""
         # Extraire l'ID simple (sans suffixe -2, etc.)
         base_id = config_id.rsplit('-', 1)[0] if '-' in config_id and config_id.split('-')[-1].isdigit() else config_id
+        return self.root / "public" / "assets" / "brands" / base_id
+    
+    def verify_assets(self, config_id: str) -> bool:
+        """Vérifie les assets de branding."""
+        self.print_section("4. ASSETS DE BRANDING")
         
-        assets_dir = self.root / "public" / "assets" / "brands" / base_id
+        assets_dir = self.assets_dir(config_id)
+        base_id = assets_dir.name
         
         if not assets_dir.exists():
             self.print_warning(f"Dossier assets introuvable: {assets_dir.name}/")
@@ -275,16 +523,21 @@ class BrandingVerifier:
         
         self.print_success(f"Dossier assets existe: {base_id}/")
         
-        # Lister les fichiers
-        logo_extensions = {'.svg', '.png', '.jpg', '.jpeg', '.ico', '.webp'}
-        logo_files = [f for f in assets_dir.iterdir() 
-                     if f.is_file() and f.suffix.lower() in logo_extensions]
+        # Analyser les logos (en-têtes seulement) et les comparer au budget de leur rôle
+        from branding_images import describe, scan_tenants
+        try:
+            config_data = load_config(self.root / "config" / "branding", config_id)
+        except (OSError, ValueError):
+            config_data = None
+        tenant = scan_tenants({base_id: assets_dir}, {base_id: config_data})[0]
         
-        if logo_files:
-            self.print_success(f"{len(logo_files)} logo(s) trouvé(s)")
+        if tenant.images:
+            self.print_success(f"{len(tenant.images)} logo(s) trouvé(s)")
             if self.verbose:
-                for logo in logo_files:
-                    self.print_info(f"   - {logo.name} ({logo.stat().st_size} bytes)")
+                for info in tenant.images:
+                    self.print_info(f"   - {Path(info.path).name} ({describe(info)})")
+            for issue in tenant.issues:
+                self.print_warning(f"{issue.path} ({issue.role}) : {issue.message}")
         else:
             self.print_info("   Aucun logo personnalisé (utilise FontAwesome)")
         
@@ -294,16 +547,8 @@ class BrandingVerifier:
         """Vérifie les fichiers source du branding."""
         self.print_section("5. FICHIERS SOURCE")
         
-        source_files = {
-            "src/services/brandingService.js": "Service backend",
-            "src/routes/branding.js": "Routes API",
-            "public/js/branding-loader.js": "Loader frontend",
-            "public/js/sidebar-branding.js": "Branding sidebar",
-            "config/themes/brand-variables.css": "Variables CSS"
-        }
-        
         all_present = True
-        for file_path, description in source_files.items():
+        for file_path, description in SOURCE_FILES.items():
             full_path = self.root / file_path
             if full_path.exists():
                 self.print_success(f"{description}: {file_path}")
@@ -314,64 +559,108 @@ class BrandingVerifier:
                 self.print_error(f"{description} manquant: {file_path}")
                 all_present = False
         
+        self.verify_pages()
         return all_present
     
+    def verify_pages(self):
+        """Poids des pages public/*.html, doublons et références introuvables."""
+        from branding_pages import PageAuditor, summarize, format_size
+        
+        reports = PageAuditor(self.root, self.cache).audit()
+        if not reports:
+            return
+        summary = summarize(reports)
+        self.print_success(f"{summary['pages']} pages analysées: "
+                           f"{format_size(summary['transfer_bytes'])} transférés au total")
+        if self.verbose:
+            for report in sorted(reports, key=lambda r: -r.transfer_bytes)[:3]:
+                self.print_info(f"   {report.page}: {format_size(report.transfer_bytes)} transférés, "
+                                f"{len(report.blocking)} ressource(s) bloquante(s)")
+        for report in reports:
+            for duplicate in report.duplicates:
+                self.print_warning(f"{report.page} charge {duplicate['count']} fois "
+                                   f"{duplicate['paths'][0]} ({', '.join(duplicate['urls'])})")
+            for resource in report.missing:
+                self.print_warning(f"{report.page}: ressource introuvable {resource.url}")
+    
+    def server_port(self) -> int:
+        """Port du serveur (PORT du .env, puis de l'environnement, 3000 par défaut)."""
+        port = None
+        try:
+            with open(self.root / ".env", 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('PORT='):
+                        port = line.split('=', 1)[1].strip()
+        except OSError:
+            pass
+        try:
+            return int(port or os.environ.get('PORT') or 3000)
+        except ValueError:
+            return 3000
+    
     def verify_server(self) -> Tuple[bool, List[int]]:
-        """Vérifie si le serveur Node.js est en cours d'exécution."""
+        """Vérifie qu'un serveur écoute sur le port configuré et rapporte ses ressources."""
+        from branding_proc import (find_listening_pids, read_process_stats, format_bytes,
+                                   format_duration, RSS_WARNING_BYTES, FD_WARNING_RATIO)
+        
         self.print_section("6. SERVEUR NODE.JS")
         
+        port = self.server_port()
         try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["tasklist", "/FI", "IMAGENAME eq node.exe"],
-                    capture_output=True,
-                    text=True
-                )
-                if "node.exe" in result.stdout:
-                    self.print_success("Serveur Node.js en cours d'exécution")
-                    # Extraire les PIDs
-                    lines = result.stdout.split('\n')
-                    pids = []
-                    for line in lines:
-                        if 'node.exe' in line:
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                try:
-                                    pids.append(int(parts[1]))
-                                except ValueError:
-                                    pass
-                    if pids:
-                        self.print_info(f"   PID(s): {', '.join(map(str, pids))}")
-                    return True, pids
-            else:
-                result = subprocess.run(
-                    ["pgrep", "-f", "node"],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    pids = [int(pid) for pid in result.stdout.strip().split('\n') if pid]
-                    self.print_success("Serveur Node.js en cours d'exécution")
-                    self.print_info(f"   PID(s): {', '.join(map(str, pids))}")
-                    return True, pids
-            
-            self.print_warning("Aucun serveur Node.js en cours")
-            self.print_info("   Démarrez avec: npm start")
-            return False, []
-            
+            pids = find_listening_pids(port)
         except Exception as e:
             self.print_warning(f"Impossible de vérifier le serveur: {e}")
             return False, []
+        
+        if pids == []:
+            self.print_warning(f"Aucun serveur à l'écoute sur le port {port}")
+            self.print_info("   Démarrez avec: npm start")
+            return False, []
+        if pids is None:
+            self.print_success(f"Un processus écoute sur le port {port}")
+            self.print_warning("PID inaccessible (processus d'un autre utilisateur) - ressources non mesurées")
+            return True, []
+        
+        self.print_success(f"Serveur à l'écoute sur le port {port} (PID {', '.join(map(str, pids))})")
+        for pid in pids:
+            stats = read_process_stats(pid)
+            if stats is None:
+                # Pas de /proc (Windows, macOS) : seul le PID est connu
+                continue
+            if not stats.name.startswith('node'):
+                self.print_warning(f"Le port {port} est occupé par '{stats.name}' (PID {pid}), pas par Node.js")
+            self.print_info(f"   Commande: {stats.cmdline}")
+            
+            fds = f"{stats.open_fds} descripteurs" if stats.open_fds is not None else "descripteurs N/A"
+            self.print_success(f"PID {pid}: RSS {format_bytes(stats.rss_bytes)}, CPU {stats.cpu_seconds:.1f} s, "
+                               f"{stats.threads} thread(s), {fds}, actif depuis {format_duration(stats.uptime_seconds)}")
+            self.print_info(f"   RSS max: {format_bytes(stats.rss_peak_bytes)}, "
+                            f"mémoire anonyme: {format_bytes(stats.rss_anon_bytes)}")
+            if stats.fd_limit:
+                self.print_info(f"   Limite de descripteurs: {stats.fd_limit}")
+            
+            if stats.rss_bytes >= RSS_WARNING_BYTES:
+                self.print_warning(f"Mémoire élevée: RSS {format_bytes(stats.rss_bytes)} "
+                                   f"(seuil {format_bytes(RSS_WARNING_BYTES)})")
+            if stats.open_fds is not None and stats.fd_limit and stats.open_fds >= stats.fd_limit * FD_WARNING_RATIO:
+                self.print_warning(f"Descripteurs presque épuisés: {stats.open_fds}/{stats.fd_limit}")
+        
+        return True, pids
     
     def verify_api(self, config_data: Optional[Dict]) -> bool:
         """Vérifie l'API de branding."""
+        # Import à la demande : requests n'est chargé que si le serveur répond
+        import requests
+        
         self.print_section("7. API DE BRANDING")
         
-        url = "http://localhost:3000/api/branding/config"
+        base_url = f"http://localhost:{self.server_port()}"
+        url = f"{base_url}/api/branding/config"
         
         try:
             self.print_info(f"Test de l'API: {url}")
-            response = requests.get(url, timeout=5)
+            response = requests.get(url, timeout=API_TIMEOUT)
             
             if response.status_code == 200:
                 self.print_success("API accessible (HTTP 200)")
@@ -385,20 +674,16 @@ class BrandingVerifier:
                         
                         self.print_success(f"Nom de l'application: {app_name}")
                         
-                        # Comparer avec la configuration attendue
-                        if config_data and 'name' in config_data:
-                            expected_name = config_data['name']
-                            if app_name == expected_name:
-                                self.print_success("✓ Configuration correcte!")
-                            else:
-                                self.print_warning(f"Configuration différente (attendu: {expected_name})")
-                                self.print_info("   → Redémarrez le serveur si vous avez modifié .env")
+                        # Comparer avec la configuration attendue (arbre complet)
+                        if config_data:
+                            self.verify_served_config(config_data, api_config)
                         
                         # Afficher les détails si verbose
                         if self.verbose and 'app' in api_config:
                             self.print_info(f"   ID: {api_config['app'].get('id', 'N/A')}")
                             self.print_info(f"   Tagline: {api_config['app'].get('tagline', 'N/A')}")
                         
+                        self.verify_http_cache(base_url, api_config)
                         return True
                     else:
                         self.print_error("Format de réponse incorrect")
@@ -422,20 +707,45 @@ class BrandingVerifier:
             self.print_error(f"Erreur lors du test de l'API: {e}")
             return False
     
+    def verify_served_config(self, config_data: Dict, api_config: Dict):
+        """Compare la configuration du fichier à celle servie par l'API."""
+        from branding_diff import MerkleNode, compare
+
+        report = compare(MerkleNode(config_data), MerkleNode(api_config), 'fichier', 'API')
+        if report.identical:
+            self.print_success("✓ Configuration correcte!")
+            return
+        self.print_warning(f"Configuration servie différente du fichier ({len(report.differences)} écart(s))")
+        for difference in report.differences[:5]:
+            self.print_info(f"   {difference.change}: {difference.path}")
+        self.print_info("   → Redémarrez ou rechargez le serveur si vous avez modifié .env ou le fichier")
+
+    def verify_http_cache(self, base_url: str, api_config: Dict):
+        """Revalidation (304), Cache-Control et compression de la configuration et des logos."""
+        from branding_http import run_checks, summary, describe, format_size
+        
+        checks = run_checks(base_url, api_config, timeout=HTTP_PROBE_TIMEOUT)
+        for check in checks:
+            label = check.kind if check.kind == 'config' else f"{check.kind} {check.url[len(base_url):]}"
+            if check.errors:
+                for message in check.errors:
+                    self.print_error(f"Cache HTTP {label}: {message}")
+            elif check.status == 200:
+                self.print_success(f"Cache HTTP {label}: {describe(check)}")
+            for message in check.warnings:
+                self.print_warning(f"Cache HTTP {label}: {message}")
+            if self.verbose and check.status == 200:
+                self.print_info(f"   ETag {check.etag or '-'}, Cache-Control {check.cache_control or '-'}")
+        totals = summary(checks)
+        self.print_info(f"   Revalidation: {format_size(totals['saved_bytes'])} économisés sur "
+                        f"{format_size(totals['full_bytes'])} par page")
+    
     def verify_documentation(self) -> bool:
         """Vérifie la documentation."""
         self.print_section("8. DOCUMENTATION")
         
-        doc_files = {
-            "docs/Branding/README.md": "Index principal",
-            "docs/Branding/START-HERE.md": "Démarrage rapide",
-            "docs/Branding/REFERENCE-RAPIDE.md": "Référence rapide",
-            "docs/Branding/Guides/LISEZ-MOI-EN-PREMIER.md": "Guide démarrage",
-            "config/branding/README.md": "Guide configurations"
-        }
-        
         all_present = True
-        for file_path, description in doc_files.items():
+        for file_path, description in DOC_FILES.items():
             full_path = self.root / file_path
             if full_path.exists():
                 self.print_success(f"{description}: ✓")
@@ -484,71 +794,600 @@ class BrandingVerifier:
         else:
             print(f"{Colors.RED}{Colors.BOLD}PROBLÈMES DÉTECTÉS ✗{Colors.ENDC}")
     
+    def _code_fingerprint(self) -> str:
+        """Empreinte du code de vérification : le modifier invalide tout le cache."""
+        script_dir = Path(__file__).resolve().parent
+        return self.cache.fingerprint(
+            [script_dir / "verify_branding.py", script_dir / "branding_schema.py",
+             script_dir / "branding_palette.py", script_dir / "branding_images.py",
+             script_dir / "branding_pages.py", script_dir / "branding_compile.py"],
+            f"verbose={self.verbose}")
+    
+    def check_inputs(self, name: str, config_id: Optional[str] = None) -> Optional[List[Path]]:
+        """Fichiers lus par une vérification (None si elle n'est pas mise en cache)."""
+        if name == 'config':
+            # Toute la chaîne d'héritage et l'artefact compilé
+            branding_dir = self.root / "config" / "branding"
+            return chain_files(branding_dir, config_id) + [
+                compiled_dir(branding_dir) / f"{config_id}.json", schema_path(self.root)]
+        if name == 'assets':
+            assets_dir = self.assets_dir(config_id)
+            if not assets_dir.is_dir():
+                return [assets_dir]
+            # La configuration désigne le rôle (et donc le budget) de chaque logo
+            config_files = chain_files(self.root / "config" / "branding", config_id)
+            return [assets_dir] + config_files + sorted(f for f in assets_dir.iterdir() if f.is_file())
+        if name == 'source':
+            # Les pages et leurs feuilles de style et scripts (poids, doublons)
+            public = self.root / "public"
+            pages = sorted(public.glob("*.html")) + sorted(public.glob("css/*")) + sorted(public.glob("js/*"))
+            return [self.root / file_path for file_path in SOURCE_FILES] + [public] + pages
+        if name == 'docs':
+            return [self.root / file_path for file_path in DOC_FILES]
+        return None
+    
+    def cache_lookup(self, name: str, config_id: Optional[str] = None) -> Tuple[Optional[str], Optional[Tuple[Any, List[CheckRecord]]]]:
+        """
+        Calcule l'empreinte d'entrée d'une vérification et cherche son
+        résultat. Retourne (empreinte, (valeur, enregistrements) ou None).
+        """
+        inputs = self.check_inputs(name, config_id) if self.cache else None
+        if inputs is None:
+            return None, None
+        fingerprint = self.cache.fingerprint(inputs, self._cache_salt, name, config_id or '')
+        hit = self.cache.get(f"{name}:{config_id}" if config_id else name, fingerprint)
+        if hit is None:
+            return fingerprint, None
+        value, records = hit
+        return fingerprint, (value, [CheckRecord(**{**r, 'tenant': self.tenant}) for r in records])
+    
+    def cache_store(self, name: str, config_id: Optional[str], fingerprint: Optional[str],
+                    value: Any, records: List[CheckRecord]):
+        """Mémorise le résultat d'une vérification exécutée."""
+        if self.cache and fingerprint:
+            self.cache.put(f"{name}:{config_id}" if config_id else name, fingerprint, value,
+                           [asdict(r) for r in records])
+    
+    def cached_check(self, name: str, func: Callable[[], Any], config_id: Optional[str] = None) -> Any:
+        """Exécute une vérification, ou rejoue son résultat si ses entrées n'ont pas changé."""
+        buffer = self._local.buffer
+        fingerprint, hit = self.cache_lookup(name, config_id)
+        if hit is not None:
+            value, records = hit
+            buffer.extend(records)
+            return value
+        first = len(buffer)
+        value = func()
+        self.cache_store(name, config_id, fingerprint, value, buffer[first:])
+        return value
+    
+    def build_checks(self) -> List[Check]:
+        """Déclare les vérifications, leurs dépendances et leurs délais."""
+        return [
+            Check('structure', lambda r: self.verify_project_structure(),
+                  timeout=10, default=False,
+                  abort_if=lambda ok: not ok,
+                  abort_message="Structure du projet invalide - Arrêt"),
+            Check('env', lambda r: self.verify_env_file(), deps=('structure',),
+                  timeout=10, default=(False, None),
+                  abort_if=lambda res: not res[0] or not res[1],
+                  abort_message="Impossible de déterminer la configuration - Arrêt"),
+            Check('config', lambda r: self.cached_check(
+                      'config', lambda: self.verify_configuration_file(r['env'][1]), r['env'][1]),
+                  deps=('env',), timeout=10, default=(False, None)),
+            Check('assets', lambda r: self.cached_check(
+                      'assets', lambda: self.verify_assets(r['env'][1]), r['env'][1]),
+                  deps=('env',), timeout=30, default=False),
+            Check('source', lambda r: self.cached_check('source', self.verify_source_files),
+                  deps=('structure',), timeout=10, default=False),
+            Check('server', lambda r: self.verify_server(), deps=('structure',),
+                  timeout=15, default=(False, [])),
+            # Délai couvrant les délais propres de ses sondes (voir CheckScheduler)
+            Check('api', self._check_api, deps=('server', 'config'),
+                  timeout=API_TIMEOUT + 3 * HTTP_PROBE_TIMEOUT + 1, default=False),
+            Check('docs', lambda r: self.cached_check('docs', self.verify_documentation),
+                  deps=('structure',), timeout=10, default=False),
+        ]
+    
+    def _check_api(self, results: Dict[str, Any]) -> bool:
+        """Teste l'API seulement si le serveur est actif."""
+        server_ok, _ = results['server']
+        if server_ok:
+            return self.verify_api(results['config'][1])
+        self.print_section("7. API DE BRANDING")
+        self.print_info("Test ignoré (serveur non démarré)")
+        return False
+    
+    def print_context(self, title: str, mode: str):
+        """Affiche l'en-tête et le contexte d'exécution (ou l'enregistrement 'start')."""
+        import platform
+        
+        context = {
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'system': f"{platform.system()} {platform.release()}",
+            'python': sys.version.split()[0],
+            'root': str(self.root),
+        }
+        if self.json_output:
+            print(json.dumps({'type': 'start', 'mode': mode, **context}, ensure_ascii=False), flush=True)
+            return
+        
+        self.print_header(title)
+        print(f"{Colors.BOLD}Date:{Colors.ENDC} {context['date']}")
+        print(f"{Colors.BOLD}Système:{Colors.ENDC} {context['system']}")
+        print(f"{Colors.BOLD}Python:{Colors.ENDC} {context['python']}")
+        print(f"{Colors.BOLD}Répertoire:{Colors.ENDC} {context['root']}")
+    
+    def finish(self, start: float, aborted: bool = False,
+               per_tenant: Optional[List[Tuple[str, Dict[str, int]]]] = None):
+        """Termine le rapport : résumé texte ou document JSON final."""
+        duration = time.monotonic() - start
+        if self.cache:
+            self.cache.close()
+        if self.json_output:
+            if aborted:
+                status = 'aborted'
+            elif self.error_count:
+                status = 'errors'
+            elif self.warning_count:
+                status = 'warnings'
+            else:
+                status = 'ok'
+            summary = {
+                'type': 'summary',
+                'status': status,
+                'success': self.success_count,
+                'warnings': self.warning_count,
+                'errors': self.error_count,
+                'duration': round(duration, 4),
+            }
+            if self.cache:
+                summary['cached'] = self.cache.hits
+            if per_tenant is not None:
+                summary['tenants'] = [{'tenant': tenant, **counts} for tenant, counts in per_tenant]
+            print(json.dumps(summary, ensure_ascii=False), flush=True)
+            return
+        
+        if aborted:
+            return
+        if per_tenant is not None:
+            self.print_fleet_table(per_tenant)
+        self.print_summary()
+        print(f"{Colors.BOLD}Durée:{Colors.ENDC} {duration:.2f}s")
+        if self.cache:
+            total = self.cache.hits + self.cache.misses
+            print(f"{Colors.BOLD}Cache:{Colors.ENDC} {self.cache.hits}/{total} vérification(s) reprise(s)")
+    
     def run(self) -> bool:
         """Exécute toutes les vérifications."""
-        self.print_header("VÉRIFICATION COMPLÈTE DU BRANDING")
+        self.print_context("VÉRIFICATION COMPLÈTE DU BRANDING", mode='single')
         
-        print(f"{Colors.BOLD}Date:{Colors.ENDC} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{Colors.BOLD}Système:{Colors.ENDC} {platform.system()} {platform.release()}")
-        print(f"{Colors.BOLD}Python:{Colors.ENDC} {sys.version.split()[0]}")
-        print(f"{Colors.BOLD}Répertoire:{Colors.ENDC} {self.root}")
+        start = time.monotonic()
+        scheduler = CheckScheduler(self, self.build_checks(), max_workers=self.max_workers)
+        if not scheduler.run():
+            self.finish(start, aborted=True)
+            return False
+        
+        # Résumé
+        self.finish(start)
         
-        # 1. Structure
+        return self.error_count == 0
+    
+    def list_tenants(self) -> List[str]:
+        """Liste les identifiants de tous les tenants (hors template)."""
+        branding_dir = self.root / "config" / "branding"
+        return sorted(f.stem for f in branding_dir.glob("*.json") if f.stem != 'client-template')
+    
+    def resolve_config_paths(self, targets: List[str]) -> List[Path]:
+        """Fichiers désignés par des chemins, des dossiers ou des ID de tenant."""
+        branding_dir = self.root / "config" / "branding"
+        if not targets:
+            return [branding_dir / f"{tenant}.json" for tenant in self.list_tenants()]
+        
+        paths: List[Path] = []
+        for target in targets:
+            path = Path(target)
+            if path.is_dir():
+                paths.extend(sorted(path.glob("*.json")))
+            elif path.is_file():
+                paths.append(path)
+            elif (branding_dir / f"{target}.json").is_file():
+                paths.append(branding_dir / f"{target}.json")
+            else:
+                self.print_error(f"Configuration introuvable: {target}")
+        return paths
+    
+    def run_validation(self, targets: List[str]) -> bool:
+        """Valide des configurations contre le schéma compilé (mode lot)."""
+        self.print_context("VALIDATION DES CONFIGURATIONS", mode='validate')
+        
+        start = time.monotonic()
+        try:
+            validator = load_validator(self.root)
+        except (OSError, ValueError) as e:
+            self.print_error(f"Schéma inutilisable ({SCHEMA_FILENAME}): {e}")
+            self.finish(start, aborted=True)
+            return False
+        
+        self.print_section(f"SCHÉMA {SCHEMA_FILENAME}")
+        for path in self.resolve_config_paths(targets):
+            self.tenant = path.stem
+            violations = validator.validate_file(path)
+            if not violations:
+                self.print_success("Conforme")
+            for violation in violations:
+                self.print_error(f"{violation.path}: {violation.message}")
+        self.tenant = None
+        
+        self.finish(start)
+        return self.error_count == 0
+    
+    def run_fleet(self, workers: Optional[int] = None) -> bool:
+        """Vérifie tous les tenants en parallèle et produit un rapport combiné."""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        self.print_context("VÉRIFICATION DE LA FLOTTE DE BRANDING", mode='fleet')
+        
+        start = time.monotonic()
         if not self.verify_project_structure():
             self.print_error("Structure du projet invalide - Arrêt")
+            self.finish(start, aborted=True)
             return False
         
-        # 2. Fichier .env
-        env_ok, config_id = self.verify_env_file()
-        if not env_ok or not config_id:
-            self.print_error("Impossible de déterminer la configuration - Arrêt")
-            return False
+        tenants = self.list_tenants()
+        if not self.json_output:
+            print(f"\n{Colors.BOLD}Tenants:{Colors.ENDC} {len(tenants)}")
         
-        # 3. Fichier de configuration
-        config_ok, config_data = self.verify_configuration_file(config_id)
+        # Résultats repris du cache ; seuls les tenants modifiés sont revérifiés
+        outputs: Dict[str, Dict[str, List[CheckRecord]]] = {tenant: {} for tenant in tenants}
+        pending: Dict[str, Dict[str, Optional[str]]] = {}
+        for tenant in tenants:
+            self.tenant = tenant
+            for name in TENANT_CHECKS:
+                fingerprint, hit = self.cache_lookup(name, tenant)
+                if hit is not None:
+                    outputs[tenant][name] = hit[1]
+                else:
+                    pending.setdefault(tenant, {})[name] = fingerprint
+        self.tenant = None
         
-        # 4. Assets
-        self.verify_assets(config_id)
+        # Les tenants sont vérifiés dans des processus séparés ; le rapport
+        # suit l'ordre des tenants quel que soit l'ordre d'exécution.
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                names = [tuple(checks) for checks in pending.values()]
+                jobs = pool.map(verify_tenant, list(pending),
+                                [self.verbose] * len(pending), [self.auto_fix] * len(pending), names)
+                for tenant, results in jobs:
+                    for name, (value, records, failed) in results.items():
+                        outputs[tenant][name] = records
+                        if not failed:
+                            self.cache_store(name, tenant, pending[tenant][name], value, records)
         
-        # 5. Fichiers source
-        self.verify_source_files()
+        per_tenant = []
+        for tenant in tenants:
+            counts = {'success': 0, 'warning': 0, 'error': 0}
+            for name in TENANT_CHECKS:
+                for record in outputs[tenant][name]:
+                    self._emit(record)
+                    if record.status in counts:
+                        counts[record.status] += 1
+            per_tenant.append((tenant, counts))
         
-        # 6. Serveur
-        server_ok, pids = self.verify_server()
+        self.finish(start, per_tenant=per_tenant)
         
-        # 7. API (seulement si serveur actif)
-        if server_ok:
-            self.verify_api(config_data)
-        else:
-            self.print_section("7. API DE BRANDING")
-            self.print_info("Test ignoré (serveur non démarré)")
+        return self.error_count == 0
+    
+    def check_tenant(self, config_id: str) -> Dict[str, int]:
+        """Vérifie la configuration et les assets d'un tenant (cache compris)."""
+        counts = {'success': 0, 'warning': 0, 'error': 0}
+        self.tenant = config_id
+        for name, method in TENANT_CHECKS.items():
+            self._local.buffer = []
+            start = time.monotonic()
+            try:
+                self.cached_check(name, lambda: getattr(self, method)(config_id), config_id)
+            except Exception as e:
+                self.print_error(f"Erreur inattendue: {e}")
+            records, self._local.buffer = self._local.buffer, None
+            for record in records:
+                record.duration = time.monotonic() - start
+                self._emit(record)
+                if record.status in counts:
+                    counts[record.status] += 1
+        self.tenant = None
+        return counts
+    
+    def _watched(self, path: Path) -> bool:
+        """Chemins dont la modification déclenche une vérification."""
+        if path.name.startswith('.'):
+            # Les bases SQLite de config/branding/ sont cachées : seul .env compte
+            return path == self.root / ".env"
+        if path.parent == self.root / "config" / "branding":
+            return path.suffix == '.json'
+        return self.root / "public" / "assets" / "brands" in path.parents
+    
+    def affected_tenants(self, changes: Set[Path]) -> Tuple[Set[str], Set[str], bool]:
+        """
+        Tenants concernés par un lot de modifications. Retourne (tenants à
+        revérifier, tenants dont la configuration a changé, .env modifié).
+        """
+        branding_dir = self.root / "config" / "branding"
+        brands_dir = self.root / "public" / "assets" / "brands"
+        tenants: Set[str] = set()
+        configs: Set[str] = set()
+        env_changed = False
+        for path in changes:
+            if path == self.root / ".env":
+                env_changed = True
+            elif path.parent == branding_dir:
+                if path.stem != 'client-template':
+                    # Les tenants qui en héritent changent avec lui
+                    inherited = {path.stem} | descendants(branding_dir, path.stem)
+                    tenants.update(inherited)
+                    configs.update(inherited)
+            elif brands_dir in path.parents:
+                base_id = path.relative_to(brands_dir).parts[0]
+                tenants.update(t for t in self.list_tenants() if self.assets_dir(t).name == base_id)
+        return tenants, configs, env_changed
+    
+    def notify_server(self, config_ids: Set[str], reload_brand: bool) -> Tuple[Optional[bool], str]:
+        """
+        Invalide le cache de BrandingService sur le serveur en cours d'exécution :
+        SIGHUP aux processus server.js du projet (cache vidé, BRAND_CONFIG relu),
+        sinon DELETE /api/branding/cache/<id> ou POST /api/branding/reload avec
+        BRANDING_ADMIN_TOKEN. Retourne (succès ou None sans serveur, message).
+        """
+        # Import à la demande : seul le mode --watch pilote le serveur
+        import requests
+        from configure_branding import find_server_pids, get_server_url, read_env_file
         
-        # 8. Documentation
-        self.verify_documentation()
+        pids = find_server_pids()
+        if pids and hasattr(signal, 'SIGHUP'):
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGHUP)
+                except OSError as e:
+                    return False, f"Signal impossible vers le PID {pid}: {e}"
+            return True, f"SIGHUP envoyé au serveur (PID {', '.join(str(p) for p in pids)})"
         
-        # Résumé
-        self.print_summary()
+        token = os.environ.get('BRANDING_ADMIN_TOKEN') or read_env_file().get('BRANDING_ADMIN_TOKEN')
+        if not token:
+            return None, "Processus serveur introuvable localement et BRANDING_ADMIN_TOKEN non défini"
         
-        return self.error_count == 0
+        base_url = get_server_url()
+        headers = {'Authorization': f"Bearer {token}"}
+        try:
+            if reload_brand:
+                requests.post(f"{base_url}/api/branding/reload", json={},
+                              headers=headers, timeout=5).raise_for_status()
+            for config_id in sorted(config_ids):
+                requests.delete(f"{base_url}/api/branding/cache/{config_id}",
+                                headers=headers, timeout=5).raise_for_status()
+        except requests.exceptions.ConnectionError:
+            return None, f"Aucun serveur ne répond sur {base_url}"
+        except requests.exceptions.RequestException as e:
+            return False, f"Invalidation refusée par le serveur: {e}"
+        if reload_brand:
+            return True, "Branding rechargé via /api/branding/reload"
+        return True, f"Cache du serveur invalidé: {', '.join(sorted(config_ids))}"
+    
+    def handle_changes(self, changes: Set[Path], active_brand: Optional[str]) -> Optional[str]:
+        """Traite un lot de modifications. Retourne le branding actif (BRAND_CONFIG)."""
+        start = time.monotonic()
+        self.success_count = self.warning_count = self.error_count = 0
+        self.errors, self.warnings = [], []
+        
+        changed = sorted(str(path.relative_to(self.root)) for path in changes)
+        tenants, configs, env_changed = self.affected_tenants(changes)
+        if not self.json_output:
+            stamp = datetime.now().strftime('%H:%M:%S')
+            print(f"\n{Colors.CYAN}{Colors.BOLD}[{stamp}] Modifié: {', '.join(changed)}{Colors.ENDC}")
+        
+        reload_brand = False
+        if env_changed:
+            _, brand = self.verify_env_file()
+            if brand and brand != active_brand:
+                active_brand = brand
+                reload_brand = True
+                tenants.add(brand)
+        
+        # Artefacts chargés par le serveur, recompilés avant vérification
+        existing = set(self.list_tenants())
+        prune_artifacts(self.root / "config" / "branding", sorted(configs - existing))
+        for result in compile_brands(self.root / "config" / "branding", sorted(configs & existing)):
+            if result.error:
+                self.tenant = result.brand_id
+                self.print_error(f"Compilation impossible: {result.error}")
+                self.tenant = None
+        
+        for tenant in sorted(tenants):
+            if not (self.root / "config" / "branding" / f"{tenant}.json").exists():
+                self.tenant = tenant
+                self.print_warning("Configuration supprimée")
+                self.tenant = None
+                continue
+            self.check_tenant(tenant)
+        
+        server_ok, server_message = None, None
+        if configs or reload_brand:
+            server_ok, server_message = self.notify_server(configs, reload_brand)
+        if self.cache:
+            self.cache.flush()
+        
+        duration = time.monotonic() - start
+        if self.json_output:
+            print(json.dumps({
+                'type': 'watch',
+                'changed': changed,
+                'tenants': sorted(tenants),
+                'server': {'ok': server_ok, 'message': server_message} if server_message else None,
+                'success': self.success_count,
+                'warnings': self.warning_count,
+                'errors': self.error_count,
+                'duration': round(duration, 4),
+            }, ensure_ascii=False), flush=True)
+            return active_brand
+        
+        if server_message:
+            if server_ok:
+                print(f"{Colors.GREEN}✓ {server_message}{Colors.ENDC}")
+            else:
+                print(f"{Colors.YELLOW}⚠ {server_message}{Colors.ENDC}")
+        print(f"{Colors.BOLD}→{Colors.ENDC} {Colors.GREEN}{self.success_count} ✓{Colors.ENDC}  "
+              f"{Colors.YELLOW}{self.warning_count} ⚠{Colors.ENDC}  "
+              f"{Colors.RED}{self.error_count} ✗{Colors.ENDC}  ({duration:.2f}s)")
+        return active_brand
+    
+    def run_watch(self, poll_interval: Optional[float] = None) -> bool:
+        """Surveille les fichiers de branding jusqu'à Ctrl+C."""
+        from branding_watch import open_watcher
+        
+        self.print_context("SURVEILLANCE DU BRANDING", mode='watch')
+        
+        targets = [
+            (self.root / "config" / "branding", 0),
+            (self.root / "public" / "assets" / "brands", 1),
+            (self.root, 0),
+        ]
+        watcher = open_watcher(targets, self._watched, interval=poll_interval or 1.0,
+                               polling=poll_interval is not None)
+        
+        # Branding actif au démarrage (pour détecter un changement de BRAND_CONFIG)
+        self._local.buffer = []
+        _, active_brand = self.verify_env_file()
+        self._local.buffer = None
+        
+        if not self.json_output:
+            print(f"{Colors.BOLD}Surveillance ({watcher.backend}):{Colors.ENDC} "
+                  f"config/branding/, public/assets/brands/, .env")
+            print(f"{Colors.BOLD}Branding actif:{Colors.ENDC} {active_brand or 'N/A'}")
+            print("Ctrl+C pour arrêter")
+        
+        try:
+            for changes in watcher.changes():
+                active_brand = self.handle_changes(changes, active_brand)
+        except KeyboardInterrupt:
+            if not self.json_output:
+                print("\nSurveillance arrêtée")
+        finally:
+            watcher.close()
+            if self.cache:
+                self.cache.close()
+        return True
+    
+    def print_fleet_table(self, per_tenant: List[Tuple[str, Dict[str, int]]]):
+        """Affiche le tableau récapitulatif par tenant."""
+        self.print_header("RÉCAPITULATIF PAR TENANT")
+        
+        print(f"{'Tenant':<30} {'Succès':>8} {'Avert.':>8} {'Erreurs':>8}  Statut")
+        print(f"{'-'*30} {'-'*8} {'-'*8} {'-'*8}  {'-'*10}")
+        for tenant, counts in per_tenant:
+            if counts['error']:
+                status = f"{Colors.RED}✗ KO{Colors.ENDC}"
+            elif counts['warning']:
+                status = f"{Colors.YELLOW}⚠ BON{Colors.ENDC}"
+            else:
+                status = f"{Colors.GREEN}✓ OK{Colors.ENDC}"
+            print(f"{tenant:<30} {counts['success']:>8} {counts['warning']:>8} {counts['error']:>8}  {status}")
+
+def verify_tenant(config_id: str, verbose: bool = False, auto_fix: bool = False,
+                  checks: Tuple[str, ...] = tuple(TENANT_CHECKS)) -> Tuple[str, Dict[str, Tuple[Any, List[CheckRecord], bool]]]:
+    """
+    Vérifie la configuration et les assets d'un tenant (exécuté dans un
+    processus du pool). Retourne, par vérification, (valeur, enregistrements,
+    échec) au lieu d'afficher les enregistrements.
+    """
+    verifier = BrandingVerifier(verbose=verbose, auto_fix=auto_fix, tenant=config_id)
+    results = {}
+    for name in checks:
+        verifier._local.buffer = []
+        start = time.monotonic()
+        value, failed = None, False
+        try:
+            value = getattr(verifier, TENANT_CHECKS[name])(config_id)
+        except Exception as e:
+            verifier.print_error(f"Erreur inattendue: {e}")
+            failed = True
+        for record in verifier._local.buffer:
+            record.duration = time.monotonic() - start
+        results[name] = (value, verifier._local.buffer, failed)
+    return config_id, results
+
+def _mode_args(flag: str) -> List[str]:
+    """
+    Options transmises à un mode qui a son propre jeu d'options (--bench,
+    --memory) : celles qui suivent le drapeau, plus -j/--json placé avant ;
+    les autres options de vérification placées avant (-v...) sont ignorées.
+    """
+    index = sys.argv.index(flag)
+    shared = [arg for arg in sys.argv[1:index] if arg in ('-j', '--json')]
+    return shared + sys.argv[index + 1:]
 
 def main():
     """Fonction principale."""
+    if '--bench' in sys.argv:
+        # Import à la demande : le test de charge a son propre jeu d'options
+        import branding_bench
+        sys.exit(branding_bench.main(_mode_args('--bench')))
+    if '--memory' in sys.argv:
+        # Import à la demande : la mesure mémoire a son propre jeu d'options
+        import branding_memory
+        sys.exit(branding_memory.main(_mode_args('--memory')))
+    
     verbose = '-v' in sys.argv or '--verbose' in sys.argv
     auto_fix = '--fix' in sys.argv
     json_output = '-j' in sys.argv or '--json' in sys.argv
+    sequential = '--sequential' in sys.argv
+    fleet = '--all' in sys.argv
+    # La validation seule (--validate) n'utilise pas le cache des résultats
+    use_cache = '--no-cache' not in sys.argv and '--validate' not in sys.argv
+    watch = '--watch' in sys.argv
+    poll_interval = None
+    if '--poll' in sys.argv:
+        index = sys.argv.index('--poll')
+        try:
+            poll_interval = float(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            poll_interval = 1.0
+    workers = None
+    if '--workers' in sys.argv:
+        index = sys.argv.index('--workers')
+        try:
+            workers = int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            print(f"{Colors.RED}--workers attend un nombre entier{Colors.ENDC}")
+            sys.exit(2)
     
     if '-h' in sys.argv or '--help' in sys.argv:
         print("Usage: python verify_branding.py [options]")
         print()
         print("Options:")
         print("  -v, --verbose    Mode verbeux")
-        print("  -j, --json       Sortie JSON")
+        print("  -j, --json       Sortie NDJSON en flux (+ résumé final)")
         print("  --fix            Correction automatique")
+        print("  --sequential     Vérifications une par une")
+        print("  --all            Vérifier tous les tenants (mode flotte)")
+        print("  --workers N      Processus en mode flotte")
+        print("  --no-cache       Ignorer le cache des résultats")
+        print("  --watch          Surveiller les fichiers et revérifier à chaque modification")
+        print("  --poll [S]       Avec --watch : scrutation toutes les S secondes")
+        print("  --validate [...] Valider des configurations contre le schéma")
+        print("  --bench [...]    Test de charge de l'API (--bench --help)")
+        print("  --memory [...]   Mémoire du serveur par branding (--memory --help)")
         print("  -h, --help       Afficher l'aide")
         sys.exit(0)
     
-    verifier = BrandingVerifier(verbose=verbose, auto_fix=auto_fix)
-    success = verifier.run()
+    verifier = BrandingVerifier(verbose=verbose, auto_fix=auto_fix,
+                                max_workers=1 if sequential else None,
+                                json_output=json_output, use_cache=use_cache)
+    if '--validate' in sys.argv:
+        targets = [a for a in sys.argv[sys.argv.index('--validate') + 1:] if not a.startswith('-')]
+        success = verifier.run_validation(targets)
+    elif watch:
+        success = verifier.run_watch(poll_interval)
+    else:
+        success = verifier.run_fleet(workers) if fleet else verifier.run()
     
     sys.exit(0 if success else 1)
 
@@ -34,6 +34,15 @@ class BrandingLoader {
      * Charge la configuration depuis l'API
      */
     async loadConfiguration() {
+        // Configuration inlinée dans la page par le serveur (src/middleware/brandingInline.js)
+        const inline = window.__BRANDING__;
+        if (inline) {
+            console.log('[Branding] Configuration inlinee dans la page');
+            this.config = inline;
+            this.revalidateInlineConfig(inline);
+            return;
+        }
+
         // Vérifier le cache local
         const cached = this.getCachedConfig();
         if (cached) {
@@ -60,6 +69,33 @@ class BrandingLoader {
         }
     }
 
+    /**
+     * Vérifie en arrière-plan que la configuration inlinée est toujours celle du serveur
+     * (au plus une requête par durée de cache)
+     */
+    async revalidateInlineConfig(inline) {
+        const expected = JSON.stringify(inline);
+        const cached = this.getCachedConfig();
+        if (cached && JSON.stringify(cached) === expected) return;
+
+        try {
+            const response = await fetch('/api/branding/config');
+            if (!response.ok) return;
+
+            const data = await response.json();
+            if (!data.success || !data.data) return;
+
+            this.cacheConfig(data.data);
+            if (JSON.stringify(data.data) !== expected) {
+                console.warn('[Branding] Configuration inlinee obsolete, application de la configuration serveur');
+                this.config = data.data;
+                this.applyBranding();
+            }
+        } catch (error) {
+            console.warn('⚠️ Impossible de vérifier la configuration inlinée:', error);
+        }
+    }
+
     /**
      * Applique le branding à l'interface
      */
@@ -113,10 +149,19 @@ class BrandingLoader {
             light: '--brand-light'
         };
 
+        // Thème précompilé (config/themes/brands/brand-active.css) déjà en place :
+        // aucune écriture de style inline, donc aucun recalcul de styles
+        if (this.isPrecompiledTheme(colors, colorMap)) {
+            console.log('  ✓ Thème CSS précompilé actif');
+            return;
+        }
+
         // Appliquer chaque couleur
         Object.entries(colorMap).forEach(([key, cssVar]) => {
             if (colors[key]) {
                 root.style.setProperty(cssVar, colors[key]);
+                // Couleur de texte d'un thème précompilé périmé : retour au texte blanc
+                root.style.setProperty(`${cssVar}-contrast`, '#ffffff');
                 console.log(`  ✓ ${cssVar}: ${colors[key]}`);
             }
         });
@@ -125,6 +170,19 @@ class BrandingLoader {
         this.generateColorVariations(colors);
     }
 
+    /**
+     * Vérifie que la feuille brand-active.css correspond à la configuration reçue
+     */
+    isPrecompiledTheme(colors, colorMap) {
+        const styles = getComputedStyle(document.documentElement);
+        if (!styles.getPropertyValue('--brand-theme').trim()) return false;
+
+        return Object.entries(colorMap).every(([key, cssVar]) =>
+            !colors[key] ||
+            styles.getPropertyValue(cssVar).trim().toLowerCase() === colors[key].toLowerCase()
+        );
+    }
+
     /**
      * Génère des variations de couleurs (light/dark)
      */
@@ -216,6 +274,9 @@ class BrandingLoader {
         const sidebarLogo = document.querySelector('.sidebar-header .brand-logo');
         if (sidebarLogo && logo.main) {
             sidebarLogo.src = logo.main;
+            if (logo.mainSrcset) {
+                sidebarLogo.srcset = logo.mainSrcset;
+            }
             sidebarLogo.alt = this.config.app?.name || 'Logo';
         }
 
@@ -224,6 +285,9 @@ class BrandingLoader {
         iconElements.forEach(icon => {
             if (logo.icon) {
                 icon.src = logo.icon;
+                if (logo.iconSrcset) {
+                    icon.srcset = logo.iconSrcset;
+                }
             }
         });
     }
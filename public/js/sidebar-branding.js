@@ -46,13 +46,13 @@ function applySidebarBranding(config) {
     
     // Si un logo est défini, le charger
     if (config.branding?.logo?.icon) {
-        loadBrandLogo(config.branding.logo.icon);
+        loadBrandLogo(config.branding.logo.icon, config.branding.logo.iconSrcset);
     }
     
     console.log('✅ Branding sidebar appliqué');
 }
 
-function loadBrandLogo(logoUrl) {
+function loadBrandLogo(logoUrl, srcset) {
     // Vérifier si le logo existe sur le serveur
     fetch(logoUrl, { method: 'HEAD' })
         .then(response => {
@@ -65,6 +65,10 @@ function loadBrandLogo(logoUrl) {
                         // Créer un élément img pour le logo
                         const logoImg = document.createElement('img');
                         logoImg.src = logoUrl;
+                        // Versions 1x/2x dimensionnées (branding.py build-logos)
+                        if (srcset) {
+                            logoImg.srcset = srcset;
+                        }
                         logoImg.alt = 'Logo';
                         logoImg.className = 'brand-logo-sidebar';
                         logoImg.style.cssText = 'height: 30px; width: auto; vertical-align: middle; margin-right: 10px;';
@@ -72,10 +72,13 @@ const { authenticateToken } = require('./src/middleware/auth');
 
 // Import des middlewares
 const errorHandler = require('./src/middleware/errorHandler');
+const { brandAssets } = require('./src/middleware/brandAssets');
+const { brandingInline } = require('./src/middleware/brandingInline');
 const { connectDatabase } = require('./src/utils/database');
 
 // Import des services
 const CronService = require('./src/services/cronService');
+const { getBrandingService } = require('./src/services/brandingService');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
@@ -228,12 +231,26 @@ app.use((req, res, next) => {
     }
 });
 
+// Assets de branding construits (noms hachés, précompressés, cache immutable)
+app.use(brandAssets(path.join(__dirname, 'public')));
+
+// Configuration du tenant actif inlinée dans les pages, à la volée (fichiers intacts)
+app.use(brandingInline(path.join(__dirname, 'public')));
+
 // Servir les fichiers statiques
 app.use(express.static(path.join(__dirname, 'public')));
 
 // Servir FontAwesome depuis node_modules (évite la dépendance au CDN)
 app.use('/vendor/fontawesome', express.static(path.join(__dirname, 'node_modules/@fortawesome/fontawesome-free')));
 
+// Thème précompilé du tenant actif (généré, non versionné) ; à défaut, thème de
+// repli versionné : les pages le chargent toujours, il ne doit jamais répondre 404
+const activeThemePath = path.join(__dirname, 'config', 'themes', 'brands', 'brand-active.css');
+const fallbackThemePath = path.join(__dirname, 'config', 'themes', 'brand-active.default.css');
+app.get('/config/themes/brands/brand-active.css', (req, res) => {
+    res.sendFile(fs.existsSync(activeThemePath) ? activeThemePath : fallbackThemePath);
+});
+
 // Servir les fichiers de configuration (CSS, thèmes)
 app.use('/config', express.static(path.join(__dirname, 'config')));
 
@@ -361,6 +378,9 @@ async function startServer() {
         // Initialiser les tâches cron
         CronService.initCronJobs();
 
+        // Configurations "extends" dont l'artefact compilé manque (non versionné)
+        getBrandingService().checkCompiledArtifacts();
+
         // Démarrage du serveur
         console.log(`📡 Tentative de démarrage sur le port ${PORT}...`);
         const server = app.listen(PORT, () => {
@@ -400,5 +420,17 @@ process.on('uncaughtException', (error) => {
     process.exit(1);
 });
 
+// Rechargement à chaud du branding (configure_branding.py envoie SIGHUP).
+// Comme pour nginx, SIGHUP ne termine plus le processus : un serveur lancé
+// depuis un terminal survit à sa fermeture (arrêt par Ctrl+C ou SIGTERM).
+process.on('SIGHUP', () => {
+    try {
+        const brandId = getBrandingService().reloadBrand();
+        console.log(`🎨 SIGHUP reçu - branding rechargé: ${brandId}`);
+    } catch (error) {
+        console.error(`❌ SIGHUP reçu - ${error.message}`);
+    }
+});
+
 // Lancement
 startServer();
@@ -0,0 +1,76 @@
+const fs = require('fs');
+const path = require('path');
+
+/**
+ * Middleware de service des assets de branding construits
+ * (public/assets/brands/<id>/dist/, voir docs/Branding/Scripts/branding_assets.py)
+ *
+ * Les noms de fichiers contiennent l'empreinte du contenu : ils sont servis
+ * avec un cache « immutable » d'un an, et la variante précompressée (.br ou
+ * .gz) est envoyée lorsque le navigateur l'accepte, sans compression à la volée.
+ */
+
+const MIME_TYPES = {
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.ico': 'image/x-icon',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8'
+};
+
+const ONE_YEAR_MS = 365 * 24 * 60 * 60 * 1000;
+const DIST_PATH = /^\/assets\/brands\/([^/]+)\/dist\/([^/]+)$/;
+
+function brandAssets(publicDir) {
+    const brandsRoot = path.join(publicDir, 'assets', 'brands');
+
+    return (req, res, next) => {
+        if (req.method !== 'GET' && req.method !== 'HEAD') {
+            return next();
+        }
+
+        const match = DIST_PATH.exec(req.path);
+        if (!match) {
+            return next();
+        }
+
+        let brand, file;
+        try {
+            brand = decodeURIComponent(match[1]);
+            file = decodeURIComponent(match[2]);
+        } catch (error) {
+            // Échappement invalide (%E0...) : URL inconnue, pas une erreur serveur
+            return next();
+        }
+
+        const filePath = path.resolve(brandsRoot, brand, 'dist', file);
+        if (!filePath.startsWith(brandsRoot + path.sep) || !fs.existsSync(filePath)) {
+            return next();
+        }
+
+        const acceptEncoding = req.headers['accept-encoding'] || '';
+        let servedPath = filePath;
+        if (/\bbr\b/.test(acceptEncoding) && fs.existsSync(filePath + '.br')) {
+            servedPath = filePath + '.br';
+            res.setHeader('Content-Encoding', 'br');
+        } else if (/\bgzip\b/.test(acceptEncoding) && fs.existsSync(filePath + '.gz')) {
+            servedPath = filePath + '.gz';
+            res.setHeader('Content-Encoding', 'gzip');
+        }
+
+        res.setHeader('Vary', 'Accept-Encoding');
+        res.setHeader('Content-Type', MIME_TYPES[path.extname(filePath).toLowerCase()] || 'application/octet-stream');
+
+        res.sendFile(servedPath, { maxAge: ONE_YEAR_MS, immutable: true }, (error) => {
+            if (error && !res.headersSent) {
+                next(error);
+            }
+        });
+    };
+}
+
+module.exports = { brandAssets };
@@ -0,0 +1,140 @@
+const fs = require('fs');
+const path = require('path');
+const crypto = require('crypto');
+const { getBrandingService } = require('../services/brandingService');
+
+/**
+ * Middleware d'inlining du branding dans les pages HTML
+ * (même bloc que docs/Branding/Scripts/branding_inline.py)
+ *
+ * Chaque page de public/ qui charge branding-loader.js reçoit, juste avant
+ * cette balise, la configuration du tenant actif (window.__BRANDING__) et son
+ * titre. Le bloc est ajouté à la réponse : les fichiers versionnés ne sont
+ * jamais modifiés, et un changement de branding (SIGHUP, /api/branding/reload)
+ * est visible dès la requête suivante.
+ */
+
+const MARKER_START = '<!-- branding:inline -->';
+const MARKER_END = '<!-- /branding:inline -->';
+const HASH_LENGTH = 10;
+
+const BLOCK = /^([ \t]*)<!-- branding:inline -->[\s\S]*?<!-- \/branding:inline -->[ \t]*\r?\n/m;
+const LOADER_TAG = /^([ \t]*)<script src="js\/branding-loader\.js"[^>]*><\/script>/m;
+
+/**
+ * JSON compact utilisable sans risque dans une balise <script>
+ */
+function serialize(value) {
+    return JSON.stringify(value).replace(/<\//g, '<\\/').replace(/<!--/g, '<\\!--');
+}
+
+/**
+ * Valeur d'attribut HTML échappée comme html.escape(value, quote=True) en Python
+ */
+function escapeAttribute(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#x27;');
+}
+
+function renderBlock(brandId, config, indent, newline) {
+    const data = serialize(config);
+    const hash = crypto.createHash('sha256').update(data, 'utf-8').digest('hex').slice(0, HASH_LENGTH);
+    let script = `window.__BRANDING__=${data};`;
+    const title = config.app && config.app.name;
+    if (typeof title === 'string' && title) {
+        script += `document.title=${serialize(title)};`;
+    }
+    return [
+        MARKER_START,
+        `<script data-brand="${escapeAttribute(brandId)}" data-hash="${hash}">${script}</script>`,
+        MARKER_END
+    ].map(line => `${indent}${line}${newline}`).join('');
+}
+
+/**
+ * Page avec le bloc inséré (ou remplacé), null si elle ne charge pas le loader
+ */
+function inlineHtml(html, brandId, config) {
+    const newline = html.includes('\r\n') ? '\r\n' : '\n';
+    const existing = BLOCK.exec(html);
+    if (existing) {
+        return html.slice(0, existing.index) + renderBlock(brandId, config, existing[1], newline) +
+            html.slice(existing.index + existing[0].length);
+    }
+    const loader = LOADER_TAG.exec(html);
+    if (!loader) {
+        return null;
+    }
+    return html.slice(0, loader.index) + renderBlock(brandId, config, loader[1], newline) +
+        html.slice(loader.index);
+}
+
+function brandingInline(publicDir) {
+    const root = path.resolve(publicDir);
+    // Page -> { mtimeMs, config, brandId, body } : rendu refait si la page ou le branding change
+    const rendered = new Map();
+
+    return (req, res, next) => {
+        if (req.method !== 'GET' && req.method !== 'HEAD') {
+            return next();
+        }
+
+        let urlPath;
+        try {
+            urlPath = decodeURIComponent(req.path);
+        } catch (error) {
+            return next();
+        }
+        if (urlPath.endsWith('/')) {
+            urlPath += 'index.html';
+        }
+        if (path.extname(urlPath).toLowerCase() !== '.html') {
+            return next();
+        }
+
+        const filePath = path.resolve(root, '.' + urlPath);
+        if (!filePath.startsWith(root + path.sep)) {
+            return next();
+        }
+
+        let stat;
+        try {
+            stat = fs.statSync(filePath);
+        } catch (error) {
+            return next();
+        }
+        if (!stat.isFile()) {
+            return next();
+        }
+
+        const service = getBrandingService();
+        let config;
+        try {
+            config = service.getCurrentBrand();
+        } catch (error) {
+            // Branding actif non compilé (déjà signalé) : page servie sans bloc
+            return next();
+        }
+        const brandId = service.currentBrand;
+
+        let entry = rendered.get(filePath);
+        if (!entry || entry.mtimeMs !== stat.mtimeMs || entry.config !== config || entry.brandId !== brandId) {
+            const html = fs.readFileSync(filePath, 'utf-8');
+            entry = { mtimeMs: stat.mtimeMs, config, brandId, body: inlineHtml(html, brandId, config) };
+            rendered.set(filePath, entry);
+        }
+        if (entry.body === null) {
+            return next();
+        }
+
+        // Le contenu dépend du branding actif : revalidation à chaque visite (ETag)
+        res.setHeader('Cache-Control', 'no-cache');
+        res.type('html').send(entry.body);
+    };
+}
+
+module.exports = { brandingInline, inlineHtml };
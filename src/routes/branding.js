@@ -17,6 +17,9 @@ router.get('/config', (req, res) => {
         const brandingService = getBrandingService();
         const config = brandingService.getCurrentBrand();
         
+        // Appelé par chaque page : le navigateur revalide avec l'ETag (304
+        // sans corps) et voit un changement de branding dès la requête suivante
+        res.set('Cache-Control', 'no-cache');
         res.json({
             success: true,
             data: config
@@ -138,6 +141,62 @@ router.post('/set/:brandId', authenticateToken, (req, res) => {
     }
 });
 
+/**
+ * POST /api/branding/reload
+ * Recharge le branding actif sans redémarrer le serveur
+ * (BRAND_CONFIG relu dans .env, ou brandId passé dans le corps)
+ * Super Admin uniquement
+ */
+router.post('/reload', authenticateToken, (req, res) => {
+    try {
+        const userRoles = req.user.roles || [req.user.role];
+        const isSuperAdmin = userRoles.includes('SUPER_ADMIN');
+
+        if (!isSuperAdmin) {
+            return res.status(403).json({
+                success: false,
+                error: 'Accès refusé - Droits Super Admin requis'
+            });
+        }
+
+        const brandingService = getBrandingService();
+        const requested = req.body?.brandId;
+        if (requested !== undefined &&
+            (typeof requested !== 'string' || !brandingService.listAvailableBrands().includes(requested))) {
+            return res.status(400).json({
+                success: false,
+                error: `Branding introuvable: ${requested}`
+            });
+        }
+
+        let brandId;
+        try {
+            brandId = brandingService.reloadBrand(requested);
+        } catch (error) {
+            if (error.code !== 'BRAND_RELOAD_FAILED') {
+                throw error;
+            }
+            return res.status(409).json({
+                success: false,
+                error: error.message,
+                data: { brandId: brandingService.currentBrand }
+            });
+        }
+
+        res.json({
+            success: true,
+            message: `Branding rechargé: ${brandId}`,
+            data: { brandId }
+        });
+    } catch (error) {
+        console.error('Erreur lors du rechargement du branding:', error);
+        res.status(500).json({
+            success: false,
+            error: 'Erreur serveur'
+        });
+    }
+});
+
 /**
  * POST /api/branding/create
  * Crée une nouvelle configuration client
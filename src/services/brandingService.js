@@ -1,5 +1,6 @@
 const fs = require('fs');
 const path = require('path');
+const dotenv = require('dotenv');
 
 /**
  * Service de gestion du branding white-label
@@ -8,6 +9,8 @@ const path = require('path');
 class BrandingService {
     constructor() {
         this.brandingPath = path.join(process.cwd(), 'config', 'branding');
+        // Artefacts produits par `branding.py compile` (héritage "extends" déjà résolu)
+        this.compiledPath = path.join(this.brandingPath, 'compiled');
         this.currentBrand = process.env.BRAND_CONFIG || 'default';
         this.cache = new Map();
         this.cacheExpiry = 10 * 60 * 1000; // 10 minutes
@@ -28,11 +31,10 @@ class BrandingService {
             return cached.config;
         }
 
-        const configPath = path.join(this.brandingPath, `${brand}.json`);
-        
         try {
-            // Vérifier si le fichier existe
-            if (!fs.existsSync(configPath)) {
+            // Vérifier si le fichier existe (artefact compilé ou source)
+            const configPath = this.resolveConfigPath(brand);
+            if (!configPath) {
                 console.warn(`⚠️ Configuration '${brand}' introuvable, utilisation de 'default'`);
                 return this.loadBrandConfig('default');
             }
@@ -41,6 +43,11 @@ class BrandingService {
             const configData = fs.readFileSync(configPath, 'utf-8');
             const config = JSON.parse(configData);
 
+            // L'héritage n'est jamais résolu au runtime
+            if (config.extends) {
+                throw this.notCompiledError(brand, config.extends);
+            }
+
             // Mettre en cache
             this.cache.set(brand, {
                 config,
@@ -51,6 +58,11 @@ class BrandingService {
             return config;
 
         } catch (error) {
+            // Servir un autre tenant à la place serait pire qu'une erreur
+            if (error.code === 'BRAND_NOT_COMPILED') {
+                throw error;
+            }
+
             console.error(`❌ Erreur lors du chargement de la configuration '${brand}':`, error.message);
             
             // Fallback vers default si ce n'est pas déjà default
@@ -63,6 +75,106 @@ class BrandingService {
         }
     }
 
+    /**
+     * Fichier à charger pour un branding : l'artefact compilé
+     * (config/branding/compiled/<id>.json), sauf s'il est plus ancien que la
+     * source ou que l'un de ses parents ("extends"), la source étant alors lue
+     * directement
+     * @param {string} brand - Identifiant du branding
+     * @returns {string|null} Chemin du fichier, null si le branding n'existe pas
+     */
+    resolveConfigPath(brand) {
+        const sourcePath = path.join(this.brandingPath, `${brand}.json`);
+        const compiledPath = path.join(this.compiledPath, `${brand}.json`);
+        const source = fs.existsSync(sourcePath);
+        const compiled = fs.existsSync(compiledPath) ? fs.statSync(compiledPath) : null;
+
+        if (!compiled) {
+            return source ? sourcePath : null;
+        }
+        if (!source) {
+            return compiledPath;
+        }
+        const chain = this.sourceChain(brand);
+        if (compiled.mtimeMs >= chain.mtimeMs) {
+            return compiledPath;
+        }
+        console.warn(`⚠️ Artefact compilé de '${brand}' plus ancien que ${chain.newest}.json, recompilez-le ` +
+            `(python docs/Branding/Scripts/branding.py compile ${brand})`);
+        // Une source qui hérite d'un parent ne peut pas être servie telle quelle
+        return chain.extends ? compiledPath : sourcePath;
+    }
+
+    /**
+     * Parcourt la chaîne "extends" des sources d'un branding
+     * @param {string} brand - Identifiant du branding
+     * @returns {{mtimeMs: number, newest: string, extends: boolean}} Date de
+     * modification la plus récente de la chaîne, fichier concerné, héritage déclaré
+     */
+    sourceChain(brand) {
+        const result = { mtimeMs: 0, newest: brand, extends: false };
+        const visited = new Set();
+        let layer = brand;
+        while (layer && !visited.has(layer)) {
+            visited.add(layer);
+            const layerPath = path.join(this.brandingPath, `${layer}.json`);
+            let parent;
+            try {
+                const { mtimeMs } = fs.statSync(layerPath);
+                if (mtimeMs > result.mtimeMs) {
+                    result.mtimeMs = mtimeMs;
+                    result.newest = layer;
+                }
+                parent = JSON.parse(fs.readFileSync(layerPath, 'utf-8')).extends;
+            } catch (error) {
+                // Chaîne invalide : signalée par `branding.py compile`
+                break;
+            }
+            if (layer === brand) {
+                result.extends = Boolean(parent);
+            }
+            layer = parent;
+        }
+        return result;
+    }
+
+    /**
+     * Erreur d'une configuration "extends" sans artefact compilé, signalée
+     * bruyamment avec le fichier manquant et la commande qui le produit
+     * @param {string} brand - Identifiant du branding
+     * @param {string} parent - Configuration parente déclarée
+     * @returns {Error} Erreur de code BRAND_NOT_COMPILED
+     */
+    notCompiledError(brand, parent) {
+        const artifact = path.relative(process.cwd(), path.join(this.compiledPath, `${brand}.json`));
+        const error = new Error(`Configuration '${brand}' hérite de '${parent}' mais ${artifact} est absent ` +
+            `(python docs/Branding/Scripts/branding.py compile ${brand})`);
+        error.code = 'BRAND_NOT_COMPILED';
+        error.artifact = artifact;
+        console.error(`❌❌ BRANDING NON COMPILÉ : ${error.message}`);
+        return error;
+    }
+
+    /**
+     * Signale au démarrage chaque configuration "extends" sans artefact compilé
+     * (config/branding/compiled/ n'est pas versionné)
+     * @returns {string[]} Artefacts manquants
+     */
+    checkCompiledArtifacts() {
+        const missing = [];
+        for (const brand of this.listAvailableBrands()) {
+            try {
+                const source = JSON.parse(fs.readFileSync(path.join(this.brandingPath, `${brand}.json`), 'utf-8'));
+                if (source.extends && !fs.existsSync(path.join(this.compiledPath, `${brand}.json`))) {
+                    missing.push(this.notCompiledError(brand, source.extends).artifact);
+                }
+            } catch (error) {
+                console.warn(`⚠️ Configuration '${brand}' illisible: ${error.message}`);
+            }
+        }
+        return missing;
+    }
+
     /**
      * Retourne une configuration minimale en cas d'échec total
      */
@@ -103,7 +215,23 @@ class BrandingService {
      * @param {string} brandId - Nouvel identifiant de branding
      */
     setBrand(brandId) {
-        const config = this.loadBrandConfig(brandId);
+        // Un identifiant inconnu chargerait 'default' sous un autre nom
+        if (!this.listAvailableBrands().includes(brandId)) {
+            console.error(`❌ Branding '${brandId}' introuvable, branding conservé: ${this.currentBrand}`);
+            return false;
+        }
+
+        let config;
+        try {
+            config = this.loadBrandConfig(brandId);
+        } catch (error) {
+            if (error.code !== 'BRAND_NOT_COMPILED') {
+                throw error;
+            }
+            // Configuration non compilée : le branding actif est conservé
+            console.error(`❌ Branding conservé: ${this.currentBrand}`);
+            return false;
+        }
         if (config) {
             this.currentBrand = brandId;
             console.log(`✅ Branding changé vers: ${brandId}`);
@@ -112,6 +240,39 @@ class BrandingService {
         return false;
     }
 
+    /**
+     * Relit BRAND_CONFIG dans le fichier .env et applique le branding sans redémarrage
+     * (déclenché par SIGHUP ou POST /api/branding/reload)
+     * @param {string} brandId - Identifiant imposé (optionnel, sinon lu dans .env)
+     * @returns {string} Branding actif après rechargement
+     * @throws {Error} Code BRAND_RELOAD_FAILED si le branding demandé n'a pas pu
+     * être appliqué (introuvable ou non compilé) : le branding actif est conservé
+     */
+    reloadBrand(brandId = null) {
+        let brand = brandId;
+
+        if (!brand) {
+            try {
+                const env = dotenv.parse(fs.readFileSync(path.join(process.cwd(), '.env')));
+                brand = env.BRAND_CONFIG;
+            } catch (error) {
+                console.warn(`⚠️ Lecture du fichier .env impossible: ${error.message}`);
+            }
+        }
+
+        brand = brand || process.env.BRAND_CONFIG || 'default';
+
+        this.invalidateCache();
+        if (!this.setBrand(brand)) {
+            const error = new Error(`Branding '${brand}' non appliqué (introuvable ou non compilé), ` +
+                `branding actif conservé: ${this.currentBrand}`);
+            error.code = 'BRAND_RELOAD_FAILED';
+            throw error;
+        }
+        process.env.BRAND_CONFIG = brand;
+        return this.currentBrand;
+    }
+
     /**
      * Liste tous les brandings disponibles
      */